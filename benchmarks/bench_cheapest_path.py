@@ -0,0 +1,74 @@
+"""
+Benchmark the cheapest-path engines on large integer-weighted graphs.
+
+Builds a random sparse graph in memory (no database needed) and times
+find_cheapest_path with the bucket-queue (Dial) engine against the binary
+heap engine on the same queries, and the bidirectional search (with the
+bucket queue) against both. Every query starts from a different node, so the
+per-source search cache does not answer any of them.
+
+Usage:
+    python -m benchmarks.bench_cheapest_path --nodes 200000 --degree 4 --max-cost 10
+"""
+import argparse
+import random
+import time
+
+from src.config import settings
+from src.graph.path_finder import PathFinder
+
+
+def build_random_graph(num_nodes: int, degree: int, max_cost: int, seed: int) -> PathFinder:
+    rng = random.Random(seed)
+    node_ids = [str(i) for i in range(num_nodes)]
+    edges = [
+        (node_ids[i], node_ids[rng.randrange(num_nodes)], rng.randint(0, max_cost))
+        for i in range(num_nodes)
+        for _ in range(degree)
+    ]
+    return PathFinder.from_edges("benchmark", node_ids, edges)
+
+
+def time_queries(finder: PathFinder, queries, dial_max_cost: int, bidirectional: bool = False) -> float:
+    original = settings.DIAL_MAX_COST, settings.BIDIRECTIONAL_DIJKSTRA
+    settings.DIAL_MAX_COST, settings.BIDIRECTIONAL_DIJKSTRA = dial_max_cost, bidirectional
+    try:
+        started = time.perf_counter()
+        for start, end in queries:
+            finder.find_cheapest_path(start, end)
+        return time.perf_counter() - started
+    finally:
+        settings.DIAL_MAX_COST, settings.BIDIRECTIONAL_DIJKSTRA = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=200_000)
+    parser.add_argument('--degree', type=int, default=4)
+    parser.add_argument('--max-cost', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    finder = build_random_graph(args.nodes, args.degree, args.max_cost, args.seed)
+    rng = random.Random(args.seed + 1)
+    queries = [
+        (str(start), str(rng.randrange(args.nodes)))
+        for start in rng.sample(range(args.nodes), args.queries)
+    ]
+
+    heap_seconds = time_queries(finder, queries, dial_max_cost=-1)
+    dial_seconds = time_queries(finder, queries, dial_max_cost=args.max_cost)
+    bidirectional_seconds = time_queries(finder, queries, dial_max_cost=args.max_cost, bidirectional=True)
+
+    print(f"Graph: {args.nodes} nodes, {args.nodes * args.degree} edges, costs 0..{args.max_cost}")
+    print(f"Queries: {args.queries}")
+    print(f"heap (dijkstra): {heap_seconds * 1000 / args.queries:.1f} ms/query")
+    print(f"bucket (dial):   {dial_seconds * 1000 / args.queries:.1f} ms/query")
+    print(f"bidirectional:   {bidirectional_seconds * 1000 / args.queries:.1f} ms/query")
+    print(f"speedup (dial):  {heap_seconds / dial_seconds:.2f}x")
+    print(f"speedup (bidirectional over dial): {dial_seconds / bidirectional_seconds:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
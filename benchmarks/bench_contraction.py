@@ -0,0 +1,73 @@
+"""
+Benchmark contraction hierarchies against Dijkstra on a road-network-like graph.
+
+Builds a sparse grid with random integer costs (two directed edges per
+neighbouring cell) in memory, then reports preprocessing time, shortcut count
+and per-query latency of both engines on the same random queries.
+
+Usage:
+    python -m benchmarks.bench_contraction --width 200 --height 200 --queries 200
+"""
+import argparse
+import random
+import time
+
+from src.config import settings
+from src.graph.contraction import ContractionHierarchy
+from src.graph.path_finder import PathFinder
+
+
+def build_grid_graph(width: int, height: int, seed: int) -> PathFinder:
+    rng = random.Random(seed)
+    node_ids = [f"{x},{y}" for y in range(height) for x in range(width)]
+    edges = []
+    for y in range(height):
+        for x in range(width):
+            for nx, ny in ((x + 1, y), (x, y + 1)):
+                if nx < width and ny < height:
+                    edges.append((f"{x},{y}", f"{nx},{ny}", rng.randint(1, 100)))
+                    edges.append((f"{nx},{ny}", f"{x},{y}", rng.randint(1, 100)))
+    return PathFinder.from_edges("benchmark", node_ids, edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--width', type=int, default=200)
+    parser.add_argument('--height', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    finder = build_grid_graph(args.width, args.height, args.seed)
+    nodes = list(finder.adjacency_list)
+    rng = random.Random(args.seed + 1)
+    queries = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(args.queries)]
+    num_edges = sum(len(edges) for edges in finder.adjacency_list.values())
+
+    hierarchy = ContractionHierarchy.build(finder.adjacency_list)
+
+    # Distinct searches per query: do not let the per-source cache answer Dijkstra queries
+    settings.SEARCH_CACHE_SIZE = 0
+    finder._search_cache.max_size = 0
+    started = time.perf_counter()
+    for start, end in queries:
+        finder.find_cheapest_path(start, end)
+    dijkstra_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for start, end in queries:
+        if start != end:
+            hierarchy.query(start, end)
+    ch_seconds = time.perf_counter() - started
+
+    print(f"Graph: {len(nodes)} nodes, {num_edges} edges")
+    print(f"Preprocessing: {hierarchy.preprocessing_seconds:.1f} s, "
+          f"{hierarchy.shortcut_count} shortcuts ({hierarchy.shortcut_count / num_edges:.2f} per edge)")
+    print(f"Queries: {args.queries}")
+    print(f"{finder.dijkstra_engine}: {dijkstra_seconds * 1000 / args.queries:.2f} ms/query")
+    print(f"ch:   {ch_seconds * 1000 / args.queries:.2f} ms/query")
+    print(f"speedup: {dijkstra_seconds / ch_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark the tabular (CSV/TSV) importer against the XML path on the same graph.
+
+Writes one random graph both as an XML file and as CSV node and edge files,
+then reports rows (nodes + edges) per second of parsing and validating each.
+With --save it also times saving the graph to the database through each
+path, parse included, which needs a database.
+
+Usage:
+    python -m benchmarks.bench_import --nodes 100000 --edges 400000
+    python -m benchmarks.bench_import --nodes 100000 --edges 400000 --save
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from src.tabular_processor.parser import GraphTabularParser
+from src.xml_processor.parser import GraphXMLParser
+
+
+def write_graph_files(directory: str, num_nodes: int, num_edges: int, seed: int):
+    rng = random.Random(seed)
+    node_ids = [f"n{i}" for i in range(num_nodes)]
+    edges = [(f"e{i}", rng.choice(node_ids), rng.choice(node_ids), rng.randint(0, 100)) for i in range(num_edges)]
+
+    xml_path = os.path.join(directory, "graph.xml")
+    with open(xml_path, 'w') as f:
+        f.write("<graph><id>bench_import</id><name>Import benchmark</name><nodes>\n")
+        f.writelines(f"<node><id>{node_id}</id><name>{node_id}</name></node>\n" for node_id in node_ids)
+        f.write("</nodes><edges>\n")
+        f.writelines(
+            f"<node><id>{edge_id}</id><from>{u}</from><to>{v}</to><cost>{cost}</cost></node>\n"
+            for edge_id, u, v, cost in edges
+        )
+        f.write("</edges></graph>\n")
+
+    nodes_path = os.path.join(directory, "nodes.csv")
+    with open(nodes_path, 'w') as f:
+        f.write("id,name\n")
+        f.writelines(f"{node_id},{node_id}\n" for node_id in node_ids)
+    edges_path = os.path.join(directory, "edges.csv")
+    with open(edges_path, 'w') as f:
+        f.write("id,from,to,cost\n")
+        f.writelines(f"{edge_id},{u},{v},{cost}\n" for edge_id, u, v, cost in edges)
+    return xml_path, nodes_path, edges_path
+
+
+def timed(function, *args) -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=100_000)
+    parser.add_argument('--edges', type=int, default=400_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', action='store_true', help='Also time saving to the database')
+    args = parser.parse_args()
+    rows = args.nodes + args.edges
+
+    with tempfile.TemporaryDirectory() as directory:
+        xml_path, nodes_path, edges_path = write_graph_files(directory, args.nodes, args.edges, args.seed)
+        results = [
+            ("parse xml", timed(GraphXMLParser().parse_file, xml_path)),
+            ("parse csv", timed(GraphTabularParser().parse_files, "bench_import", "Import benchmark",
+                                nodes_path, edges_path)),
+        ]
+        if args.save:
+            from src.main import import_tabular, parse_xml, remove_graph
+
+            results.append(("save xml", timed(parse_xml, xml_path, True)))
+            timed(remove_graph, "bench_import")
+            results.append(("save csv", timed(import_tabular, "bench_import", "Import benchmark",
+                                              nodes_path, edges_path)))
+            timed(remove_graph, "bench_import")
+
+    print(f"Graph: {args.nodes} nodes, {args.edges} edges")
+    for name, seconds in results:
+        print(f"{name}: {seconds:.2f} s, {rows / seconds:,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark query throughput on one shared frozen graph by number of threads.
+
+Builds a random sparse graph in memory (no database needed), freezes it and
+answers the same mix of cheapest, cheapest_from and reachability checks from
+thread pools of increasing size. Throughput only scales with threads on a
+free-threaded Python build; on a GIL build the figures stay roughly flat,
+since only one thread runs Python code at a time.
+
+Usage:
+    python -m benchmarks.bench_threads --nodes 50000 --degree 4 --threads 1 2 4 8
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.bench_cheapest_path import build_random_graph
+from src.graph.frozen_graph import FrozenGraph, numpy
+
+
+def run_query(graph: FrozenGraph, query) -> None:
+    kind, start, end = query
+    if kind == "cheapest":
+        graph.find_cheapest_path(start, end)
+    elif kind == "cheapest_from":
+        graph.find_cheapest_from(start, max_nodes=1000)
+    else:
+        graph._reaches(start, end)
+
+
+def time_threads(graph: FrozenGraph, queries, threads: int) -> float:
+    with ThreadPoolExecutor(threads) as pool:
+        started = time.perf_counter()
+        for _ in pool.map(lambda query: run_query(graph, query), queries):
+            pass
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=50_000)
+    parser.add_argument('--degree', type=int, default=4)
+    parser.add_argument('--max-cost', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    graph = FrozenGraph.freeze(build_random_graph(args.nodes, args.degree, args.max_cost, args.seed))
+    rng = random.Random(args.seed + 1)
+    # Distinct starts, so per-thread search caches do not turn queries into lookups
+    queries = [
+        (rng.choice(("cheapest", "cheapest_from", "reaches")), str(i), str(rng.randrange(args.nodes)))
+        for i in rng.sample(range(args.nodes), args.queries)
+    ]
+
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+    print(f"Graph: {args.nodes} nodes, {args.nodes * args.degree} edges")
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled() else 'disabled'}, "
+          f"NumPy {'installed' if numpy is not None else 'not installed'}")
+    print(f"Queries: {args.queries}")
+    baseline = None
+    for threads in args.threads:
+        seconds = time_threads(graph, queries, threads)
+        baseline = baseline or seconds
+        print(f"{threads:>3} threads: {args.queries / seconds:8.1f} queries/s  speedup {baseline / seconds:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
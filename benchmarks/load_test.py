@@ -0,0 +1,229 @@
+"""
+Replay recorded query workloads against process_queries and report latency percentiles.
+
+Reads one or more query files in the format of the query command (like
+sample_input.json) and sends every query as its own request, the way
+separate clients would, from a pool of workers. With --rate requests are
+dispatched on a fixed schedule (open loop) and latency is measured from each
+request's scheduled time, so a backlog shows up as latency instead of being
+hidden by the slower dispatch; without it every worker sends its next request
+as soon as the previous one completes (closed loop).
+
+The report is a JSON document with throughput and p50/p95/p99 latency per
+query type, error counts and peak RSS, together with the configuration and
+settings it ran with, so runs can be compared across versions and
+configurations. Needs a database holding the graphs the workload refers to.
+
+Usage:
+    python -m benchmarks.load_test workload.json --concurrency 8 --rate 200 --repeat 5
+    python -m benchmarks.load_test workload.json --processes --cached --set LAZY_LOADING=true
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import argparse
+import json
+import math
+import random
+import resource
+import sys
+import time
+
+from src.config import settings
+from src.main import QUERY_TYPES, process_queries, run_queries
+
+
+# (graph_id, query) pairs, one per request
+Request = Tuple[str, Dict[str, Any]]
+
+
+def load_workload(paths: Iterable[str]) -> List[Request]:
+    requests = []
+    for path in paths:
+        with open(path, 'r') as f:
+            recorded = json.load(f)
+        for query in recorded.get("queries", []):
+            requests.append((recorded["graph_id"], query))
+    return requests
+
+
+def query_type(query: Dict[str, Any]) -> str:
+    return next((name for name in QUERY_TYPES if name in query), "unknown")
+
+
+def parse_overrides(assignments: Iterable[str]) -> Dict[str, Any]:
+    """KEY=VALUE settings overrides, converted to the type of the current setting."""
+    overrides = {}
+    for assignment in assignments:
+        name, _, value = assignment.partition('=')
+        if not hasattr(settings, name):
+            raise ValueError(f"Unknown setting: {name}")
+        current = getattr(settings, name)
+        if isinstance(current, bool):
+            overrides[name] = value.lower() in ('1', 'true', 'yes', 'on')
+        else:
+            overrides[name] = type(current)(value)
+    return overrides
+
+
+def apply_overrides(overrides: Dict[str, Any]) -> None:
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+
+def send_request(request: Request, scheduled_at: Optional[float], cached: bool) -> Tuple[float, bool]:
+    """
+    Answer one request and return (latency in seconds, whether it succeeded).
+
+    Latency runs from scheduled_at when given (time.monotonic is shared by all
+    processes), otherwise from when the request started.
+    """
+    graph_id, query = request
+    started = time.monotonic()
+    try:
+        input_data = {"graph_id": graph_id, "queries": [query]}
+        results = run_queries(input_data, cached=True) if cached else process_queries(input_data)
+        answers = results.get("answers") or [{}]
+        succeeded = "error" not in results and all(
+            "error" not in answer for answer in answers[0].values()
+        )
+    except Exception:
+        succeeded = False
+    return time.monotonic() - (scheduled_at if scheduled_at is not None else started), succeeded
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_per_second": round(len(ordered) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) * 1000 / len(ordered), 3) if ordered else 0.0,
+            "p50": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99": round(percentile(ordered, 0.99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process or any finished worker process, in MiB."""
+    peak_kb = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return round(peak_kb / 1024, 1)  # ru_maxrss is in KiB on Linux
+
+
+def replay(requests: List[Request], concurrency: int = 4, rate: Optional[float] = None,
+           processes: bool = False, cached: bool = False,
+           overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Send every request through a pool of concurrency workers and report the results.
+
+    Args:
+        requests: (graph_id, query) pairs, sent in order
+        concurrency: Number of worker threads, or processes with processes=True
+        rate: Requests per second to dispatch at; None sends them as fast as workers allow
+        processes: Use worker processes instead of threads (no shared graph cache)
+        cached: Keep graphs cached in each worker, as the serve command does. Worker
+            threads share the process's graph cache and change listener, whose
+            connection they poll one at a time
+        overrides: Settings to apply in every worker
+
+    Returns:
+        Report with overall and per-query-type throughput and latency percentiles
+    """
+    overrides = overrides or {}
+    apply_overrides(overrides)
+    if processes:
+        executor = ProcessPoolExecutor(concurrency, initializer=apply_overrides, initargs=(overrides,))
+    else:
+        executor = ThreadPoolExecutor(concurrency)
+
+    futures: List[Tuple[str, Future]] = []
+    started = time.monotonic()
+    with executor:
+        for i, request in enumerate(requests):
+            scheduled_at = None
+            if rate:
+                scheduled_at = started + i / rate
+                delay = scheduled_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append((query_type(request[1]), executor.submit(send_request, request, scheduled_at, cached)))
+        results = [(name, future.result()) for name, future in futures]
+    elapsed = time.monotonic() - started
+
+    by_type: Dict[str, Tuple[List[float], List[bool]]] = {}
+    for name, (latency, succeeded) in results:
+        latencies, outcomes = by_type.setdefault(name, ([], []))
+        latencies.append(latency)
+        outcomes.append(succeeded)
+
+    return {
+        "config": {
+            "concurrency": concurrency,
+            "rate": rate,
+            "workers": "processes" if processes else "threads",
+            "cached": cached,
+            "settings": {name: value for name, value in settings.model_dump().items() if name != "DATABASE_URL"},
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "overall": summarize(
+            [latency for _, (latency, _) in results],
+            sum(1 for _, (_, succeeded) in results if not succeeded),
+            elapsed
+        ),
+        "by_query_type": {
+            name: summarize(latencies, outcomes.count(False), elapsed)
+            for name, (latencies, outcomes) in sorted(by_type.items())
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('workload', nargs='+', help='Query JSON files to replay')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=None, help='Requests per second (default: unthrottled)')
+    parser.add_argument('--repeat', type=int, default=1, help='Replay the workload this many times')
+    parser.add_argument('--shuffle', action='store_true', help='Shuffle requests (seeded by --seed)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--processes', action='store_true', help='Use worker processes instead of threads')
+    parser.add_argument('--cached', action='store_true', help='Keep graphs cached between requests')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help='Override a setting, e.g. --set CONTRACTION_HIERARCHIES=true')
+    parser.add_argument('--label', default=None, help='Free-form label stored in the report')
+    parser.add_argument('--output', default=None, help='Write the report here instead of stdout')
+    args = parser.parse_args()
+
+    requests = load_workload(args.workload) * args.repeat
+    if args.shuffle:
+        random.Random(args.seed).shuffle(requests)
+
+    report = replay(requests, args.concurrency, args.rate, args.processes, args.cached,
+                    parse_overrides(args.set))
+    report["label"] = args.label
+    report["workload"] = args.workload
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
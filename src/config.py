@@ -2,5 +2,41 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "postgresql://postgres:postgres@db:5432/graphs"
+    # Largest integral edge cost for which the bucket-queue (Dial) engine is used
+    DIAL_MAX_COST: int = 1024
+    # Number of paused per-source cheapest-path searches each PathFinder keeps (LRU)
+    SEARCH_CACHE_SIZE: int = 16
+    # Use the topological-order engines for cheapest and paths queries on acyclic graphs
+    DAG_ENGINES: bool = True
+    # Answer cheapest queries with a bidirectional Dijkstra search over the reverse adjacency
+    # (instead of resumable single-source searches)
+    BIDIRECTIONAL_DIJKSTRA: bool = False
+    # Answer cheapest queries from the contraction hierarchy built by `build-ch`, when there is one
+    CONTRACTION_HIERARCHIES: bool = False
+    # Directory of persisted hierarchies, keyed by graph version
+    CH_SNAPSHOT_DIR: str = ""
+    # Fetch adjacency on demand, LAZY_BATCH_SIZE frontier nodes per query, instead of loading whole graphs
+    LAZY_LOADING: bool = False
+    LAZY_BATCH_SIZE: int = 256
+    # Worker processes enumerating each paths query in parallel (0 or 1 enumerates sequentially),
+    # and whether to return parallel results in sequential order (held back until the search ends)
+    PARALLEL_PATHS_WORKERS: int = 0
+    PARALLEL_PATHS_CANONICAL_ORDER: bool = False
+    # Admission control for paths and cycles queries: estimated search size above which
+    # a query is rejected, or truncated to QUERY_TRUNCATE_LIMIT results (0 disables)
+    QUERY_MAX_SEARCH_SIZE: float = 1e8
+    QUERY_OVER_BUDGET: str = "reject"  # "reject" or "truncate"
+    QUERY_TRUNCATE_LIMIT: int = 10000
+    # Hard per-query deadline in seconds (0 disables)
+    QUERY_TIMEOUT_SECONDS: float = 60.0
+    # Number of loaded graphs a query process keeps between requests (LRU, 0 disables)
+    GRAPH_CACHE_SIZE: int = 8
+    # Drop cached graphs when another process announces a change through LISTEN/NOTIFY
+    GRAPH_CHANGE_NOTIFICATIONS: bool = True
+    # Seconds a superseded graph version is kept for lazy readers still using it before it is deleted
+    GRAPH_VERSION_RETENTION_SECONDS: float = 300.0
+    # Query output: indentation (0 writes compact JSON) and encoder backend ("json" or "orjson")
+    OUTPUT_INDENT: int = 2
+    OUTPUT_ENCODER: str = "json"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
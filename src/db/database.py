@@ -1,6 +1,9 @@
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import sys
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from src.config import settings
@@ -12,31 +15,77 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+# Serializes migrations of processes starting at the same time (arbitrary application key)
+MIGRATION_LOCK_KEY = 7_220_331
+
+# Set once this process has seen the schema at the latest migration
+_schema_checked = False
+
+
 def get_migration_files() -> List[Path]:
     """Get all SQL migration files in order."""
     migrations_dir = Path(__file__).parent / 'migrations'
     return sorted(migrations_dir.glob('*.sql'))
 
 
+def get_migrations() -> List[Tuple[str, str, str]]:
+    """(version, checksum, sql) of every migration, in order. The version is the file stem."""
+    migrations = []
+    for migration_file in get_migration_files():
+        sql = migration_file.read_text()
+        migrations.append((migration_file.stem, hashlib.sha256(sql.encode('utf-8')).hexdigest(), sql))
+    return migrations
+
+
+def applied_migrations(session) -> Optional[Dict[str, str]]:
+    """Checksum of every applied migration by version, or None if there is no ledger yet."""
+    try:
+        rows = session.execute(text("SELECT version, checksum FROM schema_migrations")).all()
+    except ProgrammingError:
+        session.rollback()
+        return None
+    return {version: checksum for version, checksum in rows}
+
+
 def init_db() -> None:
-    """Initialize database with both SQLAlchemy models and raw SQL migrations."""
+    """
+    Bring the database schema up to date by applying pending SQL migrations.
+
+    Applied migrations are recorded with their checksum in the schema_migrations
+    ledger, so each one runs once. The migrations are also idempotent, which
+    lets a database created before the ledger existed adopt it safely. A
+    migration edited after it was applied is reported instead of re-run.
+    """
     session = SessionLocal()
     try:
-        Base.metadata.create_all(bind=engine)
-        print("Created database tables from SQLAlchemy models")
-
-        # Apply both sql migrations
-        for migration_file in get_migration_files():
-            print(f"Applying migration: {migration_file.name}")
-            with migration_file.open('r') as f:
-                sql = f.read()
-                session.execute(text(sql))
+        # Locked before anything else, even creating the ledger: concurrent
+        # CREATE TABLE IF NOT EXISTS can fail on the catalog's unique indexes
+        session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        session.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                checksum TEXT NOT NULL,
+                applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        applied = applied_migrations(session) or {}
+
+        for version, checksum, sql in get_migrations():
+            if version in applied:
+                if applied[version] != checksum:
+                    raise RuntimeError(f"Migration {version} was modified after it was applied")
+                continue
+            print(f"Applying migration: {version}", file=sys.stderr)
+            session.execute(text(sql))
+            session.execute(
+                text("INSERT INTO schema_migrations (version, checksum) VALUES (:version, :checksum)"),
+                {"version": version, "checksum": checksum}
+            )
 
         session.commit()
-        print("Database initialization completed successfully")
 
     except Exception as e:
-        print(f"Error initializing database: {str(e)}")
+        print(f"Error initializing database: {str(e)}", file=sys.stderr)
         session.rollback()
         raise
     finally:
@@ -44,32 +93,26 @@ def init_db() -> None:
 
 
 def ensure_db_initialized() -> None:
-    """Ensure database is initialized with all required objects."""
+    """
+    Ensure the database schema is at the latest migration.
+
+    The first call in a process reads the ledger (a single query) and migrates
+    if anything is pending; later calls return without touching the database.
+    """
+    global _schema_checked
+    if _schema_checked:
+        return
+
     session = SessionLocal()
     try:
-        # Check if graphs table exists
-        result = session.execute(
-            text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'graphs'
-                )
-            """)
-        )
-        tables_exist = result.scalar()
-
-        if not tables_exist:
-            print("Database tables not found. Initializing database...")
-            init_db()
-        else:
-            print("Database tables already exist")
-
-    except Exception as e:
-        print(f"Error checking database state: {str(e)}")
-        raise
+        applied = applied_migrations(session) or {}
     finally:
         session.close()
 
+    if any(applied.get(version) != checksum for version, checksum, _ in get_migrations()):
+        init_db()
+    _schema_checked = True
+
 
 class DatabaseSession:
     def __enter__(self):
@@ -0,0 +1,66 @@
+from typing import Iterable, Optional, Sequence
+import csv
+import io
+from sqlalchemy.orm import Session
+
+from src.db.models import Graph
+from src.db.partitions import create_graph_partitions
+from src.db.versions import create_version, publish_version
+
+
+def _copy_rows(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> None:
+    """Stream rows into a table with COPY, the fastest way to load rows into PostgreSQL."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def write_graph(session: Session, graph_id: str, name: str, node_ids: Sequence[str],
+                node_names: Sequence[str], edge_ids: Sequence[str], edge_from: Sequence[str],
+                edge_to: Sequence[str], edge_costs: Sequence[float],
+                content_hash: Optional[str] = None) -> int:
+    """
+    Write a validated graph as a new version and make it current, without committing.
+
+    Nodes and edges are loaded with COPY, so no row goes through the ORM. The
+    internal IDs the nodes were given are read back in a single query to
+    resolve the edge endpoints. The graph row and its partitions are created
+    by the first save of a graph ID.
+
+    Returns:
+        ID of the new version
+    """
+    graph = session.get(Graph, graph_id)
+    if graph is None:
+        graph = Graph(id=graph_id, name=name)
+        session.add(graph)
+        session.flush()
+        create_graph_partitions(session, graph_id)
+    graph.name = name
+    graph.content_hash = content_hash
+    session.flush()
+    version_id = create_version(session, graph_id, content_hash)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        _copy_rows(
+            cursor, 'nodes', ('node_id', 'name', 'graph_id', 'version_id'),
+            ((node_id, node_name, graph_id, version_id) for node_id, node_name in zip(node_ids, node_names))
+        )
+        cursor.execute(
+            "SELECT node_id, id FROM nodes WHERE graph_id = %s AND version_id = %s", (graph_id, version_id)
+        )
+        key_of = dict(cursor.fetchall())
+        _copy_rows(
+            cursor, 'edges', ('edge_id', 'from_node_id', 'to_node_id', 'cost', 'graph_id', 'version_id'),
+            (
+                (edge_id, key_of[from_node], key_of[to_node], cost, graph_id, version_id)
+                for edge_id, from_node, to_node, cost in zip(edge_ids, edge_from, edge_to, edge_costs)
+            )
+        )
+    finally:
+        cursor.close()
+
+    publish_version(session, graph_id, version_id)
+    return version_id
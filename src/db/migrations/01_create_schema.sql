@@ -1,4 +1,4 @@
-CREATE TABLE graphs (
+CREATE TABLE IF NOT EXISTS graphs (
     id TEXT PRIMARY KEY,
     name TEXT NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -8,7 +8,7 @@ COMMENT ON TABLE graphs IS 'Stores metadata about each graph';
 COMMENT ON COLUMN graphs.id IS 'Unique identifier for the graph, from XML id element';
 COMMENT ON COLUMN graphs.name IS 'Human-readable name of the graph, from XML name element';
 
-CREATE TABLE nodes (
+CREATE TABLE IF NOT EXISTS nodes (
     id SERIAL PRIMARY KEY,
     node_id TEXT NOT NULL,
     name TEXT NOT NULL,
@@ -24,7 +24,7 @@ COMMENT ON COLUMN nodes.node_id IS 'Node identifier from XML, unique within a gr
 COMMENT ON COLUMN nodes.name IS 'Human-readable name of the node';
 COMMENT ON COLUMN nodes.graph_id IS 'Reference to the graph this node belongs to';
 
-CREATE TABLE edges (
+CREATE TABLE IF NOT EXISTS edges (
     id SERIAL PRIMARY KEY,
     edge_id TEXT NOT NULL,
     from_node_id INTEGER NOT NULL,
@@ -48,6 +48,6 @@ COMMENT ON COLUMN edges.cost IS 'Non-negative weight/cost of traversing this edg
 COMMENT ON COLUMN edges.graph_id IS 'Reference to the graph this edge belongs to';
 
 -- Indexes for performance
-CREATE INDEX idx_nodes_graph_id ON nodes(graph_id);
-CREATE INDEX idx_edges_graph_id ON edges(graph_id);
-CREATE INDEX idx_edges_nodes ON edges(from_node_id, to_node_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_nodes_graph_id ON nodes(graph_id);
+CREATE INDEX IF NOT EXISTS idx_edges_graph_id ON edges(graph_id);
+CREATE INDEX IF NOT EXISTS idx_edges_nodes ON edges(from_node_id, to_node_id);
\ No newline at end of file
@@ -0,0 +1,73 @@
+-- Convert nodes and edges to tables partitioned by graph_id.
+-- Each saved graph gets its own partitions (created by the ingest path, see
+-- src/db/partitions.py) so loading a graph only touches its own indexes and
+-- deleting it is a DROP TABLE instead of a large DELETE.
+-- Rows of graphs without a dedicated partition live in the default partitions.
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'nodes'::regclass) = 'p' THEN
+        RETURN;  -- Already partitioned
+    END IF;
+
+    CREATE TABLE nodes_partitioned (
+        id SERIAL,
+        node_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        graph_id TEXT NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    ) PARTITION BY LIST (graph_id);
+    CREATE TABLE nodes_default PARTITION OF nodes_partitioned DEFAULT;
+
+    CREATE TABLE edges_partitioned (
+        id SERIAL,
+        edge_id TEXT NOT NULL,
+        from_node_id INTEGER NOT NULL,
+        to_node_id INTEGER NOT NULL,
+        cost DOUBLE PRECISION NOT NULL DEFAULT 0.0,
+        graph_id TEXT NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    ) PARTITION BY LIST (graph_id);
+    CREATE TABLE edges_default PARTITION OF edges_partitioned DEFAULT;
+
+    INSERT INTO nodes_partitioned (id, node_id, name, graph_id, created_at)
+    SELECT id, node_id, name, graph_id, created_at FROM nodes;
+    INSERT INTO edges_partitioned (id, edge_id, from_node_id, to_node_id, cost, graph_id, created_at)
+    SELECT id, edge_id, from_node_id, to_node_id, cost, graph_id, created_at FROM edges;
+
+    DROP TABLE edges;
+    DROP TABLE nodes;
+
+    ALTER TABLE nodes_partitioned RENAME TO nodes;
+    ALTER SEQUENCE nodes_partitioned_id_seq RENAME TO nodes_id_seq;
+    PERFORM setval('nodes_id_seq', COALESCE((SELECT max(id) FROM nodes), 0) + 1, false);
+
+    ALTER TABLE edges_partitioned RENAME TO edges;
+    ALTER SEQUENCE edges_partitioned_id_seq RENAME TO edges_id_seq;
+    PERFORM setval('edges_id_seq', COALESCE((SELECT max(id) FROM edges), 0) + 1, false);
+
+    -- Primary keys and unique constraints on partitioned tables must include graph_id
+    ALTER TABLE nodes
+        ADD CONSTRAINT nodes_pkey PRIMARY KEY (graph_id, id),
+        ADD CONSTRAINT fk_graph FOREIGN KEY (graph_id) REFERENCES graphs(id) ON DELETE CASCADE,
+        ADD CONSTRAINT unique_node_per_graph UNIQUE (node_id, graph_id),
+        ADD CONSTRAINT valid_node_id CHECK (length(node_id) > 0);
+
+    ALTER TABLE edges
+        ADD CONSTRAINT edges_pkey PRIMARY KEY (graph_id, id),
+        ADD CONSTRAINT fk_from_node FOREIGN KEY (graph_id, from_node_id)
+            REFERENCES nodes(graph_id, id) ON DELETE CASCADE,
+        ADD CONSTRAINT fk_to_node FOREIGN KEY (graph_id, to_node_id)
+            REFERENCES nodes(graph_id, id) ON DELETE CASCADE,
+        ADD CONSTRAINT fk_graph FOREIGN KEY (graph_id) REFERENCES graphs(id) ON DELETE CASCADE,
+        ADD CONSTRAINT unique_edge_per_graph UNIQUE (edge_id, graph_id),
+        ADD CONSTRAINT valid_edge_id CHECK (length(edge_id) > 0),
+        ADD CONSTRAINT positive_cost CHECK (cost >= 0);
+
+    COMMENT ON TABLE nodes IS 'Stores vertices (nodes) of each graph, partitioned by graph';
+    COMMENT ON TABLE edges IS 'Stores directed edges connecting nodes in each graph, partitioned by graph';
+
+    -- Created on the parent, so every partition gets its own copy
+    CREATE INDEX idx_edges_nodes ON edges(from_node_id, to_node_id);
+    CREATE INDEX idx_edges_from_covering ON edges(from_node_id) INCLUDE (to_node_id, cost);
+END
+$$;
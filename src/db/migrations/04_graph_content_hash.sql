@@ -0,0 +1,5 @@
+-- Hash of the XML file each graph was saved from (see GraphXMLParser.content_hash).
+-- The ingest path looks it up to skip files identical to a saved graph.
+ALTER TABLE graphs ADD COLUMN IF NOT EXISTS content_hash TEXT;
+CREATE INDEX IF NOT EXISTS ix_graphs_content_hash ON graphs (content_hash);
+COMMENT ON COLUMN graphs.content_hash IS 'SHA-256 of the XML file the graph was saved from';
@@ -0,0 +1,121 @@
+-- Immutable graph versions (see src/db/versions.py).
+-- Saving a graph writes its nodes and edges as a new version next to the
+-- current one and then moves graphs.current_version_id to it, so readers see
+-- either the old or the new graph and never a mix. Superseded versions are
+-- garbage-collected once no reader can still be using them.
+-- Version 0 holds rows written without a version (before this migration or
+-- directly), and is the current version of graphs that were never re-saved.
+CREATE TABLE IF NOT EXISTS graph_versions (
+    id SERIAL PRIMARY KEY,
+    graph_id TEXT NOT NULL REFERENCES graphs(id) ON DELETE CASCADE,
+    content_hash TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    superseded_at TIMESTAMP WITH TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS ix_graph_versions_graph_id ON graph_versions (graph_id);
+COMMENT ON TABLE graph_versions IS 'Saved versions of each graph; nodes and edges are tagged with their version';
+COMMENT ON COLUMN graph_versions.superseded_at IS 'When another version became current, NULL while current';
+
+ALTER TABLE graphs ADD COLUMN IF NOT EXISTS current_version_id INTEGER NOT NULL DEFAULT 0;
+COMMENT ON COLUMN graphs.current_version_id IS 'Version readers load, switched atomically when a new version is saved';
+
+ALTER TABLE nodes ADD COLUMN IF NOT EXISTS version_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE edges ADD COLUMN IF NOT EXISTS version_id INTEGER NOT NULL DEFAULT 0;
+
+-- Node and edge IDs are unique within a version instead of within a graph
+ALTER TABLE nodes DROP CONSTRAINT IF EXISTS unique_node_per_graph;
+ALTER TABLE nodes DROP CONSTRAINT IF EXISTS unique_graph_node;
+ALTER TABLE edges DROP CONSTRAINT IF EXISTS unique_edge_per_graph;
+ALTER TABLE edges DROP CONSTRAINT IF EXISTS unique_graph_edge;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'unique_node_per_version') THEN
+        ALTER TABLE nodes ADD CONSTRAINT unique_node_per_version UNIQUE (graph_id, version_id, node_id);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'unique_edge_per_version') THEN
+        ALTER TABLE edges ADD CONSTRAINT unique_edge_per_version UNIQUE (graph_id, version_id, edge_id);
+    END IF;
+END
+$$;
+CREATE INDEX IF NOT EXISTS idx_edges_version ON edges (graph_id, version_id);
+
+-- Cycles of the current version only; a single statement reads a consistent snapshot
+CREATE OR REPLACE FUNCTION find_cycles(graph_id_param TEXT)
+RETURNS TABLE (
+    cycle_path INTEGER[],
+    cycle_node_ids TEXT[]
+) AS $$
+WITH RECURSIVE current_version AS (
+    SELECT current_version_id AS id FROM graphs WHERE id = graph_id_param
+),
+version_edges AS (
+    SELECT e.* FROM edges e, current_version v
+    WHERE e.graph_id = graph_id_param AND e.version_id = v.id
+),
+paths(last_node, path, path_nodes, is_cycle) AS (
+    -- Start from each node in the graph
+    SELECT
+        e.to_node_id,
+        ARRAY[e.from_node_id, e.to_node_id],
+        ARRAY[n1.node_id, n2.node_id],
+        false
+    FROM version_edges e
+    JOIN nodes n1 ON e.from_node_id = n1.id
+    JOIN nodes n2 ON e.to_node_id = n2.id
+
+    UNION ALL
+
+    -- Recursively follow edges
+    SELECT
+        e.to_node_id,
+        p.path || e.to_node_id,
+        p.path_nodes || n2.node_id,
+        e.to_node_id = ANY(p.path)
+    FROM paths p
+    JOIN version_edges e ON e.from_node_id = p.last_node
+    JOIN nodes n2 ON e.to_node_id = n2.id
+    WHERE
+        NOT p.is_cycle
+        AND array_length(p.path, 1) < (
+            SELECT count(*) + 1 FROM nodes n, current_version v
+            WHERE n.graph_id = graph_id_param AND n.version_id = v.id
+        )
+),
+-- Get all cycles
+raw_cycles AS (
+    SELECT DISTINCT
+        cycle.path,
+        cycle.path_nodes
+    FROM paths cycle
+    WHERE
+        cycle.is_cycle
+        AND cycle.path[1] = cycle.path[array_length(cycle.path, 1)]
+        AND array_length(cycle.path, 1) > 2
+),
+-- Normalize cycles by rotating to start with the smallest node_id
+normalized_cycles AS (
+    SELECT
+        path,
+        path_nodes,
+        (SELECT min(idx)
+         FROM generate_subscripts(path_nodes, 1) idx
+         WHERE idx < array_length(path_nodes, 1)
+         AND path_nodes[idx] = (
+             SELECT min(elem)
+             FROM unnest(path_nodes[1:array_length(path_nodes, 1)-1]) elem
+         )
+        ) as min_idx
+    FROM raw_cycles
+)
+-- Return normalized unique cycles
+SELECT DISTINCT
+    array_cat(
+        path[min_idx:array_length(path, 1)-1],
+        path[1:min_idx]
+    ) as cycle_path,
+    array_cat(
+        path_nodes[min_idx:array_length(path_nodes, 1)-1],
+        path_nodes[1:min_idx]
+    ) as cycle_node_ids
+FROM normalized_cycles;
+$$ LANGUAGE SQL;
@@ -0,0 +1,10 @@
+-- Version 0 (rows written without a version) has no graph_versions row to record
+-- when it was superseded, so the time goes on the graph instead. Garbage
+-- collection then keeps version 0 for the same retention period as any other
+-- version, for lazy readers still pinned to it.
+ALTER TABLE graphs ADD COLUMN IF NOT EXISTS initial_version_superseded_at TIMESTAMP WITH TIME ZONE;
+COMMENT ON COLUMN graphs.initial_version_superseded_at IS 'When a saved version first replaced version 0, NULL while version 0 is current';
+
+-- Graphs already replaced before this migration start their retention period now
+UPDATE graphs SET initial_version_superseded_at = now()
+WHERE current_version_id <> 0 AND initial_version_superseded_at IS NULL;
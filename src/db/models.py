@@ -1,5 +1,8 @@
 from src.db.database import Base
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    DDL, Column, DateTime, Integer, String, Float, ForeignKey, ForeignKeyConstraint, Index,
+    PrimaryKeyConstraint, UniqueConstraint, event, func
+)
 from sqlalchemy.orm import relationship
 
 class Graph(Base):
@@ -9,6 +12,12 @@ class Graph(Base):
     Attributes:
         id (str): Primary key for the graph
         name (str): Name of the graph
+        content_hash (str): Hash of the XML file the graph was saved from, used to
+            skip re-ingesting identical files
+        current_version_id (int): Version readers load (see GraphVersion), 0 for
+            rows written without a version
+        initial_version_superseded_at (datetime): When version 0 stopped being
+            current, which has no GraphVersion row to record it
         nodes (relationship): One-to-many relationship with Node table
         edges (relationship): One-to-many relationship with Edge table
     """
@@ -16,62 +25,136 @@ class Graph(Base):
 
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
+    content_hash = Column(String, index=True)
+    current_version_id = Column(Integer, nullable=False, default=0, server_default='0')
+    initial_version_superseded_at = Column(DateTime(timezone=True))
 
+    versions = relationship("GraphVersion", back_populates="graph", cascade="all, delete-orphan")
     nodes = relationship("Node", back_populates="graph", cascade="all, delete-orphan")
     edges = relationship("Edge", back_populates="graph", cascade="all, delete-orphan")
 
 
+class GraphVersion(Base):
+    """
+    An immutable saved version of a graph's nodes and edges.
+
+    Saving a graph writes its rows under a new version and then switches
+    Graph.current_version_id to it (see src/db/versions.py).
+
+    Attributes:
+        id (int): Version ID, the version_id of its nodes and edges
+        graph_id (str): Foreign key reference to the graph
+        content_hash (str): Hash of the file the version was saved from
+        created_at (datetime): When the version was written
+        superseded_at (datetime): When another version became current, None while current
+    """
+    __tablename__ = 'graph_versions'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    graph_id = Column(String, ForeignKey('graphs.id', ondelete='CASCADE'), nullable=False, index=True)
+    content_hash = Column(String)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    superseded_at = Column(DateTime(timezone=True))
+
+    graph = relationship("Graph", back_populates="versions")
+
+
 class Node(Base):
     """
     Represents a node in a graph.
 
+    The table is list-partitioned by graph_id (see src/db/partitions.py), so the
+    primary key includes graph_id.
+
     Attributes:
-        id (int): Auto-incrementing primary key
+        id (int): Auto-incrementing identifier, unique across graphs
         node_id (str): User-provided node identifier
         name (str): Name of the node
-        graph_id (str): Foreign key reference to the parent graph
+        graph_id (str): Foreign key reference to the parent graph, the partition key
+        version_id (int): Graph version the node belongs to
     """
     __tablename__ = 'nodes'
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, autoincrement=True, nullable=False)
     node_id = Column(String, nullable=False)
     name = Column(String, nullable=False)
     graph_id = Column(String, ForeignKey('graphs.id', ondelete='CASCADE'), nullable=False)
+    version_id = Column(Integer, nullable=False, default=0, server_default='0')
 
     __table_args__ = (
-        UniqueConstraint('graph_id', 'node_id', name='unique_graph_node'),
+        PrimaryKeyConstraint('graph_id', 'id', name='nodes_pkey'),
+        UniqueConstraint('graph_id', 'version_id', 'node_id', name='unique_node_per_version'),
+        {'postgresql_partition_by': 'LIST (graph_id)'},
     )
 
     graph = relationship("Graph", back_populates="nodes")
-    outgoing_edges = relationship("Edge", back_populates="from_node", foreign_keys="Edge.from_node_id")
-    incoming_edges = relationship("Edge", back_populates="to_node", foreign_keys="Edge.to_node_id")
+    outgoing_edges = relationship(
+        "Edge", back_populates="from_node",
+        primaryjoin="and_(Node.graph_id == Edge.graph_id, Node.id == foreign(Edge.from_node_id))"
+    )
+    incoming_edges = relationship(
+        "Edge", back_populates="to_node",
+        primaryjoin="and_(Node.graph_id == Edge.graph_id, Node.id == foreign(Edge.to_node_id))"
+    )
 
 
 class Edge(Base):
     """
     Represents a directed edge in a graph.
 
+    Like nodes, the table is list-partitioned by graph_id, and node references
+    include graph_id so an edge can only connect nodes of its own graph.
+
     Attributes:
-        id (int): Auto-incrementing primary key
+        id (int): Auto-incrementing identifier, unique across graphs
         edge_id (str): User-provided edge identifier
         from_node_id (int): Foreign key reference to the source node
         to_node_id (int): Foreign key reference to the target node
         cost (float): Cost of the edge, defaults to 0.0
-        graph_id (str): Foreign key reference to the parent graph
+        graph_id (str): Foreign key reference to the parent graph, the partition key
+        version_id (int): Graph version the edge belongs to
     """
     __tablename__ = 'edges'
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, autoincrement=True, nullable=False)
     edge_id = Column(String, nullable=False)
-    from_node_id = Column(Integer, ForeignKey('nodes.id', ondelete='CASCADE'), nullable=False)
-    to_node_id = Column(Integer, ForeignKey('nodes.id', ondelete='CASCADE'), nullable=False)
+    from_node_id = Column(Integer, nullable=False)
+    to_node_id = Column(Integer, nullable=False)
     cost = Column(Float, nullable=False, default=0.0)
     graph_id = Column(String, ForeignKey('graphs.id', ondelete='CASCADE'), nullable=False)
+    version_id = Column(Integer, nullable=False, default=0, server_default='0')
 
     __table_args__ = (
-        UniqueConstraint('graph_id', 'edge_id', name='unique_graph_edge'),
+        PrimaryKeyConstraint('graph_id', 'id', name='edges_pkey'),
+        ForeignKeyConstraint(
+            ['graph_id', 'from_node_id'], ['nodes.graph_id', 'nodes.id'],
+            name='fk_from_node', ondelete='CASCADE'
+        ),
+        ForeignKeyConstraint(
+            ['graph_id', 'to_node_id'], ['nodes.graph_id', 'nodes.id'],
+            name='fk_to_node', ondelete='CASCADE'
+        ),
+        UniqueConstraint('graph_id', 'version_id', 'edge_id', name='unique_edge_per_version'),
+        Index('idx_edges_version', 'graph_id', 'version_id'),
+        Index('idx_edges_nodes', 'from_node_id', 'to_node_id'),
+        Index('idx_edges_from_covering', 'from_node_id', postgresql_include=['to_node_id', 'cost']),
+        {'postgresql_partition_by': 'LIST (graph_id)'},
     )
 
     graph = relationship("Graph", back_populates="edges")
-    from_node = relationship("Node", foreign_keys=[from_node_id], back_populates="outgoing_edges")
-    to_node = relationship("Node", foreign_keys=[to_node_id], back_populates="incoming_edges")
+    from_node = relationship(
+        "Node", back_populates="outgoing_edges",
+        primaryjoin="and_(Node.graph_id == Edge.graph_id, Node.id == foreign(Edge.from_node_id))"
+    )
+    to_node = relationship(
+        "Node", back_populates="incoming_edges",
+        primaryjoin="and_(Node.graph_id == Edge.graph_id, Node.id == foreign(Edge.to_node_id))"
+    )
+
+
+# Rows of graphs without a dedicated partition (see src/db/partitions.py) land here
+for _table in (Node.__table__, Edge.__table__):
+    event.listen(
+        _table, 'after_create',
+        DDL(f"CREATE TABLE IF NOT EXISTS {_table.name}_default PARTITION OF {_table.name} DEFAULT")
+    )
@@ -0,0 +1,96 @@
+from typing import Any, Callable, List, Optional
+import select
+import threading
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from src.db.database import engine
+
+
+# Channel on which the graph ID of every saved, modified or deleted graph is announced
+GRAPH_CHANGED_CHANNEL = 'graph_changed'
+
+
+def notify_graph_changed(session: Session, graph_id: str) -> None:
+    """
+    Announce a change to a graph to every listening process.
+
+    PostgreSQL delivers the notification only when the session's transaction
+    commits, and not at all if it rolls back, so call this before commit.
+    """
+    session.execute(
+        text("SELECT pg_notify(:channel, :graph_id)"),
+        {"channel": GRAPH_CHANGED_CHANNEL, "graph_id": graph_id}
+    )
+
+
+class GraphChangeListener:
+    """
+    Receives graph change notifications on a dedicated connection.
+
+    The connection LISTENs on GRAPH_CHANGED_CHANNEL in autocommit mode and is
+    kept out of the session pool. poll() only inspects the connection's socket,
+    so calling it before every request costs no round trip to the database.
+    When the connection is lost, notifications sent in the meantime are lost
+    too, so on_reset is called after reconnecting to drop everything cached.
+
+    A psycopg2 connection must not be used by two threads at once, so poll()
+    and close() hold a lock: threads answering requests concurrently (a
+    threaded server, the load test with --cached) take turns on the connection.
+    """
+
+    def __init__(self, on_change: Callable[[str], Any],
+                 on_reset: Optional[Callable[[], Any]] = None):
+        self.on_change = on_change
+        self.on_reset = on_reset
+        self._connection = None
+        self._lock = threading.RLock()  # Reentrant: on_change/on_reset may close the listener
+        self._connect()
+
+    def _connect(self) -> None:
+        pooled = engine.raw_connection()
+        connection = pooled.driver_connection
+        pooled.detach()  # Owned by the listener for its whole life, never returned to the pool
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {GRAPH_CHANGED_CHANNEL}")
+        self._connection = connection
+
+    def fileno(self) -> int:
+        return self._connection.fileno()
+
+    def poll(self, timeout: float = 0.0) -> List[str]:
+        """
+        Handle pending notifications, waiting up to timeout seconds for one.
+
+        Returns:
+            IDs of the graphs reported as changed, in arrival order
+        """
+        with self._lock:
+            try:
+                ready, _, _ = select.select([self._connection], [], [], timeout)
+                if not ready:
+                    return []
+                self._connection.poll()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError, OSError):
+                self.close()
+                self._connect()
+                if self.on_reset is not None:
+                    self.on_reset()
+                return []
+
+            changed = []
+            while self._connection.notifies:
+                notification = self._connection.notifies.pop(0)
+                changed.append(notification.payload)
+                self.on_change(notification.payload)
+            return changed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.close()
+                except psycopg2.Error:
+                    pass
+                self._connection = None
@@ -0,0 +1,98 @@
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def current_version(session: Session, graph_id: str) -> Optional[int]:
+    """ID of the version readers of a graph load, or None if the graph does not exist."""
+    return session.execute(
+        text("SELECT current_version_id FROM graphs WHERE id = :graph_id"), {"graph_id": graph_id}
+    ).scalar()
+
+
+def create_version(session: Session, graph_id: str, content_hash: Optional[str] = None) -> int:
+    """
+    Start a new version of a saved graph and return its ID.
+
+    Nodes and edges written with this version_id stay invisible to readers
+    until publish_version makes it current.
+    """
+    return session.execute(
+        text("INSERT INTO graph_versions (graph_id, content_hash) VALUES (:graph_id, :content_hash) RETURNING id"),
+        {"graph_id": graph_id, "content_hash": content_hash}
+    ).scalar()
+
+
+def publish_version(session: Session, graph_id: str, version_id: int) -> Optional[int]:
+    """
+    Make a version the current one of its graph, returning the version it replaces.
+
+    The switch is a single row update, so it becomes visible to readers
+    atomically when the transaction commits. The graph row stays locked until
+    then, which serializes concurrent saves of the same graph.
+    """
+    previous = session.execute(
+        text("SELECT current_version_id FROM graphs WHERE id = :graph_id FOR UPDATE"), {"graph_id": graph_id}
+    ).scalar()
+    session.execute(
+        text("UPDATE graphs SET current_version_id = :version_id WHERE id = :graph_id"),
+        {"graph_id": graph_id, "version_id": version_id}
+    )
+    if previous == 0:
+        # Version 0 has no graph_versions row; its superseded time is kept on the graph
+        session.execute(
+            text("""
+                UPDATE graphs SET initial_version_superseded_at = now()
+                WHERE id = :graph_id AND initial_version_superseded_at IS NULL
+            """),
+            {"graph_id": graph_id}
+        )
+    else:
+        session.execute(
+            text("UPDATE graph_versions SET superseded_at = now() WHERE id = :previous"), {"previous": previous}
+        )
+    return previous
+
+
+def collect_garbage(session: Session, retention_seconds: float) -> int:
+    """
+    Delete the nodes and edges of versions superseded more than retention_seconds ago.
+
+    Eager loads read their version in one transaction snapshot and are not
+    affected by the deletion at all; the retention period covers lazily loaded
+    graphs, which keep fetching rows of the version they started with. Rows of
+    version 0 are kept for the same period after the graph's first saved
+    version replaced them (graphs.initial_version_superseded_at).
+
+    The rows are deleted with DELETE inside the graph's partitions (see
+    03_partition_by_graph.sql), not by dropping a partition: partitions are per
+    graph, not per version. Each collection therefore leaves dead tuples for
+    autovacuum and writes WAL in proportion to the size of the collected
+    versions, as deleting a graph did before partitioning.
+
+    Returns:
+        Number of versions deleted
+    """
+    expired = session.execute(
+        text("""
+            SELECT v.graph_id, v.id FROM graph_versions v JOIN graphs g ON g.id = v.graph_id
+            WHERE v.id <> g.current_version_id
+              AND v.superseded_at < now() - make_interval(secs => :retention)
+            UNION ALL
+            SELECT g.id, 0 FROM graphs g
+            WHERE g.current_version_id <> 0
+              AND g.initial_version_superseded_at < now() - make_interval(secs => :retention)
+              AND EXISTS (SELECT 1 FROM nodes n WHERE n.graph_id = g.id AND n.version_id = 0)
+        """),
+        {"retention": retention_seconds}
+    ).all()
+
+    for graph_id, version_id in expired:
+        # Edges first: their foreign keys reference the nodes
+        for table in ("edges", "nodes"):
+            session.execute(
+                text(f"DELETE FROM {table} WHERE graph_id = :graph_id AND version_id = :version_id"),
+                {"graph_id": graph_id, "version_id": version_id}
+            )
+        session.execute(text("DELETE FROM graph_versions WHERE id = :version_id"), {"version_id": version_id})
+    return len(expired)
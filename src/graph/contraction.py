@@ -0,0 +1,278 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from pathlib import Path
+import hashlib
+import heapq
+import json
+import time
+from src.utils.deadline import Deadline
+
+
+# Witness searches are cut off after settling this many nodes. A cut-off search
+# may add a shortcut that was not strictly needed, which costs space but never
+# correctness.
+WITNESS_SETTLE_LIMIT = 64
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over a directed graph with non-negative costs.
+
+    Preprocessing contracts nodes one by one in order of importance (edge
+    difference plus the number of already contracted neighbours), adding a
+    shortcut u -> w whenever contracting v removes the only cheapest path
+    u -> v -> w. Queries then run a bidirectional Dijkstra that only ever moves
+    to more important nodes, settling a tiny fraction of the graph, and expand
+    the shortcuts on the found path back into original edges.
+
+    Attributes:
+        nodes (list): Node IDs, indexed by internal node number
+        rank (list): Contraction order of each node
+        shortcut_count (int): Number of shortcuts added by preprocessing
+        preprocessing_seconds (float): Time spent building the hierarchy
+    """
+
+    def __init__(self, nodes: List[str], rank: List[int],
+                 upward: List[List[Tuple[int, float]]],
+                 downward: List[List[Tuple[int, float]]],
+                 middle: Dict[Tuple[int, int], int],
+                 preprocessing_seconds: float = 0.0):
+        self.nodes = nodes
+        self.rank = rank
+        self.index = {node: i for i, node in enumerate(nodes)}
+        # upward[u]: edges u -> w to more important nodes
+        # downward[v]: edges u -> v from more important nodes, stored as (u, cost)
+        self.upward = upward
+        self.downward = downward
+        # Contracted node each shortcut (u, w) bypasses
+        self.middle = middle
+        self.shortcut_count = len(middle)
+        self.preprocessing_seconds = preprocessing_seconds
+
+    @classmethod
+    def build(cls, adjacency_list: Mapping[str, Iterable[Tuple[str, float]]]) -> 'ContractionHierarchy':
+        """Contract every node of the graph and return the resulting hierarchy."""
+        started = time.perf_counter()
+        nodes = list(adjacency_list)
+        index = {node: i for i, node in enumerate(nodes)}
+        size = len(nodes)
+
+        # Remaining (uncontracted) graph; parallel edges collapse to the cheapest one
+        out: List[Dict[int, float]] = [{} for _ in range(size)]
+        inc: List[Dict[int, float]] = [{} for _ in range(size)]
+        for node, neighbors in adjacency_list.items():
+            u = index[node]
+            for neighbor, cost in neighbors:
+                w = index[neighbor]
+                if u != w and cost < out[u].get(w, float('infinity')):
+                    out[u][w] = cost
+                    inc[w][u] = cost
+
+        middle: Dict[Tuple[int, int], int] = {}
+        rank = [0] * size
+        upward: List[List[Tuple[int, float]]] = [[] for _ in range(size)]
+        downward: List[List[Tuple[int, float]]] = [[] for _ in range(size)]
+        contracted = [False] * size
+        contracted_neighbors = [0] * size
+
+        def shortcuts_for(v: int) -> List[Tuple[int, int, float]]:
+            needed = []
+            if not out[v]:
+                return needed
+            max_out = max(out[v].values())
+            for u, cost_in in inc[v].items():
+                targets = {w: cost_in + cost_out for w, cost_out in out[v].items() if w != u}
+                if not targets:
+                    continue
+                witness = _witness_costs(out, u, v, targets, cost_in + max_out)
+                for w, via_cost in targets.items():
+                    if witness.get(w, float('infinity')) > via_cost:
+                        needed.append((u, w, via_cost))
+            return needed
+
+        def priority(v: int, shortcuts: List[Tuple[int, int, float]]) -> int:
+            return len(shortcuts) - len(inc[v]) - len(out[v]) + contracted_neighbors[v]
+
+        queue = [(priority(v, shortcuts_for(v)), v) for v in range(size)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            if contracted[v]:
+                continue
+            # Lazy update: contract v only if it is still the least important node
+            shortcuts = shortcuts_for(v)
+            current = priority(v, shortcuts)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            for u, w, cost in shortcuts:
+                if cost < out[u].get(w, float('infinity')):
+                    out[u][w] = cost
+                    inc[w][u] = cost
+                    middle[(u, w)] = v
+
+            rank[v] = order
+            order += 1
+            contracted[v] = True
+            upward[v] = list(out[v].items())
+            downward[v] = list(inc[v].items())
+            for w in out[v]:
+                del inc[w][v]
+                contracted_neighbors[w] += 1
+            for u in inc[v]:
+                del out[u][v]
+                contracted_neighbors[u] += 1
+            out[v] = {}
+            inc[v] = {}
+
+        return cls(nodes, rank, upward, downward, middle, time.perf_counter() - started)
+
+    def query(self, start: str, end: str, deadline: Optional[Deadline] = None) -> Optional[List[str]]:
+        """
+        Cheapest path from start to end in original nodes, or None if end is unreachable.
+        Raises QueryTimeoutError once deadline passes.
+        """
+        s, t = self.index[start], self.index[end]
+        distances = ({s: 0}, {t: 0})
+        parents: Tuple[Dict[int, Optional[int]], Dict[int, Optional[int]]] = ({s: None}, {t: None})
+        queues = ([(0, s)], [(0, t)])
+        edges = (self.upward, self.downward)
+        best = float('infinity')
+        meeting = None
+
+        # Each direction only climbs the hierarchy, so it can stop once its
+        # smallest tentative cost reaches the best meeting cost found so far
+        while True:
+            active = [side for side in (0, 1) if queues[side] and queues[side][0][0] < best]
+            if not active:
+                break
+            if deadline is not None:
+                deadline.check()
+            side = min(active, key=lambda d: queues[d][0][0])
+            cost, u = heapq.heappop(queues[side])
+            if cost > distances[side][u]:
+                continue
+
+            other = distances[1 - side].get(u)
+            if other is not None and cost + other < best:
+                best = cost + other
+                meeting = u
+
+            for w, edge_cost in edges[side][u]:
+                candidate = cost + edge_cost
+                if candidate < distances[side].get(w, float('infinity')):
+                    distances[side][w] = candidate
+                    parents[side][w] = u
+                    heapq.heappush(queues[side], (candidate, w))
+
+        if meeting is None:
+            return None
+
+        hierarchy_path = []
+        current: Optional[int] = meeting
+        while current is not None:
+            hierarchy_path.append(current)
+            current = parents[0][current]
+        hierarchy_path.reverse()
+        current = parents[1][meeting]
+        while current is not None:
+            hierarchy_path.append(current)
+            current = parents[1][current]
+
+        return [self.nodes[i] for i in self._unpack(hierarchy_path)]
+
+    def _unpack(self, hierarchy_path: Sequence[int]) -> List[int]:
+        """Replace every shortcut on the path by the edges it stands for."""
+        path = [hierarchy_path[0]]
+        pending = [(u, w) for u, w in zip(hierarchy_path, hierarchy_path[1:])]
+        pending.reverse()
+        while pending:
+            u, w = pending.pop()
+            m = self.middle.get((u, w))
+            if m is None:
+                path.append(w)
+            else:
+                pending.append((m, w))
+                pending.append((u, m))
+        return path
+
+    def save(self, path: Path) -> None:
+        """Write the hierarchy to a JSON snapshot file."""
+        snapshot = {
+            "nodes": self.nodes,
+            "rank": self.rank,
+            "upward": self.upward,
+            "downward": self.downward,
+            "middle": [[u, w, m] for (u, w), m in self.middle.items()],
+            "preprocessing_seconds": self.preprocessing_seconds,
+        }
+        tmp_path = path.with_suffix('.tmp')
+        with tmp_path.open('w') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        tmp_path.replace(path)  # Readers never see a partially written snapshot
+
+    @classmethod
+    def load(cls, path: Path) -> 'ContractionHierarchy':
+        """Read a hierarchy written by save()."""
+        with path.open('r') as f:
+            snapshot = json.load(f)
+        return cls(
+            snapshot["nodes"],
+            snapshot["rank"],
+            [[(w, cost) for w, cost in edges] for edges in snapshot["upward"]],
+            [[(u, cost) for u, cost in edges] for edges in snapshot["downward"]],
+            {(u, w): m for u, w, m in snapshot["middle"]},
+            snapshot["preprocessing_seconds"],
+        )
+
+    @staticmethod
+    def snapshot_path(snapshot_dir: str, graph_id: str, graph_version: str) -> Path:
+        """Snapshot file of a graph version; a changed graph never matches an old snapshot."""
+        graph_key = hashlib.sha1(graph_id.encode('utf-8')).hexdigest()[:16]
+        return Path(snapshot_dir) / f"ch_{graph_key}_{graph_version}.json"
+
+    @classmethod
+    def load_snapshot(cls, snapshot_dir: str, graph_id: str,
+                      graph_version: str) -> Optional['ContractionHierarchy']:
+        """The hierarchy saved for this graph version, or None if none was built."""
+        path = cls.snapshot_path(snapshot_dir, graph_id, graph_version)
+        if not path.exists():
+            return None
+        return cls.load(path)
+
+    @classmethod
+    def build_snapshot(cls, adjacency_list: Mapping[str, Iterable[Tuple[str, float]]],
+                       graph_id: str, graph_version: str, snapshot_dir: str) -> 'ContractionHierarchy':
+        """Build the hierarchy of a graph version and save it to snapshot_dir."""
+        hierarchy = cls.build(adjacency_list)
+        path = cls.snapshot_path(snapshot_dir, graph_id, graph_version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        hierarchy.save(path)
+        return hierarchy
+
+
+def _witness_costs(out: List[Dict[int, float]], source: int, excluded: int,
+                   targets: Mapping[int, float], max_cost: float) -> Dict[int, float]:
+    """Bounded Dijkstra from source that avoids excluded, used to find witness paths."""
+    distances = {source: 0}
+    queue = [(0, source)]
+    remaining = len(targets)
+    settled = 0
+    while queue and remaining and settled < WITNESS_SETTLE_LIMIT:
+        cost, u = heapq.heappop(queue)
+        if cost > distances[u]:
+            continue
+        if cost > max_cost:
+            break
+        settled += 1
+        if u in targets:
+            remaining -= 1
+        for w, edge_cost in out[u].items():
+            if w == excluded:
+                continue
+            candidate = cost + edge_cost
+            if candidate < distances.get(w, float('infinity')):
+                distances[w] = candidate
+                heapq.heappush(queue, (candidate, w))
+    return distances
@@ -0,0 +1,270 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+from collections import defaultdict
+import math
+
+
+# Estimates are kept as floats clamped here instead of overflowing to infinity
+MAX_ESTIMATE = 1e300
+
+
+class QueryEstimator:
+    """
+    Estimates the work and output of a query from the structure of the loaded graph.
+
+    Nothing here runs the query itself. Estimates come from the nodes reachable
+    from the start node (and, for paths, able to reach the end node), the
+    strongly connected components of the graph and their internal out-degree.
+    On an acyclic region the simple-path counts are exact; inside a strongly
+    connected component of k nodes and mean internal out-degree d, the number of
+    simple paths through it is approximated as d ** (k - 1).
+    """
+
+    def __init__(self, path_finder):
+        self.path_finder = path_finder
+        self.adjacency_list = path_finder.adjacency_list
+        # Tarjan state, kept between calls so components are only computed once
+        self._index: Dict[str, int] = {}
+        self._component_of: Dict[str, int] = {}
+        self._components: List[List[str]] = []
+        self._component_factor: List[float] = []
+        self._all_components = False
+
+    def prepare(self) -> 'QueryEstimator':
+        """
+        Compute the components of the whole graph now. Afterwards estimates only
+        read the estimator's state, so threads sharing it need no locking.
+        """
+        self._strongly_connected_components()
+        return self
+
+    def _successors(self, node: str) -> List[str]:
+        return [neighbor for neighbor, _ in self.adjacency_list.get(node, ())]
+
+    def _reachable(self, start: str) -> Set[str]:
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            for neighbor in self._successors(frontier.pop()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
+        return seen
+
+    def _reaching(self, end: str, nodes: Set[str]) -> Set[str]:
+        """Nodes of nodes (closed under successors) from which end can be reached."""
+        reverse: Dict[str, List[str]] = defaultdict(list)
+        for node in nodes:
+            for neighbor in self._successors(node):
+                reverse[neighbor].append(node)
+        seen = {end}
+        frontier = [end]
+        while frontier:
+            for neighbor in reverse.get(frontier.pop(), ()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
+        return seen
+
+    def _strongly_connected_components(self, roots: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Component number of every node reachable from roots (all nodes by default),
+        computed with an iterative Tarjan search that continues across calls.
+
+        Components are numbered in reverse topological order of the
+        condensation: every edge between components goes to a lower number.
+        Restricting the roots keeps lazily loaded graphs from being loaded whole.
+        """
+        if self._all_components:
+            return self._component_of
+        if roots is None:
+            roots = self.adjacency_list
+            self._all_components = True
+
+        index = self._index
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        component_of = self._component_of
+        components = self._components
+
+        for root in roots:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._successors(root)))]
+            while work:
+                node, neighbors = work[-1]
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = low[neighbor] = len(index)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(self._successors(neighbor))))
+                        break
+                    if neighbor in on_stack:
+                        low[node] = min(low[node], index[neighbor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        members = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component_of[member] = len(components)
+                            members.append(member)
+                            if member == node:
+                                break
+                        components.append(members)
+                        self._component_factor.append(self._path_factor(members, component_of))
+
+        return component_of
+
+    def _path_factor(self, members: List[str], component_of: Dict[str, int]) -> float:
+        """Approximate number of simple paths through a component (1 for a single node)."""
+        if len(members) == 1:
+            return 1.0
+        component = component_of[members[0]]
+        internal_edges = sum(
+            1 for node in members for neighbor in self._successors(node)
+            if component_of[neighbor] == component and neighbor != node
+        )
+        mean_degree = internal_edges / len(members)
+        if mean_degree <= 1:
+            return 1.0
+        return 10 ** min(300.0, (len(members) - 1) * math.log10(mean_degree))
+
+    def _count_paths(self, start: str, allowed: Set[str]) -> Dict[int, float]:
+        """
+        Approximate number of simple paths from start into each component,
+        following only edges between nodes in allowed.
+        """
+        component_of = self._strongly_connected_components(allowed)
+        edges_between: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for node in allowed:
+            for neighbor in self._successors(node):
+                if neighbor in allowed and component_of[neighbor] != component_of[node]:
+                    edges_between[component_of[node]][component_of[neighbor]] += 1
+
+        first = component_of[start]
+        ways = {first: self._component_factor[first]}
+        # Higher component numbers come first topologically
+        for component in sorted({component_of[node] for node in allowed}, reverse=True):
+            if component not in ways:
+                continue
+            for target, multiplicity in edges_between[component].items():
+                incoming = ways[component] * multiplicity * self._component_factor[target]
+                ways[target] = min(MAX_ESTIMATE, ways.get(target, 0.0) + incoming)
+        return ways
+
+    def _is_acyclic(self, nodes: Set[str]) -> bool:
+        component_of = self._strongly_connected_components(nodes)
+        return all(len(self._components[component_of[node]]) == 1 for node in nodes)
+
+    def graph_statistics(self) -> Dict[str, Any]:
+        component_of = self._strongly_connected_components()
+        degrees = [len(neighbors) for neighbors in self.adjacency_list.values()]
+        return {
+            "nodes": len(component_of),
+            "edges": sum(degrees),
+            "mean_out_degree": round(sum(degrees) / len(degrees), 3) if degrees else 0,
+            "max_out_degree": max(degrees, default=0),
+            "largest_component": max((len(members) for members in self._components), default=0),
+        }
+
+    def estimate(self, query_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Estimate a query without running it.
+
+        Returns:
+            Dict with the engine the query would use, estimated_search_size (nodes
+            the search is expected to visit), estimated_output_size (paths or
+            cycles it is expected to return, or nodes for cheapest_from) and
+            whether the output size is exact.
+        """
+        finder = self.path_finder
+        start = params.get("start")
+
+        if query_type == "cycles":
+            through = params.get("through")
+            if through is not None:
+                if through in self.adjacency_list:
+                    candidates = [self._strongly_connected_components([through])[through]]
+                else:
+                    candidates = []
+            else:
+                self._strongly_connected_components()
+                candidates = range(len(self._components))
+            cyclic = [c for c in candidates if len(self._components[c]) > 1]
+            output = min(MAX_ESTIMATE, sum(self._component_factor[c] for c in cyclic))
+            if params.get("limit") is not None:
+                output = min(output, params["limit"])
+            search = min(MAX_ESTIMATE, sum(
+                self._component_factor[c] * len(self._components[c]) for c in cyclic
+            ))
+            return self._result("dfs", search, output, exact=not cyclic)
+
+        if start not in self.adjacency_list:
+            return self._result(self._engine(query_type), 0, 0, exact=True)
+
+        reachable = self._reachable(start)
+
+        if query_type == "estimate_paths":
+            # Every walk visits at most the reachable nodes, and at most k paths are returned
+            walks = params.get("samples", 1000)
+            return self._result("sampling", min(MAX_ESTIMATE, walks * len(reachable)),
+                                min(params.get("k", 5), walks), exact=False, reachable_nodes=len(reachable))
+
+        if query_type == "paths":
+            end = params.get("end")
+            if end not in reachable or end == start:
+                # Enumeration stops after the reachability check instead of exploring every path
+                return self._result(finder.all_paths_engine, len(reachable), 0, exact=True)
+            relevant = self._reaching(end, reachable)
+            component_of = self._strongly_connected_components(reachable)
+            search = min(MAX_ESTIMATE, sum(self._count_paths(start, reachable).values()))
+            output = self._count_paths(start, relevant).get(component_of[end], 0.0)
+            return self._result(
+                finder.all_paths_engine, search, output,
+                exact=self._is_acyclic(relevant), reachable_nodes=len(reachable),
+                relevant_nodes=len(relevant)
+            )
+
+        if query_type == "cheapest_from":
+            output = len(reachable)
+            if params.get("max_nodes") is not None:
+                output = min(output, params["max_nodes"])
+            return self._result(finder.dijkstra_engine, len(reachable), output,
+                                exact=True, reachable_nodes=len(reachable))
+
+        # cheapest: at most every reachable node is settled, at most one path is returned
+        end = params.get("end")
+        found = end in reachable and end != start
+        return self._result(finder.cheapest_path_engine, len(reachable), int(found),
+                            exact=True, reachable_nodes=len(reachable))
+
+    def _engine(self, query_type: str) -> str:
+        if query_type == "estimate_paths":
+            return "sampling"
+        if query_type == "paths":
+            return self.path_finder.all_paths_engine
+        if query_type == "cheapest_from":
+            return self.path_finder.dijkstra_engine
+        return self.path_finder.cheapest_path_engine
+
+    @staticmethod
+    def _result(engine: str, search: float, output: float, exact: bool, **extra: Any) -> Dict[str, Any]:
+        def as_count(value: float):
+            return int(round(value)) if value < 2 ** 53 else float(value)
+
+        return {
+            "engine": engine,
+            "estimated_search_size": as_count(search),
+            "estimated_output_size": as_count(output),
+            "exact": exact,
+            **extra,
+        }
@@ -0,0 +1,163 @@
+"""
+Read-only snapshot of a loaded graph that a pool of query threads can share.
+
+A PathFinder is not safe to share between threads: it keeps paused searches
+in an LRU it updates on every query, and computes its fingerprint and loads its
+contraction hierarchy on first use. FrozenGraph answers the same queries from
+state that never changes once it is built. The adjacency is a read-only mapping
+of tuples, everything PathFinder computes lazily is resolved when the graph is
+frozen, and paused searches are kept per thread. Queries only read shared
+state, so no locks are taken: threads of a free-threaded build can run queries
+in parallel, while on a GIL build they at least share one copy of the graph
+instead of loading one each.
+
+With NumPy installed the graph is also laid out as CSR arrays (the targets of
+every node's out-edges stored contiguously), and the reachability check that
+precedes every paths query runs on large graphs as a vectorized expansion of
+one whole BFS level at a time. The searches themselves (Dijkstra, path
+enumeration) are sequential by nature and stay in Python.
+"""
+from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+import threading
+
+from src.config import settings
+from src.graph.contraction import ContractionHierarchy
+from src.graph.lazy_adjacency import LazyAdjacency
+from src.graph.path_finder import PathFinder
+from src.graph.search_cache import SearchCache, SearchState
+
+try:
+    import numpy
+except ImportError:  # Optional vectorized kernels
+    numpy = None
+
+
+# Graphs with fewer edges check reachability in pure Python, which beats the
+# per-level overhead of the NumPy kernel on small searches
+NUMPY_MIN_EDGES = 5_000
+
+
+def _reaches_csr(offsets: 'numpy.ndarray', targets: 'numpy.ndarray', source: int, target: int) -> bool:
+    """Whether target is reachable from source, expanding one whole BFS level per step."""
+    seen = numpy.zeros(len(offsets) - 1, dtype=bool)
+    seen[source] = True
+    frontier = numpy.array([source])
+    while frontier.size:
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            return False
+        # Index of every out-edge of the frontier: each node's first edge, repeated
+        # once per edge, shifted by the edge's position within its node's run
+        first_edge = numpy.repeat(starts - (numpy.cumsum(counts) - counts), counts)
+        neighbors = targets[first_edge + numpy.arange(total)]
+        if (neighbors == target).any():
+            return True
+        frontier = numpy.unique(neighbors[~seen[neighbors]])
+        seen[frontier] = True
+    return False
+
+
+class FrozenGraph(PathFinder):
+    """
+    Immutable PathFinder, built with FrozenGraph.freeze, that threads can share.
+
+    It answers every query a PathFinder answers, with the same engines and
+    results. Setting any attribute raises AttributeError.
+    """
+
+    @classmethod
+    def freeze(cls, path_finder: PathFinder) -> 'FrozenGraph':
+        """
+        Snapshot a fully loaded PathFinder. The path finder itself is left as is.
+        Lazily loaded graphs cannot be frozen, since their searches fetch adjacency.
+        """
+        if isinstance(path_finder, FrozenGraph):
+            return path_finder
+        if isinstance(path_finder.adjacency_list, LazyAdjacency):
+            raise ValueError("Lazily loaded graphs cannot be frozen")
+
+        graph = cls.__new__(cls)
+        adjacency = {node: tuple(neighbors) for node, neighbors in path_finder.adjacency_list.items()}
+        reverse = {node: tuple(neighbors) for node, neighbors in path_finder.reverse_adjacency_list.items()}
+        # Loaded now, since queries cannot store it later; computes the fingerprint only if it is needed for that
+        hierarchy = path_finder.contraction_hierarchy()
+        order = path_finder._topological_order
+        position = path_finder._topological_position
+
+        state = {
+            "graph_id": path_finder.graph_id,
+            "version_id": path_finder.version_id,
+            "adjacency_list": MappingProxyType(adjacency),
+            "reverse_adjacency_list": MappingProxyType(reverse),
+            "integer_costs": path_finder.integer_costs,
+            "max_cost": path_finder.max_cost,
+            "_contraction_hierarchy": hierarchy,
+            "_hierarchy_checked": True,
+            "_graph_version": path_finder._graph_version,
+            "_topological_order": tuple(order) if order is not None else None,
+            "_topological_position": MappingProxyType(dict(position)) if position is not None else None,
+            "_search_cache": None,  # Replaced by the per-thread caches of _search_from
+            "_paths_pool": None,
+            "_local": threading.local(),
+            "_csr": cls._build_csr(adjacency),
+        }
+        for name, value in state.items():
+            object.__setattr__(graph, name, value)
+        return graph
+
+    @staticmethod
+    def _build_csr(adjacency: Dict[str, Tuple[Tuple[str, float], ...]]
+                   ) -> Optional[Tuple[Dict[str, int], 'numpy.ndarray', 'numpy.ndarray']]:
+        """(index of every node, offsets, targets), or None without NumPy or on small graphs."""
+        edge_count = sum(len(neighbors) for neighbors in adjacency.values())
+        if numpy is None or edge_count < NUMPY_MIN_EDGES:
+            return None
+        index = {node: i for i, node in enumerate(adjacency)}
+        offsets = numpy.zeros(len(index) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(neighbors) for neighbors in adjacency.values()], out=offsets[1:])
+        targets = numpy.fromiter(
+            (index[neighbor] for neighbors in adjacency.values() for neighbor, _ in neighbors),
+            dtype=numpy.int64, count=edge_count
+        )
+        for array in (offsets, targets):
+            array.flags.writeable = False
+        return index, offsets, targets
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    @property
+    def graph_version(self) -> str:
+        # Computed on each use unless freezing needed it already, since it cannot be stored
+        return self._graph_version or self._fingerprint()
+
+    def contraction_hierarchy(self) -> Optional[ContractionHierarchy]:
+        return self._contraction_hierarchy
+
+    def _can_enumerate_in_parallel(self) -> bool:
+        # Queries on a frozen graph run on threads, which must not share a worker pool
+        # started from one of them; paths queries enumerate on the calling thread
+        return False
+
+    def _search_from(self, start: str) -> SearchState:
+        """Paused search from start, kept in the calling thread's own cache."""
+        cache: Optional[SearchCache] = getattr(self._local, "search_cache", None)
+        if cache is None:
+            cache = self._local.search_cache = SearchCache(settings.SEARCH_CACHE_SIZE)
+        return cache.get_or_create(
+            (self.dijkstra_engine, start), lambda: SearchState(start, self._dijkstra)
+        )
+
+    def _reaches(self, start: str, end: str) -> bool:
+        if self._csr is None:
+            return super()._reaches(start, end)
+        index, offsets, targets = self._csr
+        if start == end or start not in index or end not in index:
+            return False
+        return _reaches_csr(offsets, targets, index[start], index[end])
@@ -0,0 +1,52 @@
+from typing import Any, Callable, Hashable, Optional, Tuple
+from collections import OrderedDict
+import threading
+
+
+class GraphCache:
+    """
+    Bounded LRU of loaded graphs, keyed by graph ID and version.
+
+    A lookup for a version other than the cached one reloads the graph. Entries
+    are also dropped when invalidate() is called for their graph, which the
+    query path does when another process reports the graph as changed.
+
+    The cache can be shared by threads. Loads run outside its lock, so threads
+    missing the same graph at once may each load it; the last one is kept.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._graphs: 'OrderedDict[Hashable, Tuple[Optional[int], Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, graph_id: Hashable, load: Callable[[], Any], version: Optional[int] = None) -> Any:
+        with self._lock:
+            cached_version, graph = self._graphs.get(graph_id, (None, None))
+            if graph is not None and cached_version == version:
+                self._graphs.move_to_end(graph_id)  # Most recently used last
+                return graph
+
+        graph = load()
+        with self._lock:
+            if self.max_size > 0:
+                self._graphs[graph_id] = (version, graph)
+                self._graphs.move_to_end(graph_id)
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+        return graph
+
+    def invalidate(self, graph_id: Hashable) -> bool:
+        """Drop a graph so that its next use reloads it. Returns whether it was cached."""
+        with self._lock:
+            return self._graphs.pop(graph_id, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+
+    def __contains__(self, graph_id: Hashable) -> bool:
+        return graph_id in self._graphs
+
+    def __len__(self) -> int:
+        return len(self._graphs)
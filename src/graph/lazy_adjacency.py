@@ -0,0 +1,152 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from collections.abc import Mapping
+from sqlalchemy import text
+from src.db.database import SessionLocal
+from src.db.versions import current_version
+
+
+class LazyAdjacency(Mapping):
+    """
+    Adjacency list of a stored graph that is fetched from the database on demand.
+
+    Looking up the neighbours of a node that has not been fetched yet loads it
+    together with up to batch_size - 1 nodes of the frontier (nodes already seen
+    as neighbours but not fetched), in a single query on from_node_id, which the
+    edges indexes on from_node_id serve within the graph's partition. Searches
+    expand the nodes they discover next, so one query usually covers the
+    following expansions too. Fetched neighbourhoods stay cached.
+
+    Membership tests only look up the node itself. Iterating over the mapping
+    or taking its length needs every node, so it loads the rest of the graph.
+
+    Every query reads the graph version that was current when the mapping was
+    created. Versions are immutable, so the fetched parts stay consistent with
+    each other even if the graph is saved again meanwhile.
+
+    Attributes:
+        version_id (int): Graph version the adjacency is fetched from
+        fetch_count (int): Number of adjacency queries run so far
+    """
+
+    def __init__(self, graph_id: str, batch_size: int = 256, version_id: Optional[int] = None):
+        self.graph_id = graph_id
+        self.batch_size = max(1, batch_size)
+        if version_id is None:
+            with SessionLocal() as session:
+                version_id = current_version(session, graph_id) or 0
+        self.version_id = version_id
+        self.fetch_count = 0
+        self._adjacency: Dict[str, List[Tuple[str, float]]] = {}
+        self._keys: Dict[str, int] = {}  # Internal node ID of every node known to exist
+        self._missing: Set[str] = set()
+        self._frontier: Dict[str, None] = {}  # Known but not fetched, in discovery order
+        self._complete = False
+
+    @property
+    def loaded_nodes(self) -> int:
+        """Number of nodes whose neighbours have been fetched."""
+        return len(self._adjacency)
+
+    def __contains__(self, node: object) -> bool:
+        if node in self._keys:
+            return True
+        if self._complete or node in self._missing or not isinstance(node, str):
+            return False
+        self._resolve([node])
+        return node in self._keys
+
+    def __getitem__(self, node: str) -> List[Tuple[str, float]]:
+        neighbors = self._adjacency.get(node)
+        if neighbors is not None:
+            return neighbors
+        if node not in self:
+            raise KeyError(node)
+        self._fetch(node)
+        return self._adjacency[node]
+
+    def __iter__(self) -> Iterator[str]:
+        self.load_all()
+        return iter(self._adjacency)
+
+    def __len__(self) -> int:
+        self.load_all()
+        return len(self._adjacency)
+
+    def _resolve(self, node_ids: Iterable[str]) -> None:
+        """Look up the internal IDs of nodes, remembering the ones that do not exist."""
+        node_ids = list(node_ids)
+        with SessionLocal() as session:
+            rows = session.execute(
+                text("""
+                    SELECT node_id, id FROM nodes
+                    WHERE graph_id = :graph_id AND version_id = :version_id AND node_id = ANY(:node_ids)
+                """),
+                {"graph_id": self.graph_id, "version_id": self.version_id, "node_ids": node_ids}
+            ).all()
+        for node_id, key in rows:
+            self._discover(node_id, key)
+        self._missing.update(node_id for node_id in node_ids if node_id not in self._keys)
+
+    def _discover(self, node_id: str, key: int) -> None:
+        if node_id not in self._keys:
+            self._keys[node_id] = key
+            self._frontier[node_id] = None
+
+    def _fetch(self, node: str) -> None:
+        """Fetch the neighbours of node and of the next frontier nodes in one query."""
+        batch = [node]
+        self._frontier.pop(node, None)
+        while self._frontier and len(batch) < self.batch_size:
+            frontier_node = next(iter(self._frontier))
+            del self._frontier[frontier_node]
+            batch.append(frontier_node)
+
+        node_of = {self._keys[node_id]: node_id for node_id in batch}
+        for node_id in batch:
+            self._adjacency[node_id] = []
+        with SessionLocal() as session:
+            rows = session.execute(
+                text("""
+                    SELECT e.from_node_id, t.node_id, t.id, e.cost
+                    FROM edges e
+                    JOIN nodes t ON t.graph_id = e.graph_id AND t.id = e.to_node_id
+                    WHERE e.graph_id = :graph_id AND e.from_node_id = ANY(:keys)
+                """),
+                {"graph_id": self.graph_id, "keys": list(node_of)}
+            ).all()
+        self.fetch_count += 1
+
+        for from_key, to_node, to_key, cost in rows:
+            self._adjacency[node_of[from_key]].append((to_node, cost))
+            if to_node not in self._adjacency:
+                self._discover(to_node, to_key)
+
+    def load_all(self) -> None:
+        """Fetch every node and edge of the graph not fetched yet."""
+        if self._complete:
+            return
+        with SessionLocal() as session:
+            for node_id, key in session.execute(
+                text("SELECT node_id, id FROM nodes WHERE graph_id = :graph_id AND version_id = :version_id"),
+                {"graph_id": self.graph_id, "version_id": self.version_id}
+            ):
+                self._discover(node_id, key)
+
+            pending = {self._keys[node_id]: node_id for node_id in self._frontier}
+            for node_id in self._frontier:
+                self._adjacency[node_id] = []
+            node_of = {key: node_id for node_id, key in self._keys.items()}
+            rows = session.execute(
+                text("""
+                    SELECT from_node_id, to_node_id, cost FROM edges
+                    WHERE graph_id = :graph_id AND version_id = :version_id
+                """),
+                {"graph_id": self.graph_id, "version_id": self.version_id}
+            )
+            for from_key, to_key, cost in rows:
+                if from_key in pending and to_key in node_of:
+                    self._adjacency[pending[from_key]].append((node_of[to_key], cost))
+        self.fetch_count += 1
+        self._frontier.clear()
+        self._missing.clear()
+        self._complete = True
@@ -0,0 +1,224 @@
+"""
+Parallel enumeration of the simple paths between two nodes.
+
+The depth-first search tree is split into independent subproblems, each a
+path prefix (whose nodes form its visited set) whose subtree is explored in a
+worker process. A subproblem is explored for at most task_budget node
+expansions; if its subtree is larger, the worker returns the unexplored rest
+of it as new subproblems, which go back into the queue for whichever worker is
+idle first. Large subtrees are thereby split on demand, balancing unbalanced
+search trees without coordination between workers.
+
+Every path carries the neighbour index chosen at each step. Sorting by these
+keys reproduces the order of the sequential search, which is how canonical
+ordering is implemented.
+
+Workers belong to a PathsPool, which copies the graph's adjacency into them
+once when it starts and is then reused by every query on that graph. They are
+started with the forkserver method (spawn where it is unavailable), never by
+forking the calling process, which may be running other threads or hold open
+database connections.
+"""
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+import multiprocessing
+import threading
+import time
+
+from src.utils.deadline import Deadline
+from src.utils.exceptions import QueryTimeoutError
+
+
+Adjacency = Mapping[str, List[Tuple[str, float]]]
+# Neighbour index taken at each step from start, the position in the sequential search order
+PathKey = Tuple[int, ...]
+# Path prefix and its key
+Subproblem = Tuple[List[str], PathKey]
+
+# Node expansions a subproblem may take before its remaining subtree is handed back
+TASK_BUDGET = 50_000
+
+# Adjacency of the graph being searched, set in every worker process by _init_worker
+_worker_adjacency: Adjacency = {}
+
+
+def _init_worker(adjacency: Adjacency) -> None:
+    global _worker_adjacency
+    _worker_adjacency = adjacency
+
+
+class PathsPool:
+    """
+    Worker processes holding the adjacency of one graph, started on first use.
+
+    The adjacency must not change while the pool is alive, since workers keep
+    the copy they were started with.
+    """
+
+    def __init__(self, adjacency: Adjacency, workers: int):
+        self.adjacency = adjacency
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context(method),
+                    initializer=_init_worker, initargs=(dict(self.adjacency),)
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """Stop the workers, cancelling queued subproblems. The pool restarts on next use."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def explore(adjacency: Adjacency, prefix: List[str], key: PathKey, end: str, budget: int,
+            deadline: Optional[Deadline] = None) -> Tuple[List[Tuple[PathKey, List[str]]], List[Subproblem]]:
+    """
+    Enumerate the paths to end that extend prefix, for at most budget node expansions.
+
+    Returns:
+        Tuple of (found, remaining): the (key, path) of every path found, and the
+        subproblems covering the part of the subtree left unexplored when the
+        budget ran out (empty if the subtree was exhausted)
+    """
+    path = list(prefix)
+    keys = list(key)
+    visited = set(path)
+    found: List[Tuple[PathKey, List[str]]] = []
+    stack = [enumerate(adjacency[path[-1]])]
+    expansions = 0
+
+    while stack:
+        for index, (next_node, _) in stack[-1]:
+            if next_node in visited:
+                continue
+            if next_node == end:
+                found.append((tuple(keys) + (index,), path + [next_node]))
+                continue
+            if expansions >= budget:
+                stack[-1] = iter([(index, (next_node, None))] + list(stack[-1]))
+                return found, _remaining(stack, path, keys, end, found)
+            if deadline is not None:
+                deadline.check()
+            expansions += 1
+            path.append(next_node)
+            keys.append(index)
+            visited.add(next_node)
+            stack.append(enumerate(adjacency[next_node]))
+            break
+        else:
+            stack.pop()
+            if stack:
+                visited.remove(path.pop())
+                keys.pop()
+
+    return found, []
+
+
+def _remaining(stack: List[Iterator[Tuple[int, Tuple[str, float]]]], path: List[str], keys: List[int],
+               end: str, found: List[Tuple[PathKey, List[str]]]) -> List[Subproblem]:
+    """Split the untried neighbours at every level of an interrupted search into subproblems."""
+    remaining: List[Subproblem] = []
+    base = len(path) - len(stack) + 1  # Length of the prefix the search started from
+    for level, neighbors in enumerate(stack):
+        prefix = path[:base + level]
+        prefix_key = tuple(keys[:base + level - 1])
+        on_prefix = set(prefix)
+        for index, (next_node, _) in neighbors:
+            if next_node in on_prefix:
+                continue
+            if next_node == end:
+                found.append((prefix_key + (index,), prefix + [next_node]))
+            else:
+                remaining.append((prefix + [next_node], prefix_key + (index,)))
+    return remaining
+
+
+def _explore_in_worker(prefix: List[str], key: PathKey, end: str, budget: int,
+                       seconds: Optional[float]) -> Tuple[List[Tuple[PathKey, List[str]]], List[Subproblem]]:
+    return explore(_worker_adjacency, prefix, key, end, budget, Deadline(seconds) if seconds else None)
+
+
+def iter_paths_parallel(adjacency: Adjacency, start: str, end: str, workers: int,
+                        deadline: Optional[Deadline] = None, canonical: bool = False,
+                        task_budget: Optional[int] = None,
+                        pool: Optional[PathsPool] = None) -> Iterator[List[str]]:
+    """
+    Yield every simple path from start to end, enumerating subtrees on a process pool.
+
+    The calling process first searches on its own for one task budget, so
+    searches that small never start a pool. Paths are yielded as workers find
+    them, or in the order of the sequential search with canonical=True, which
+    holds them back until the search is complete. Closing the iterator early
+    cancels the queued subproblems; those already running end within their
+    task budget.
+
+    Args:
+        adjacency: Adjacency list of the graph (copied once into every worker)
+        start: The node paths start from, different from end
+        end: The node paths end at
+        workers: Number of worker processes (of a pool started for this query only)
+        deadline: Raise QueryTimeoutError once it passes
+        canonical: Yield the paths in the order of the sequential search
+        task_budget: Node expansions per subproblem before it is split (TASK_BUDGET by default)
+        pool: Long-lived pool of the graph to run on, instead of one started
+            (and stopped) for this query
+    """
+    task_budget = task_budget or TASK_BUDGET
+    found, pending = explore(adjacency, [start], (), end, task_budget, deadline)
+    if canonical:
+        collected = list(found)
+    else:
+        yield from (path for _, path in found)
+    if not pending:
+        if canonical:
+            yield from (path for _, path in sorted(collected))
+        return
+
+    own_pool = pool is None
+    if own_pool:
+        pool = PathsPool(adjacency, workers)
+    executor = pool.executor()
+    futures: Dict[Future, None] = {}
+    try:
+        def submit(subproblems: Iterable[Subproblem]) -> None:
+            for prefix, key in subproblems:
+                seconds = None
+                if deadline is not None and deadline.expires_at is not None:
+                    seconds = max(deadline.expires_at - time.monotonic(), 1e-3)
+                futures[executor.submit(_explore_in_worker, prefix, key, end, task_budget, seconds)] = None
+
+        submit(pending)
+        while futures:
+            done, _ = wait(futures, timeout=1.0, return_when=FIRST_COMPLETED)
+            if deadline is not None:
+                deadline.check()
+            for future in done:
+                del futures[future]
+                try:
+                    found, pending = future.result()
+                except QueryTimeoutError:
+                    if deadline is not None:
+                        deadline.check()
+                    raise
+                submit(pending)
+                if canonical:
+                    collected.extend(found)
+                else:
+                    yield from (path for _, path in found)
+    finally:
+        for future in futures:
+            future.cancel()
+        if own_pool:
+            pool.close()
+
+    if canonical:
+        yield from (path for _, path in sorted(collected))
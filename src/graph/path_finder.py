@@ -1,74 +1,637 @@
-from typing import List, Optional, Dict, Any, Union
-from collections import defaultdict
-import heapq
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Mapping, Tuple, Union
+from itertools import islice
+import hashlib
 from sqlalchemy import select
+from src.config import settings
 from src.db.database import SessionLocal
 from src.db.models import Node, Edge
+from src.db.versions import current_version
+from src.graph.contraction import ContractionHierarchy
+from src.graph.lazy_adjacency import LazyAdjacency
+from src.graph.parallel_paths import PathsPool, iter_paths_parallel
+from src.graph.path_sampling import estimate_paths
+from src.graph.priority_queues import BucketQueue, HeapQueue
+from src.graph.search_cache import SearchCache, SearchState
+from src.utils.deadline import Deadline
 
 
 class PathFinder:
-    def __init__(self, graph_id: str):
+    def __init__(self, graph_id: str, lazy: Optional[bool] = None, version_id: Optional[int] = None):
+        """
+        Args:
+            graph_id: ID of the stored graph to search
+            lazy: Fetch adjacency on demand as searches reach new nodes instead of
+                loading the whole graph up front (defaults to LAZY_LOADING)
+            version_id: Graph version to load (see src/db/versions.py), the
+                current one by default
+        """
         self.graph_id = graph_id
-        self.adjacency_list: Dict[str, List[tuple[str, float]]] = {}
-        self._load_graph()
+        self.version_id = version_id
+        self.adjacency_list: Mapping[str, List[Tuple[str, float]]] = {}
+        self.reverse_adjacency_list: Optional[Mapping[str, List[Tuple[str, float]]]] = None
+        self.integer_costs = False
+        self.max_cost: float = 0
+        if settings.LAZY_LOADING if lazy is None else lazy:
+            self._reset_derived_state()
+            self.adjacency_list = LazyAdjacency(graph_id, settings.LAZY_BATCH_SIZE, version_id)
+            self.version_id = self.adjacency_list.version_id
+        else:
+            self._load_graph()
+
+    @classmethod
+    def from_edges(cls, graph_id: str, node_ids: Iterable[str],
+                   edges: Iterable[Tuple[str, str, float]]) -> 'PathFinder':
+        """Build a PathFinder from in-memory (from, to, cost) edges without touching the database."""
+        finder = cls.__new__(cls)
+        finder.graph_id = graph_id
+        finder.version_id = None
+        finder._build_adjacency(node_ids, edges)
+        return finder
 
     def _load_graph(self) -> None:
-        """Load graph structure from database into memory for efficient path finding"""
+        """
+        Load graph structure from database into memory for efficient path finding.
+
+        The version pointer, nodes and edges are read in one repeatable-read
+        transaction, so a save committing meanwhile cannot tear the graph.
+        """
         with SessionLocal() as session:
-            # Get all nodes and edges for this graph
+            session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            if self.version_id is None:
+                self.version_id = current_version(session, self.graph_id) or 0
+
+            # Get all nodes and edges of this version of the graph
             nodes = session.execute(
-                select(Node).where(Node.graph_id == self.graph_id)
+                select(Node).where(Node.graph_id == self.graph_id, Node.version_id == self.version_id)
             ).scalars().all()
 
             edges = session.execute(
-                select(Edge).where(Edge.graph_id == self.graph_id)
+                select(Edge).where(Edge.graph_id == self.graph_id, Edge.version_id == self.version_id)
             ).scalars().all()
 
-            # Initialize adjacency list with all nodes (even those without edges)
-            self.adjacency_list = defaultdict(list)
-            for node in nodes:
-                self.adjacency_list[node.node_id]
+            node_ids = {node.id: node.node_id for node in nodes}
+            self._build_adjacency(
+                node_ids.values(),
+                (
+                    (node_ids[edge.from_node_id], node_ids[edge.to_node_id], edge.cost)
+                    for edge in edges
+                    if edge.from_node_id in node_ids and edge.to_node_id in node_ids
+                )
+            )
 
-            for edge in edges:
-                # Get the from and to nodes
-                from_node = session.get(Node, edge.from_node_id)
-                to_node = session.get(Node, edge.to_node_id)
-                if from_node and to_node:
-                    self.adjacency_list[from_node.node_id].append(
-                        (to_node.node_id, edge.cost)
-                    )
+    def _build_adjacency(self, node_ids: Iterable[str],
+                         edges: Iterable[Tuple[str, str, float]]) -> None:
+        """
+        Build the adjacency list, its reverse (the incoming (from, cost) edges of
+        every node) and record cost statistics used for engine selection.
 
-    def find_all_paths(self, start: str, end: str) -> List[List[str]]:
+        When every cost is integral the costs are stored as ints so that the
+        bucket-queue engine can index buckets directly.
         """
-        Find all possible paths from start to end node, ignoring cycles.
+        self._reset_derived_state()
+
+        # Initialize adjacency list with all nodes (even those without edges). A plain
+        # dict, so that lookups of unknown nodes never grow it
+        adjacency: Dict[str, List[Tuple[str, float]]] = {node_id: [] for node_id in node_ids}
+        reverse: Dict[str, List[Tuple[str, float]]] = {node_id: [] for node_id in adjacency}
+        self.adjacency_list = adjacency
+        self.reverse_adjacency_list = reverse
+
+        edges = list(edges)
+        self.integer_costs = all(float(cost).is_integer() for _, _, cost in edges)
+        self.max_cost = max((cost for _, _, cost in edges), default=0)
+        if self.integer_costs:
+            self.max_cost = int(self.max_cost)
+
+        for from_node, to_node, cost in edges:
+            cost = int(cost) if self.integer_costs else cost
+            adjacency.setdefault(to_node, [])
+            adjacency.setdefault(from_node, []).append((to_node, cost))
+            reverse.setdefault(from_node, [])
+            reverse.setdefault(to_node, []).append((from_node, cost))
+
+        self._topological_order = self._topological_sort()
+        if self._topological_order is not None:
+            self._topological_position = {node: position for position, node in enumerate(self._topological_order)}
+
+    def _reset_derived_state(self) -> None:
+        # Built with the adjacency list; lazily loaded graphs have none
+        self.reverse_adjacency_list = None
+        # Workers of the parallel paths engine, holding a copy of the adjacency
+        self._paths_pool: Optional[PathsPool] = None
+        # Paused searches and the hierarchy are only valid for the adjacency they were built on
+        self._search_cache = SearchCache(settings.SEARCH_CACHE_SIZE)
+        self._contraction_hierarchy: Optional[ContractionHierarchy] = None
+        # Whether CH_SNAPSHOT_DIR was searched, so that a missing snapshot is only looked for once
+        self._hierarchy_checked = False
+        self._graph_version: Optional[str] = None
+        # Topological order and each node's position in it, None unless the graph is known to be acyclic
+        self._topological_order: Optional[List[str]] = None
+        self._topological_position: Optional[Dict[str, int]] = None
+
+    def _topological_sort(self) -> Optional[List[str]]:
+        """Nodes in topological order (Kahn's algorithm), or None if the graph has a cycle."""
+        indegree = dict.fromkeys(self.adjacency_list, 0)
+        for neighbors in self.adjacency_list.values():
+            for neighbor, _ in neighbors:
+                indegree[neighbor] = indegree.get(neighbor, 0) + 1
+
+        order = [node for node, degree in indegree.items() if degree == 0]
+        for node in order:  # Grows while it is traversed
+            for neighbor, _ in self.adjacency_list.get(node, ()):
+                indegree[neighbor] -= 1
+                if indegree[neighbor] == 0:
+                    order.append(neighbor)
+        return order if len(order) == len(indegree) else None
+
+    @property
+    def is_acyclic(self) -> bool:
         """
-        if start not in self.adjacency_list or end not in self.adjacency_list:
-            return []
+        Whether the graph is known to be acyclic, checked once when it is loaded.
+        Lazily loaded graphs are never known to be.
+        """
+        return self._topological_position is not None
+
+    @property
+    def graph_version(self) -> str:
+        """
+        Key of the loaded nodes and edges for persisted preprocessing: the ID of
+        the stored version the graph was loaded from, since saved versions never
+        change, otherwise (version 0, in-memory graphs) a fingerprint of them.
+        """
+        if self._graph_version is None:
+            self._graph_version = self._fingerprint()
+        return self._graph_version
+
+    def _fingerprint(self) -> str:
+        if self.version_id:
+            return f"v{self.version_id}"
+        digest = hashlib.sha256()
+        for node in sorted(self.adjacency_list):
+            digest.update(repr((node, sorted(self.adjacency_list[node]))).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    @property
+    def dijkstra_engine(self) -> str:
+        """Name of the Dijkstra variant used for searches from a single source."""
+        if self.integer_costs and self.max_cost <= settings.DIAL_MAX_COST:
+            return "dial"
+        return "dijkstra"
+
+    @property
+    def cheapest_path_engine(self) -> str:
+        """
+        Name of the engine find_cheapest_path uses for this graph: the contraction
+        hierarchy when it is enabled and one was built for this graph version,
+        otherwise a single pass in topological order when the graph is acyclic,
+        otherwise the bidirectional search when it is enabled and the graph is
+        fully loaded.
+        """
+        if settings.CONTRACTION_HIERARCHIES and self.contraction_hierarchy() is not None:
+            return "ch"
+        if settings.DAG_ENGINES and self.is_acyclic:
+            return "dag"
+        if settings.BIDIRECTIONAL_DIJKSTRA and self.reverse_adjacency_list is not None:
+            return "bidirectional"
+        return self.dijkstra_engine
+
+    def contraction_hierarchy(self) -> Optional[ContractionHierarchy]:
+        """
+        The contraction hierarchy of the loaded graph from CH_SNAPSHOT_DIR, or None
+        if none was built for this graph version (see build_contraction_hierarchy).
+
+        Preprocessing is far too slow to run inside a query, so queries never
+        build the hierarchy. Lazily loaded graphs do not use one either, since
+        checking their version would load them whole. The snapshot is looked for
+        once per loaded graph, found or not; build-ch announces the graph as
+        changed, so that cached graphs are reloaded and pick up a new hierarchy.
+        """
+        if (not self._hierarchy_checked and settings.CH_SNAPSHOT_DIR
+                and not isinstance(self.adjacency_list, LazyAdjacency)):
+            self._contraction_hierarchy = ContractionHierarchy.load_snapshot(
+                settings.CH_SNAPSHOT_DIR, self.graph_id, self.graph_version
+            )
+            self._hierarchy_checked = True
+        return self._contraction_hierarchy
+
+    def build_contraction_hierarchy(self) -> ContractionHierarchy:
+        """Build the contraction hierarchy of the loaded graph and save it to CH_SNAPSHOT_DIR."""
+        if not settings.CH_SNAPSHOT_DIR:
+            raise ValueError("CH_SNAPSHOT_DIR must be set to build a contraction hierarchy")
+        self._contraction_hierarchy = ContractionHierarchy.build_snapshot(
+            self.adjacency_list, self.graph_id, self.graph_version, settings.CH_SNAPSHOT_DIR
+        )
+        self._hierarchy_checked = True
+        return self._contraction_hierarchy
+
+    def _make_queue(self) -> Union[BucketQueue, HeapQueue]:
+        if self.dijkstra_engine == "dial":
+            return BucketQueue(self.max_cost)
+        return HeapQueue()
+
+    @property
+    def all_paths_engine(self) -> str:
+        """
+        Name of the engine find_all_paths uses for this graph: "parallel" with
+        PARALLEL_PATHS_WORKERS > 1, unless the graph is lazily loaded (workers
+        need all of it) or shared by threads, otherwise "dag" when the graph is
+        acyclic and "dfs".
+        """
+        if settings.PARALLEL_PATHS_WORKERS > 1 and self._can_enumerate_in_parallel():
+            return "parallel"
+        if settings.DAG_ENGINES and self.is_acyclic:
+            return "dag"
+        return "dfs"
+
+    def _can_enumerate_in_parallel(self) -> bool:
+        return not isinstance(self.adjacency_list, LazyAdjacency)
+
+    def _parallel_paths_pool(self) -> PathsPool:
+        """Worker pool of this graph, started by its first parallel query and reused by later ones."""
+        if self._paths_pool is None or self._paths_pool.workers != settings.PARALLEL_PATHS_WORKERS:
+            if self._paths_pool is not None:
+                self._paths_pool.close()
+            self._paths_pool = PathsPool(self.adjacency_list, settings.PARALLEL_PATHS_WORKERS)
+        return self._paths_pool
+
+    def _reaches(self, start: str, end: str) -> bool:
+        """
+        Whether end is a different node reachable from start. Checked before
+        enumerating paths, which would otherwise explore every simple path from
+        start only to find none ending at end.
+        """
+        if start == end or start not in self.adjacency_list or end not in self.adjacency_list:
+            return False
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            for neighbor in self._successors(frontier.pop()):
+                if neighbor == end:
+                    return True
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
+        return False
+
+    def iter_all_paths(self, start: str, end: str,
+                       deadline: Optional[Deadline] = None) -> Iterator[List[str]]:
+        """
+        Lazily yield all possible paths from start to end node, ignoring cycles.
+        The parallel engine yields the same paths, in a different order unless
+        PARALLEL_PATHS_CANONICAL_ORDER is set (see src/graph/parallel_paths.py).
+        Raises QueryTimeoutError once deadline passes.
+        """
+        if not self._reaches(start, end):
+            return iter(())
+
+        engine = self.all_paths_engine
+        if engine == "parallel":
+            return iter_paths_parallel(
+                self.adjacency_list, start, end, settings.PARALLEL_PATHS_WORKERS, deadline=deadline,
+                canonical=settings.PARALLEL_PATHS_CANONICAL_ORDER, pool=self._parallel_paths_pool()
+            )
+        if engine == "dag":
+            return self._iter_dag_paths(start, end, deadline)
+
+        def dfs(current: str, target: str, path: List[str], visited: set) -> Iterator[List[str]]:
+            if deadline is not None:
+                deadline.check()
 
-        def dfs(current: str, target: str, path: List[str], paths: List[List[str]], visited: set) -> None:
             if current == target and len(path) > 1:  # Only add path if we've traversed edges
-                paths.append(path[:])
+                yield path[:]
                 return
 
             visited.add(current)
 
             # Explore all neighbor nodes
-            for next_node, _ in self.adjacency_list[current]:
+            for next_node, _ in self.adjacency_list.get(current, ()):
                 if next_node not in visited:
                     path.append(next_node)
-                    dfs(next_node, target, path, paths, visited)
+                    yield from dfs(next_node, target, path, visited)
                     path.pop()
 
             visited.remove(current)
 
-        all_paths: List[List[str]] = []
-        visited: set = set()
-        dfs(start, end, [start], all_paths, visited)
-        return all_paths
+        return dfs(start, end, [start], set())
+
+    def _iter_dag_paths(self, start: str, end: str, deadline: Optional[Deadline]) -> Iterator[List[str]]:
+        """
+        The paths of iter_all_paths, in the same order, on an acyclic graph.
+
+        No path can revisit a node, so there is no visited set to maintain, and
+        neighbours after end in topological order are skipped since they cannot
+        reach it.
+        """
+        position = self._topological_position
+        end_position = position[end]
+        path = [start]
+        stack = [iter(self.adjacency_list[start])]
+        while stack:
+            for next_node, _ in stack[-1]:
+                if next_node == end:
+                    yield path + [end]
+                elif position[next_node] < end_position:
+                    if deadline is not None:
+                        deadline.check()
+                    path.append(next_node)
+                    stack.append(iter(self.adjacency_list[next_node]))
+                    break
+            else:
+                stack.pop()
+                path.pop()
+
+    def find_all_paths(self, start: str, end: str, limit: Optional[int] = None,
+                       deadline: Optional[Deadline] = None) -> List[List[str]]:
+        """
+        Find all possible paths from start to end node, ignoring cycles.
+        Stops after limit paths, and raises QueryTimeoutError once deadline passes.
+        """
+        return list(islice(self.iter_all_paths(start, end, deadline=deadline), limit))
+
+    def estimate_paths(self, start: str, end: str, samples: int = 1000, max_seconds: Optional[float] = None,
+                       k: int = 5, seed: Optional[int] = None,
+                       deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Estimate the number of simple paths from start to end by sampling random
+        self-avoiding walks, and return k of the sampled paths, without
+        enumerating them (see src/graph/path_sampling.py). On acyclic graphs the
+        count is exact.
+        """
+        order = self._topological_order if settings.DAG_ENGINES else None
+        return estimate_paths(self.adjacency_list, start, end, samples, max_seconds, k, seed, order, deadline,
+                              self.reverse_adjacency_list)
+
+    def find_path_edges(self, start: str, end: str, limit: Optional[int] = None,
+                        deadline: Optional[Deadline] = None) -> Tuple[List[Tuple[str, str]], int, bool]:
+        """
+        Union of all simple paths from start to end, without materializing them.
+
+        The same depth-first enumeration as find_all_paths runs, but instead of
+        copying each path it only counts the paths found below every edge and
+        keeps the edges below which at least one was found. The simple paths
+        from start to end of the subgraph formed by these edges are exactly
+        those of the whole graph, so a client can expand the answer again.
+
+        Args:
+            start: The node paths start from
+            end: The node paths end at
+            limit: Stop after this many paths have been counted
+            deadline: Raise QueryTimeoutError once it passes
+
+        Returns:
+            Tuple of (edges, path_count, truncated): the distinct (from, to) edges
+            lying on some path (deepest first, as the search backtracks), the number of
+            paths, and whether more than limit paths exist (the search stops at
+            the first path past the limit)
+        """
+        if not self._reaches(start, end):
+            return [], 0, False
+
+        edges: Dict[Tuple[str, str], None] = {}
+        visited = set()
+        total = 0
+        truncated = False
+
+        def dfs(current: str) -> int:
+            nonlocal total, truncated
+            if deadline is not None:
+                deadline.check()
+
+            if current == end:
+                if limit is not None and total >= limit:
+                    # A path past the limit: only now is the answer known to be truncated
+                    truncated = True
+                    return 0
+                total += 1
+                return 1
+
+            visited.add(current)
+            found = 0
+            for next_node, _ in self.adjacency_list.get(current, ()):
+                if truncated:
+                    break
+                if next_node not in visited:
+                    below = dfs(next_node)
+                    if below:
+                        edges[(current, next_node)] = None
+                        found += below
+
+            visited.remove(current)
+            return found
+
+        dfs(start)
+        return list(edges), total, truncated
+
+    def _successors(self, node: str) -> Iterable[str]:
+        """Distinct successors of a node (parallel edges collapsed), in edge order."""
+        return dict.fromkeys(neighbor for neighbor, _ in self.adjacency_list.get(node, ()))
+
+    def _cycles_from(self, root: str, max_length: Optional[int], exclude: Optional[str] = None,
+                     deadline: Optional[Deadline] = None) -> Iterator[List[str]]:
+        """
+        Yield every simple cycle through root as [root, ..., root].
+
+        Nodes that compare less than or equal to exclude are never entered, which
+        lets find_cycles report each cycle exactly once from its smallest node.
+        """
+        path = [root]
+        on_path = {root}
+        stack = [iter(self._successors(root))]
+        while stack:
+            for next_node in stack[-1]:
+                if next_node == root:
+                    if len(path) > 1:  # Self-loops are not reported as cycles
+                        yield path + [root]
+                elif (next_node not in on_path
+                      and (exclude is None or next_node > exclude)
+                      and (max_length is None or len(path) < max_length)):
+                    if deadline is not None:
+                        deadline.check()
+                    path.append(next_node)
+                    on_path.add(next_node)
+                    stack.append(iter(self._successors(next_node)))
+                    break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+
+    def find_cycles(self, through: Optional[str] = None, max_length: Optional[int] = None,
+                    deadline: Optional[Deadline] = None) -> Iterator[List[str]]:
+        """
+        Lazily enumerate the simple cycles of the loaded graph.
+
+        Cycles use the same format as CycleDetector: rotated to start with the
+        lexicographically smallest node ID and closed by repeating it.
 
-    def find_cheapest_path(self, start: str, end: str) -> Union[List[str], bool]:
+        Args:
+            through: Only yield cycles containing this node
+            max_length: Only yield cycles with at most this many edges
+            deadline: Raise QueryTimeoutError once it passes
+
+        Returns:
+            Iterator over cycles; callers can stop consuming it at any point
+        """
+        if through is not None:
+            if through not in self.adjacency_list:
+                return
+            for cycle in self._cycles_from(through, max_length, deadline=deadline):
+                nodes = cycle[:-1]
+                smallest = nodes.index(min(nodes))
+                rotated = nodes[smallest:] + nodes[:smallest]
+                yield rotated + [rotated[0]]
+            return
+
+        for root in sorted(self.adjacency_list):
+            yield from self._cycles_from(root, max_length, exclude=root, deadline=deadline)
+
+    def _dijkstra(self, start: str, predecessors: Dict[str, Optional[str]]) -> Iterator[Tuple[str, float]]:
+        """
+        Run Dijkstra's algorithm from start, yielding (node, cost) as each node is settled.
+
+        Nodes are yielded in non-decreasing cost order, so callers stop the search
+        simply by no longer consuming the iterator. Predecessor links of every
+        reached node are written to the given dict.
+        """
+        distances = {start: 0}
+        predecessors[start] = None
+
+        # Priority queue
+        pq = self._make_queue()
+        pq.push(0, start)
+
+        while pq:
+            current_distance, current = pq.pop()
+
+            if current_distance > distances[current]:
+                continue
+
+            yield current, current_distance
+
+            for neighbor, cost in self.adjacency_list.get(current, ()):
+                distance = current_distance + cost
+
+                if distance < distances.get(neighbor, float('infinity')):
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current
+                    pq.push(distance, neighbor)
+
+    def _dag_cheapest_path(self, start: str, end: str, deadline: Optional[Deadline]) -> Optional[List[str]]:
+        """
+        Cheapest path on an acyclic graph by relaxing edges in topological order,
+        in O(V + E) of the slice between start and end and without a priority queue.
+
+        Only nodes between start and end in topological order can lie on a path
+        from start to end, and of those only the ones reached from start are
+        expanded. Returns None if end is unreachable.
+        """
+        position = self._topological_position
+        start_position, end_position = position[start], position[end]
+        if start_position > end_position:
+            return None
+
+        distances = {start: 0}
+        predecessors: Dict[str, str] = {}
+        for node in islice(self._topological_order, start_position, end_position + 1):
+            distance = distances.get(node)
+            if distance is None:
+                continue
+            if node == end:
+                break
+            if deadline is not None:
+                deadline.check()
+            for neighbor, cost in self.adjacency_list[node]:
+                if position[neighbor] <= end_position and distance + cost < distances.get(neighbor, float('infinity')):
+                    distances[neighbor] = distance + cost
+                    predecessors[neighbor] = node
+
+        if end not in distances:
+            return None
+        path = [end]
+        while path[-1] != start:
+            path.append(predecessors[path[-1]])
+        return path[::-1]
+
+    def _bidirectional_cheapest_path(self, start: str, end: str,
+                                     deadline: Optional[Deadline]) -> Optional[List[str]]:
+        """
+        Cheapest path by Dijkstra searches forward from start and backward from end
+        over the reverse adjacency, or None if end is unreachable.
+
+        Each step advances the direction whose next node is cheaper. Every edge
+        relaxed into a node the other direction has reached gives a candidate
+        path, and the search stops once the two smallest queued costs add up to
+        at least the best candidate, which is then the cheapest path. When either
+        search runs out of nodes first there is no path; a target with few
+        incoming edges is thereby found unreachable after a handful of steps,
+        however large the forward search from start would be.
+        """
+        if not self.adjacency_list.get(start) or not self.reverse_adjacency_list.get(end):
+            return None
+
+        graphs = (self.adjacency_list, self.reverse_adjacency_list)
+        distances: Tuple[Dict[str, float], Dict[str, float]] = ({start: 0}, {end: 0})
+        parents: Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]] = ({start: None}, {end: None})
+        queues = (self._make_queue(), self._make_queue())
+        queues[0].push(0, start)
+        queues[1].push(0, end)
+        best = float('infinity')
+        meeting = None
+
+        while queues[0] and queues[1]:
+            forward_min, backward_min = queues[0].min_priority(), queues[1].min_priority()
+            if forward_min + backward_min >= best:
+                break
+            if deadline is not None:
+                deadline.check()
+            side = 0 if forward_min <= backward_min else 1
+            cost, u = queues[side].pop()
+            if cost > distances[side][u]:
+                continue
+
+            other = distances[1 - side]
+            for w, edge_cost in graphs[side].get(u, ()):
+                candidate = cost + edge_cost
+                if candidate < distances[side].get(w, float('infinity')):
+                    distances[side][w] = candidate
+                    parents[side][w] = u
+                    queues[side].push(candidate, w)
+                if w in other and candidate + other[w] < best:
+                    best = candidate + other[w]
+                    meeting = (u, w) if side == 0 else (w, u)
+
+        if meeting is None:
+            return None
+
+        # meeting is the edge (from, to) joining the forward and backward trees
+        path = []
+        current: Optional[str] = meeting[0]
+        while current is not None:
+            path.append(current)
+            current = parents[0][current]
+        path.reverse()
+        current = meeting[1]
+        while current is not None:
+            path.append(current)
+            current = parents[1][current]
+        return path
+
+    def _search_from(self, start: str) -> SearchState:
+        """Paused search from start, resumed from the cache when a previous query left one."""
+        return self._search_cache.get_or_create(
+            (self.dijkstra_engine, start), lambda: SearchState(start, self._dijkstra)
+        )
+
+    def find_cheapest_path(self, start: str, end: str,
+                           deadline: Optional[Deadline] = None) -> Union[List[str], bool]:
         """
         Find the cheapest path from start to end node using Dijkstra's algorithm.
+        Graphs whose costs are small integers use a bucket queue (Dial's algorithm),
+        all others, and lazily loaded graphs whose costs are not known up front, a binary heap.
+        The search from each recent start node is kept, so a later query from the
+        same start is answered directly if end is already settled, or by resuming it.
+        With CONTRACTION_HIERARCHIES enabled and a hierarchy built for the graph
+        the query runs on the hierarchy instead, and with BIDIRECTIONAL_DIJKSTRA
+        as a search from both ends (see cheapest_path_engine).
         Returns False if no path exists or path to self is requested.
         """
         if start not in self.adjacency_list or end not in self.adjacency_list:
@@ -78,34 +641,58 @@ class PathFinder:
         if start == end:
             return False
 
-        # Initialize distances and predecessors
-        distances = {node: float('infinity') for node in self.adjacency_list}
-        distances[start] = 0
-        predecessors = {node: None for node in self.adjacency_list}
+        engine = self.cheapest_path_engine
+        if engine == "ch":
+            return self.contraction_hierarchy().query(start, end, deadline) or False
+        if engine == "dag":
+            return self._dag_cheapest_path(start, end, deadline) or False
+        if engine == "bidirectional":
+            return self._bidirectional_cheapest_path(start, end, deadline) or False
 
-        # Priority queue
-        pq = [(0, start)]
+        state = self._search_from(start)
+        if not state.settle_until(end, deadline):
+            return False  # No path found
+        return state.path_to(end)
 
-        while pq:
-            current_distance, current = heapq.heappop(pq)
+    def find_cheapest_from(self, start: str, max_cost: Optional[float] = None,
+                           max_nodes: Optional[int] = None, deadline: Optional[Deadline] = None
+                           ) -> Tuple[Dict[str, float], Dict[str, str], bool]:
+        """
+        Find the cheapest cost from start to every node reachable from it, in a single search.
 
-            if current == end:
-                # Found a path, reconstruct it
-                path = []
-                while current is not None:
-                    path.append(current)
-                    current = predecessors[current]
-                return path[::-1]
+        Args:
+            start: The node to search from
+            max_cost: Stop once the next node would cost more than this
+            max_nodes: Stop once this many nodes (including start) are settled
+            deadline: Raise QueryTimeoutError once it passes
 
-            if current_distance > distances[current]:
-                continue
+        Returns:
+            Tuple of (costs, predecessors, truncated): the cost of every settled node,
+            the predecessor of every settled node other than start (following the links
+            back yields its cheapest path), and whether a cap stopped the search before
+            every reachable node was settled.
+        """
+        if start not in self.adjacency_list:
+            return {}, {}, False
 
-            for neighbor, cost in self.adjacency_list[current]:
-                distance = current_distance + cost
+        # Settle one node past the caps (if there is one) to know whether they truncated the result
+        state = self._search_from(start)
+        while not state.exhausted:
+            if max_nodes is not None and len(state.settled) > max_nodes:
+                break
+            if max_cost is not None and state.last_cost is not None and state.last_cost > max_cost:
+                break
+            if deadline is not None:
+                deadline.check()
+            state.settle_next()
 
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    predecessors[neighbor] = current
-                    heapq.heappush(pq, (distance, neighbor))
+        costs: Dict[str, float] = {}
+        for node, cost in state.settled.items():
+            if (max_cost is not None and cost > max_cost) or \
+                    (max_nodes is not None and len(costs) >= max_nodes):
+                break
+            costs[node] = cost
 
-        return False  # No path found
\ No newline at end of file
+        predecessors = {node: state.predecessors[node] for node in costs if node != start}
+        truncated = len(costs) < len(state.settled) or not state.exhausted
+        return costs, predecessors, truncated
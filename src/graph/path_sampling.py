@@ -0,0 +1,173 @@
+"""
+Approximate counting and sampling of the simple paths between two nodes.
+
+Exact enumeration is exponential on dense cyclic graphs. Sequential importance
+sampling instead takes random self-avoiding walks from start: each step picks
+uniformly among the neighbours that are not on the walk yet and can still reach
+end, and the walk is weighted by the product of the number of choices it had.
+A walk reaching end samples its path with probability 1 / weight, so the mean
+weight over all walks (0 for walks that get stuck) is an unbiased estimate of
+the number of paths (Knuth's estimator). Paths resampled in proportion to their
+weight are approximately uniform over all paths.
+
+Paths are counted like find_all_paths counts them: parallel edges give
+distinct paths.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+import math
+import random
+import time
+
+from src.graph.estimator import MAX_ESTIMATE
+from src.utils.deadline import Deadline
+
+
+# Two-sided 95% normal quantile, for the confidence interval of the mean weight
+Z_95 = 1.959964
+
+
+def _reaching(adjacency: Mapping[str, List[Tuple[str, float]]], end: str,
+              reverse_adjacency: Optional[Mapping[str, List[Tuple[str, float]]]] = None) -> Set[str]:
+    """Nodes from which end can be reached, end included. Builds the reverse adjacency unless given."""
+    if reverse_adjacency is None:
+        reverse_adjacency = {}
+        for node, neighbors in adjacency.items():
+            for neighbor, cost in neighbors:
+                reverse_adjacency.setdefault(neighbor, []).append((node, cost))
+    reaching = {end}
+    frontier = [end]
+    while frontier:
+        for predecessor, _ in reverse_adjacency.get(frontier.pop(), ()):
+            if predecessor not in reaching:
+                reaching.add(predecessor)
+                frontier.append(predecessor)
+    return reaching
+
+
+def _count_dag_paths(order: List[str], adjacency: Mapping[str, List[Tuple[str, float]]],
+                     start: str, end: str) -> int:
+    """Exact number of paths from start to end of an acyclic graph, given its topological order."""
+    counts = {start: 1}
+    for node in order[order.index(start):]:
+        if node == end:
+            break
+        count = counts.get(node)
+        if count:
+            for neighbor, _ in adjacency[node]:
+                counts[neighbor] = counts.get(neighbor, 0) + count
+    return counts.get(end, 0)
+
+
+def _ratio(numerator: int, denominator: int) -> float:
+    """numerator / denominator of (possibly huge) ints, clamped to MAX_ESTIMATE."""
+    try:
+        return min(MAX_ESTIMATE, numerator / denominator)
+    except OverflowError:
+        return MAX_ESTIMATE
+
+
+def sample_walk(adjacency: Mapping[str, List[Tuple[str, float]]], reaching: Set[str], start: str,
+                end: str, rng: random.Random) -> Tuple[Optional[List[str]], int]:
+    """
+    One self-avoiding walk from start: (path, weight) if it reached end, (None, 0) otherwise.
+    Weights are exact ints, which do not overflow on long walks.
+    """
+    path = [start]
+    visited = {start}
+    weight = 1
+    current = start
+    while current != end:
+        choices = [
+            neighbor for neighbor, _ in adjacency[current]
+            if neighbor in reaching and neighbor not in visited
+        ]
+        if not choices:
+            return None, 0
+        weight *= len(choices)
+        current = rng.choice(choices)
+        path.append(current)
+        visited.add(current)
+    return path, weight
+
+
+def estimate_paths(adjacency: Mapping[str, List[Tuple[str, float]]], start: str, end: str,
+                   samples: int = 1000, max_seconds: Optional[float] = None, k: int = 5,
+                   seed: Optional[int] = None, topological_order: Optional[List[str]] = None,
+                   deadline: Optional[Deadline] = None,
+                   reverse_adjacency: Optional[Mapping[str, List[Tuple[str, float]]]] = None) -> Dict[str, Any]:
+    """
+    Estimate the number of simple paths from start to end and sample a few of them.
+
+    Args:
+        adjacency: Adjacency list of the graph
+        start: The node paths start from
+        end: The node paths end at
+        samples: Number of walks to take
+        max_seconds: Stop taking walks after this long, even if fewer than samples were taken
+        k: Number of distinct paths to return
+        seed: Seed of the random walks, for reproducible answers
+        topological_order: Topological order of an acyclic graph; when given the
+            count is computed exactly
+        deadline: Raise QueryTimeoutError once it passes
+        reverse_adjacency: Incoming (from, cost) edges of every node, built
+            from adjacency when not given
+
+    Returns:
+        Dict with estimate, confidence_interval (95%, normal approximation of the
+        mean weight), exact, samples (walks taken), hits (walks that reached end)
+        and paths (up to k distinct sampled paths)
+    """
+    result: Dict[str, Any] = {
+        "estimate": 0, "confidence_interval": [0, 0], "exact": True, "samples": 0, "hits": 0, "paths": []
+    }
+    if start == end or start not in adjacency or end not in adjacency:
+        return result
+
+    reaching = _reaching(adjacency, end, reverse_adjacency)
+    if start not in reaching:
+        return result
+
+    rng = random.Random(seed)
+    stop_at = time.monotonic() + max_seconds if max_seconds else None
+    total = total_squares = 0
+    hits: List[Tuple[List[str], int]] = []
+    taken = 0
+    while taken < samples and (taken == 0 or stop_at is None or time.monotonic() < stop_at):
+        if deadline is not None:
+            deadline.check()
+        path, weight = sample_walk(adjacency, reaching, start, end, rng)
+        taken += 1
+        total += weight
+        total_squares += weight * weight
+        if path is not None:
+            hits.append((path, weight))
+
+    result["samples"] = taken
+    result["hits"] = len(hits)
+    if topological_order is not None:
+        count = _count_dag_paths(topological_order, adjacency, start, end)
+        result["estimate"] = count
+        result["confidence_interval"] = [count, count]
+    else:
+        mean = _ratio(total, taken)
+        # Standard error of the mean weight: sqrt((n * sum(w^2) - sum(w)^2) / n^3)
+        variance = _ratio(total_squares * taken - total * total, taken ** 3)
+        # A clamped variance says nothing about the real one, whose root is far above sqrt(MAX_ESTIMATE)
+        margin = MAX_ESTIMATE if variance >= MAX_ESTIMATE else Z_95 * math.sqrt(variance)
+        result["estimate"] = mean
+        # A hit proves at least one path exists, though the interval must still contain an estimate below 1
+        lower = min(1.0, mean) if hits else 0.0
+        result["confidence_interval"] = [max(mean - margin, lower), min(mean + margin, MAX_ESTIMATE)]
+        result["exact"] = False
+
+    # Resampling walks in proportion to their weight undoes the bias of the walks towards short paths
+    distinct: Dict[Tuple[str, ...], None] = {}
+    if hits:
+        paths, weights = zip(*hits)
+        heaviest = max(weights)
+        for path in rng.choices(paths, weights=[weight / heaviest for weight in weights], k=k * 10):
+            if len(distinct) >= k:
+                break
+            distinct[tuple(path)] = None
+    result["paths"] = [list(path) for path in distinct]
+    return result
@@ -0,0 +1,68 @@
+from typing import Any, List, Tuple
+import heapq
+
+
+class HeapQueue:
+    """Binary heap priority queue, used for real-valued edge costs."""
+
+    __slots__ = ('_heap',)
+
+    def __init__(self):
+        self._heap: List[Tuple[float, Any]] = []
+
+    def push(self, priority: float, item: Any) -> None:
+        heapq.heappush(self._heap, (priority, item))
+
+    def pop(self) -> Tuple[float, Any]:
+        return heapq.heappop(self._heap)
+
+    def min_priority(self) -> float:
+        """Priority the next pop returns, without popping it."""
+        return self._heap[0][0]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class BucketQueue:
+    """
+    Dial's bucket queue for Dijkstra over small non-negative integer costs.
+
+    Relies on Dijkstra's monotone access pattern: every pushed priority lies in
+    [current, current + max_cost], so a circular array of max_cost + 1 buckets
+    never aliases two live priorities. Push is a list append and pop advances a
+    cursor over empty buckets, avoiding the O(log n) heap operations.
+    """
+
+    __slots__ = ('_buckets', '_width', '_cursor', '_size')
+
+    def __init__(self, max_cost: int):
+        self._width = max_cost + 1
+        self._buckets: List[List[Any]] = [[] for _ in range(self._width)]
+        self._cursor = 0
+        self._size = 0
+
+    def push(self, priority: int, item: Any) -> None:
+        self._buckets[priority % self._width].append(item)
+        self._size += 1
+
+    def pop(self) -> Tuple[int, Any]:
+        cursor = self.min_priority()
+        self._size -= 1
+        return cursor, self._buckets[cursor % self._width].pop()
+
+    def min_priority(self) -> int:
+        """Priority the next pop returns, without popping it."""
+        if not self._size:
+            raise IndexError("pop from empty bucket queue")
+
+        buckets = self._buckets
+        width = self._width
+        cursor = self._cursor
+        while not buckets[cursor % width]:
+            cursor += 1
+        self._cursor = cursor
+        return cursor
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,87 @@
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from src.utils.deadline import Deadline
+
+
+class SearchState:
+    """
+    A paused single-source Dijkstra search.
+
+    Wraps the search generator (which owns the priority queue and tentative
+    distances) together with everything it has settled so far, so that later
+    queries from the same source can be answered from the settled nodes or by
+    resuming the search where the previous query stopped. A search whose
+    generator raised (e.g. a failed adjacency fetch) cannot be resumed; it is
+    marked failed and SearchCache replaces it with a fresh one.
+    """
+
+    __slots__ = ('settled', 'predecessors', 'exhausted', 'failed', 'last_cost', '_search')
+
+    def __init__(self, start: str,
+                 search: Callable[[str, Dict[str, Optional[str]]], Iterator[Tuple[str, float]]]):
+        self.settled: Dict[str, float] = {}  # In settlement (non-decreasing cost) order
+        self.predecessors: Dict[str, Optional[str]] = {}
+        self.exhausted = False
+        self.failed = False
+        self.last_cost: Optional[float] = None
+        self._search = search(start, self.predecessors)
+
+    def settle_next(self) -> bool:
+        """Settle one more node. Returns False once every reachable node is settled."""
+        if self.exhausted:
+            return False
+        try:
+            item = next(self._search, None)
+        except BaseException:
+            # A generator that raised is finished and would look exhausted from now on
+            self.failed = True
+            raise
+        if item is None:
+            self.exhausted = True
+            return False
+        node, cost = item
+        self.settled[node] = cost
+        self.last_cost = cost
+        return True
+
+    def settle_until(self, target: str, deadline: Optional[Deadline] = None) -> bool:
+        """Resume the search until target is settled. Returns False if it is unreachable."""
+        while target not in self.settled:
+            if deadline is not None:
+                deadline.check()  # Between steps, so a timed-out search can still be resumed
+            if not self.settle_next():
+                return False
+        return True
+
+    def path_to(self, target: str) -> List[str]:
+        """Cheapest path to a settled target, rebuilt from the predecessor links."""
+        path = []
+        current: Optional[str] = target
+        while current is not None:
+            path.append(current)
+            current = self.predecessors[current]
+        return path[::-1]
+
+
+class SearchCache:
+    """Bounded LRU of paused searches, keyed by source (and engine)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._states: 'OrderedDict[Hashable, SearchState]' = OrderedDict()
+
+    def get_or_create(self, key: Hashable, create: Callable[[], SearchState]) -> SearchState:
+        state = self._states.pop(key, None)
+        if state is None or state.failed:
+            state = create()
+        self._states[key] = state  # Most recently used last
+
+        while len(self._states) > self.max_size:
+            self._states.popitem(last=False)
+        return state
+
+    def clear(self) -> None:
+        self._states.clear()
+
+    def __len__(self) -> int:
+        return len(self._states)
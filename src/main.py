@@ -1,12 +1,28 @@
 import sys
 import json
-from typing import Dict, List, Any
+import threading
+from io import StringIO
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Tuple
 from sqlalchemy import select, inspect
 
+from src.config import settings
+from src.graph.estimator import QueryEstimator
+from src.graph.frozen_graph import FrozenGraph
+from src.graph.lazy_adjacency import LazyAdjacency
 from src.graph.path_finder import PathFinder
 from src.xml_processor.parser import GraphXMLParser
-from src.db.models import Graph, Node, Edge
+from src.tabular_processor.parser import GraphTabularParser
+from src.db.models import Graph
 from src.db.database import SessionLocal, engine
+from src.db.notifications import GraphChangeListener, notify_graph_changed
+from src.db.graph_writer import write_graph
+from src.db.partitions import delete_graph
+from src.db.versions import collect_garbage, current_version
+from src.graph.graph_cache import GraphCache
+from src.utils.deadline import Deadline
+from src.utils.exceptions import QueryTimeoutError, TabularValidationError
+from src.utils.json_writer import OMIT, StreamingJSONWriter
 
 
 from src.db.database import ensure_db_initialized
@@ -22,65 +38,325 @@ def check_graph_exists(graph_id: str) -> bool:
         return graph is not None
 
 
-def process_single_query(query: Dict, path_finder: PathFinder) -> Dict[str, Any]:
-    if "paths" in query:
-        paths_query = query["paths"]
-        start = paths_query["start"]
-        end = paths_query["end"]
-
-        paths = path_finder.find_all_paths(start, end)
+QUERY_TYPES = ("paths", "cheapest", "cheapest_from", "cycles", "estimate_paths")
+
+# Query types whose search can grow exponentially and is therefore subject to admission control
+BUDGETED_QUERY_TYPES = ("paths", "cycles")
+
+
+def query_echo(query_type: str, params: Dict) -> Dict[str, Any]:
+    """Fields identifying the query, repeated at the start of its answer."""
+    if query_type == "cycles":
+        return {"through": params.get("through")}
+    if query_type == "cheapest_from":
+        return {"from": params.get("start")}
+    return {"from": params.get("start"), "to": params.get("end")}
+
+
+def validate_query(query_type: str, params: Any) -> None:
+    """
+    Check a query's parameters before it runs, raising ValueError on the first problem.
+
+    Streamed output has already started when a query runs, so every error a
+    query can be answered with must be found here and reported in its answer.
+    """
+    if not isinstance(params, dict):
+        raise ValueError(f"{query_type} query parameters must be an object")
+
+    required = {
+        "paths": ("start", "end"), "cheapest": ("start", "end"), "cheapest_from": ("start",),
+        "estimate_paths": ("start", "end"),
+    }
+    for name in required.get(query_type, ()):
+        if not isinstance(params.get(name), str):
+            raise ValueError(f"{query_type}.{name} must be a node ID string")
+
+    if query_type == "paths":
+        if params.get("format", "list") not in ("list", "edges"):
+            raise ValueError('paths.format must be "list" or "edges"')
+
+    elif query_type == "cheapest_from":
+        max_cost = params.get("max_cost")
+        max_nodes = params.get("max_nodes")
+        if max_cost is not None and (not isinstance(max_cost, (int, float)) or max_cost < 0):
+            raise ValueError("cheapest_from.max_cost must be a non-negative number")
+        if max_nodes is not None and (not isinstance(max_nodes, int) or max_nodes < 1):
+            raise ValueError("cheapest_from.max_nodes must be a positive integer")
+
+    elif query_type == "estimate_paths":
+        samples = params.get("samples")
+        k = params.get("k")
+        if samples is not None and (not isinstance(samples, int) or samples < 1):
+            raise ValueError("estimate_paths.samples must be a positive integer")
+        if k is not None and (not isinstance(k, int) or k < 0):
+            raise ValueError("estimate_paths.k must be a non-negative integer")
+        max_seconds = params.get("max_seconds")
+        if max_seconds is not None and (not isinstance(max_seconds, (int, float)) or max_seconds <= 0):
+            raise ValueError("estimate_paths.max_seconds must be a positive number")
+        if params.get("seed") is not None and not isinstance(params["seed"], int):
+            raise ValueError("estimate_paths.seed must be an integer")
+
+    elif query_type == "cycles":
+        for name in ("max_length", "limit"):
+            value = params.get(name)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ValueError(f"cycles.{name} must be a positive integer")
+
+
+def stream_until_timeout(items: Iterator[Any]) -> Tuple[Iterator[Any], Callable[[], Any]]:
+    """
+    Wrap items so that a QueryTimeoutError ends them early instead of propagating.
+
+    Streamed items have already been written by the time the deadline passes, so
+    the timeout is reported through the returned deferred "error" value, which
+    is only evaluated once the items have been consumed.
+    """
+    errors: List[str] = []
+
+    def guarded() -> Iterator[Any]:
+        try:
+            yield from items
+        except QueryTimeoutError as e:
+            errors.append(str(e))
+
+    return guarded(), lambda: errors[0] if errors else OMIT
+
+
+def answer_query(query_type: str, params: Dict, path_finder: PathFinder, deadline: Deadline,
+                 limit: Optional[int] = None, stream: bool = False) -> Dict[str, Any]:
+    """
+    Run a validated query and return its answer fields. limit truncates paths and cycles answers.
+
+    With stream=True the paths and cycles of an answer without a limit are left
+    as generators, to be consumed while the answer is written out.
+    """
+    if query_type == "paths":
+        if params.get("format", "list") == "edges":
+            edges, path_count, truncated = path_finder.find_path_edges(
+                params["start"], params["end"], limit=limit, deadline=deadline
+            )
+            answer = {"format": "edges", "edges": [list(edge) for edge in edges]}
+            if params.get("count"):
+                answer["path_count"] = path_count
+            if limit is not None:
+                answer["truncated"] = truncated
+            return answer
+
+        if stream and limit is None:
+            paths, error = stream_until_timeout(
+                path_finder.iter_all_paths(params["start"], params["end"], deadline=deadline)
+            )
+            return {"paths": paths, "error": error}
+
+        # One path past the limit tells whether the limit truncated the answer
+        paths = path_finder.find_all_paths(
+            params["start"], params["end"], limit=None if limit is None else limit + 1,
+            deadline=deadline
+        )
+        answer = {"paths": paths[:limit]}
+        if limit is not None:
+            answer["truncated"] = len(paths) > limit
+        return answer
+
+    elif query_type == "cheapest":
+        path = path_finder.find_cheapest_path(params["start"], params["end"], deadline=deadline)
+        return {"path": path if path is not None else False}
+
+    elif query_type == "cheapest_from":
+        costs, predecessors, truncated = path_finder.find_cheapest_from(
+            params["start"], max_cost=params.get("max_cost"), max_nodes=params.get("max_nodes"),
+            deadline=deadline
+        )
         return {
-            "paths": {
-                "from": start,
-                "to": end,
-                "paths": paths
-            }
+            "costs": costs,
+            "predecessors": predecessors,
+            "truncated": truncated
         }
 
-    elif "cheapest" in query:
-        cheapest_query = query["cheapest"]
-        start = cheapest_query["start"]
-        end = cheapest_query["end"]
-
-        path = path_finder.find_cheapest_path(start, end)
-        return {
-            "cheapest": {
-                "from": start,
-                "to": end,
-                "path": path if path is not None else False
-            }
-        }
+    elif query_type == "estimate_paths":
+        return path_finder.estimate_paths(
+            params["start"], params["end"], samples=params.get("samples", 1000),
+            max_seconds=params.get("max_seconds"), k=params.get("k", 5), seed=params.get("seed"),
+            deadline=deadline
+        )
+
+    elif query_type == "cycles":
+        max_length = params.get("max_length")
+        cycles_limit = params.get("limit")
+        if limit is not None:
+            cycles_limit = min(limit, cycles_limit or limit)
+
+        cycles = path_finder.find_cycles(
+            through=params.get("through"), max_length=max_length, deadline=deadline
+        )
+        if stream and limit is None:
+            streamed, error = stream_until_timeout(islice(cycles, cycles_limit))
+            return {"cycles": streamed, "error": error}
+
+        found = list(islice(cycles, None if cycles_limit is None else cycles_limit + 1))
+        answer = {"cycles": found[:cycles_limit]}
+        if limit is not None:
+            answer["truncated"] = len(found) > cycles_limit
+        return answer
 
     return {}
 
 
-def process_queries(input_data: Dict) -> Dict[str, List[Dict[str, Any]]]:
+def process_single_query(query: Dict, path_finder: PathFinder,
+                         estimator: Optional[QueryEstimator] = None,
+                         stream: bool = False) -> Dict[str, Any]:
+    """
+    Answer one query object, e.g. {"paths": {"start": "a", "end": "e"}}.
+
+    With "explain": true in the query only the estimate is returned. Queries of
+    a budgeted type whose estimated search size exceeds QUERY_MAX_SEARCH_SIZE
+    are rejected or truncated (QUERY_OVER_BUDGET), and every query is cancelled
+    once it runs longer than QUERY_TIMEOUT_SECONDS. A query with invalid
+    parameters is answered with an "error" instead of failing the whole batch.
+    See answer_query for stream.
+    """
+    query_type = next((name for name in QUERY_TYPES if name in query), None)
+    if query_type is None:
+        return {}
+    params = query[query_type] or {}
+    try:
+        validate_query(query_type, params)
+    except ValueError as e:
+        echo = query_echo(query_type, params) if isinstance(params, dict) else {}
+        return {query_type: {**echo, "error": str(e)}}
+    echo = query_echo(query_type, params)
+    estimator = estimator or QueryEstimator(path_finder)
+
+    if params.get("explain"):
+        explain = estimator.estimate(query_type, params)
+        explain["graph"] = estimator.graph_statistics()
+        return {query_type: {**echo, "explain": explain}}
+
+    limit = None
+    if query_type in BUDGETED_QUERY_TYPES and settings.QUERY_MAX_SEARCH_SIZE:
+        estimate = estimator.estimate(query_type, params)
+        if estimate["estimated_search_size"] > settings.QUERY_MAX_SEARCH_SIZE:
+            if settings.QUERY_OVER_BUDGET != "truncate":
+                return {query_type: {**echo, "error": (
+                    f"Query rejected: estimated search size {estimate['estimated_search_size']} "
+                    f"exceeds the budget of {settings.QUERY_MAX_SEARCH_SIZE}"
+                )}}
+            limit = settings.QUERY_TRUNCATE_LIMIT
+
+    try:
+        answer = answer_query(
+            query_type, params, path_finder, Deadline(settings.QUERY_TIMEOUT_SECONDS), limit, stream
+        )
+    except QueryTimeoutError as e:
+        return {query_type: {**echo, "error": str(e)}}
+    return {query_type: {**echo, **answer}}
+
+
+# Graphs loaded by this process, kept across requests until a new version is current or they are reported as changed
+graph_cache = GraphCache(settings.GRAPH_CACHE_SIZE)
+graph_change_listener: Optional[GraphChangeListener] = None
+# Guards creating the listener, which threads answering requests may race to do
+_listener_lock = threading.Lock()
+
+
+def load_graph(graph_id: str, cached: bool = False,
+               version_id: Optional[int] = None) -> Tuple[PathFinder, QueryEstimator]:
+    """
+    Path finder and estimator of a version of a graph (the current one by
+    default). With cached=True, used by the long-lived serve mode, they come
+    from graph_cache when it holds that version.
+
+    The change listener is started before the first graph is loaded, so a change
+    committed after any load is seen by the poll preceding the next lookup.
+    One-shot processes never start it, since they would not reuse the cache.
+    Fully loaded graphs are cached frozen (see src/graph/frozen_graph.py), so
+    threads answering requests concurrently can share them.
+    """
+    def load() -> Tuple[PathFinder, QueryEstimator]:
+        path_finder = PathFinder(graph_id, version_id=version_id)
+        return path_finder, QueryEstimator(path_finder)
+
+    def load_frozen() -> Tuple[PathFinder, QueryEstimator]:
+        path_finder = PathFinder(graph_id, version_id=version_id)
+        if isinstance(path_finder.adjacency_list, LazyAdjacency):
+            return path_finder, QueryEstimator(path_finder)
+        frozen = FrozenGraph.freeze(path_finder)
+        return frozen, QueryEstimator(frozen).prepare()
+
+    if not cached or settings.GRAPH_CACHE_SIZE <= 0:
+        return load()
+
+    # Saves publish new versions, which miss the cache by themselves; notifications
+    # also cover writers that change a version's rows in place
+    global graph_change_listener
+    if settings.GRAPH_CHANGE_NOTIFICATIONS:
+        with _listener_lock:
+            if graph_change_listener is None:
+                graph_change_listener = GraphChangeListener(graph_cache.invalidate, graph_cache.clear)
+        graph_change_listener.poll()  # Serialized by the listener itself
+    return graph_cache.get_or_load(graph_id, load_frozen, version_id)
+
+
+def run_queries(input_data: Dict, stream: bool = False, cached: bool = False) -> Dict[str, Any]:
+    """
+    Load the graph named in the input and answer its queries.
+
+    With stream=True the answers are a generator and each answer is only
+    computed, with its paths streamed, when the output stage consumes it.
+    See load_graph for cached.
+    """
+    if not isinstance(input_data, dict):
+        raise ValueError("Input JSON must be an object")
     graph_id = input_data.get("graph_id")
     if not graph_id:
         raise ValueError("graph_id is required in the input JSON")
 
     ensure_db_tables_exist()
 
-    if not check_graph_exists(graph_id):
+    with SessionLocal() as session:
+        version_id = current_version(session, graph_id)
+    if version_id is None:
         return {
             "error": f"Graph with ID '{graph_id}' does not exist in the database"
         }
 
-    path_finder = PathFinder(graph_id)
+    path_finder, estimator = load_graph(graph_id, cached, version_id)
+
+    def answers() -> Iterator[Dict[str, Any]]:
+        for query in input_data.get("queries", []):
+            result = process_single_query(query, path_finder, estimator, stream=stream)
+            if result:
+                yield result
 
-    answers = []
-    for query in input_data.get("queries", []):
-        result = process_single_query(query, path_finder)
-        if result:
-            answers.append(result)
+    return {"answers": answers() if stream else list(answers())}
 
-    return {"answers": answers}
+
+def process_queries(input_data: Dict) -> Dict[str, List[Dict[str, Any]]]:
+    return run_queries(input_data)
 
 
 def parse_xml(file_path: str, save_to_db: bool = False) -> None:
-    """Parse XML file and optionally save to database."""
+    """
+    Parse XML file and optionally save to database.
+
+    When saving, a file whose content hash matches a saved graph is skipped
+    without being parsed, and a changed file for a saved graph ID is saved as
+    a new version of it, which replaces the current one atomically on commit.
+    """
     parser = GraphXMLParser()
     try:
+        content_hash = None
+        if save_to_db:
+            ensure_db_tables_exist()
+            content_hash = parser.content_hash(file_path)
+            with SessionLocal() as session:
+                identical = session.execute(
+                    select(Graph.id).where(Graph.content_hash == content_hash)
+                ).scalar()
+            if identical is not None:
+                print(f"\nGraph '{identical}' is already saved with identical content, skipping")
+                return
+
         result = parser.parse_file(file_path)
         print('\nParsing successful! Graph structure:')
         print(f'Graph ID: {result["id"]}')
@@ -89,51 +365,149 @@ def parse_xml(file_path: str, save_to_db: bool = False) -> None:
         print(f'Number of edges: {len(result["edges"])}')
 
         if save_to_db:
-            ensure_db_tables_exist()
+            save_graph(
+                result['id'], result['name'],
+                [node['id'] for node in result['nodes']], [node['name'] for node in result['nodes']],
+                [edge['id'] for edge in result['edges']], [edge['from'] for edge in result['edges']],
+                [edge['to'] for edge in result['edges']], [edge.get('cost', 0.0) for edge in result['edges']],
+                content_hash
+            )
+
+    except Exception as e:
+        print(f'\nError: {str(e)}')
+        sys.exit(1)
+
+
+def save_graph(graph_id: str, name: str, node_ids: Sequence[str], node_names: Sequence[str],
+               edge_ids: Sequence[str], edge_from: Sequence[str], edge_to: Sequence[str],
+               edge_costs: Sequence[float], content_hash: Optional[str] = None) -> None:
+    """
+    Save a parsed graph as a new version of it with the bulk writer and
+    announce the change, exiting on database errors.
+    """
+    session = SessionLocal()
+    try:
+        replaced = current_version(session, graph_id) is not None
+        write_graph(session, graph_id, name, node_ids, node_names, edge_ids, edge_from, edge_to,
+                    edge_costs, content_hash)
+        notify_graph_changed(session, graph_id)
+        session.commit()
+        if replaced:
+            print(f"\nReplaced the previously saved graph '{graph_id}'")
+        print('\nSuccessfully saved to database!')
+    except Exception as e:
+        print(f'\nDatabase Error: {str(e)}')
+        session.rollback()
+        sys.exit(1)
+    finally:
+        session.close()
+    collect_versions()
+
+
+def import_tabular(graph_id: str, name: str, nodes_path: str, edges_path: str) -> None:
+    """Parse a graph from CSV/TSV node and edge files and save it to the database."""
+    try:
+        result = GraphTabularParser().parse_files(graph_id, name, nodes_path, edges_path)
+    except (OSError, TabularValidationError) as e:
+        print(f'\nError: {str(e)}')
+        sys.exit(1)
+
+    print('\nParsing successful! Graph structure:')
+    print(f'Graph ID: {result["id"]}')
+    print(f'Graph Name: {result["name"]}')
+    print(f'Number of nodes: {len(result["nodes"]["id"])}')
+    print(f'Number of edges: {len(result["edges"]["id"])}')
+
+    ensure_db_tables_exist()
+    nodes, edges = result['nodes'], result['edges']
+    save_graph(graph_id, name, nodes['id'], nodes['name'], edges['id'], edges['from'], edges['to'], edges['cost'])
+
+
+def remove_graph(graph_id: str) -> None:
+    """Delete a graph and its nodes and edges from the database."""
+    ensure_db_tables_exist()
 
-            session = SessionLocal()
-            try:
-                # Create graph
-                graph = Graph(id=result['id'], name=result['name'])
-                session.add(graph)
-                session.flush()
-
-                # Create nodes
-                node_map = {}
-                for node_data in result['nodes']:
-                    node = Node(
-                        node_id=node_data['id'],
-                        name=node_data['name'],
-                        graph_id=graph.id
-                    )
-                    session.add(node)
-                    node_map[node_data['id']] = node
-                session.flush()
-
-                # Create edges
-                for edge_data in result['edges']:
-                    edge = Edge(
-                        edge_id=edge_data['id'],
-                        from_node_id=node_map[edge_data['from']].id,
-                        to_node_id=node_map[edge_data['to']].id,
-                        cost=edge_data.get('cost', 0.0),
-                        graph_id=graph.id
-                    )
-                    session.add(edge)
-
-                session.commit()
-                print('\nSuccessfully saved to database!')
-
-            except Exception as e:
-                print(f'\nDatabase Error: {str(e)}')
-                session.rollback()
-                sys.exit(1)
-            finally:
-                session.close()
+    if not check_graph_exists(graph_id):
+        print(f"\nError: Graph with ID '{graph_id}' does not exist in the database")
+        sys.exit(1)
 
+    session = SessionLocal()
+    try:
+        delete_graph(session, graph_id)
+        notify_graph_changed(session, graph_id)
+        session.commit()
+        print(f"\nSuccessfully deleted graph '{graph_id}'")
     except Exception as e:
+        print(f'\nDatabase Error: {str(e)}')
+        session.rollback()
+        sys.exit(1)
+    finally:
+        session.close()
+
+
+def collect_versions() -> int:
+    """
+    Delete graph versions superseded more than GRAPH_VERSION_RETENTION_SECONDS
+    ago, in a transaction of its own. Returns the number of versions deleted.
+    """
+    with SessionLocal() as session:
+        collected = collect_garbage(session, settings.GRAPH_VERSION_RETENTION_SECONDS)
+        session.commit()
+    return collected
+
+
+def build_hierarchy(graph_id: str) -> None:
+    """Build a graph's contraction hierarchy offline and persist it in CH_SNAPSHOT_DIR."""
+    ensure_db_tables_exist()
+
+    if not check_graph_exists(graph_id):
+        print(f"\nError: Graph with ID '{graph_id}' does not exist in the database")
+        sys.exit(1)
+
+    try:
+        hierarchy = PathFinder(graph_id, lazy=False).build_contraction_hierarchy()
+    except ValueError as e:
         print(f'\nError: {str(e)}')
         sys.exit(1)
+    # Query processes look for a snapshot once per loaded graph; make them reload it
+    with SessionLocal() as session:
+        notify_graph_changed(session, graph_id)
+        session.commit()
+    print(f"\nBuilt contraction hierarchy for graph '{graph_id}':")
+    print(f'Number of nodes: {len(hierarchy.nodes)}')
+    print(f'Number of shortcuts: {hierarchy.shortcut_count}')
+    print(f'Preprocessing time: {hierarchy.preprocessing_seconds:.1f}s')
+
+
+def serve_queries() -> None:
+    """
+    Answer query batches from stdin until it is closed, one JSON document per line.
+
+    Each input line holds a batch in the format of the query command and is
+    answered with one line of compact JSON. Loaded graphs stay cached between
+    batches and are dropped when another process reports them changed.
+
+    A batch that fails for any reason (invalid input, a database error while
+    loading its graph) is answered with an "error" and the process keeps
+    serving. Each answer line is assembled before it is written, so a failure
+    part way through streaming a batch never leaves half a line on stdout.
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        buffer = StringIO()
+        writer = StreamingJSONWriter(buffer, indent=None, encoder=settings.OUTPUT_ENCODER)
+        try:
+            writer.write(run_queries(json.loads(line), stream=True, cached=True))
+        except json.JSONDecodeError as e:
+            buffer = StringIO(json.dumps({"error": f"Invalid JSON input - {str(e)}"}))
+        except ValueError as e:
+            buffer = StringIO(json.dumps({"error": str(e)}))
+        except Exception as e:
+            buffer = StringIO(json.dumps({"error": f"Query batch failed - {type(e).__name__}: {e}"}))
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.write('\n')
+        sys.stdout.flush()
 
 
 def print_usage():
@@ -141,7 +515,12 @@ def print_usage():
 Usage:
     Parse XML only:     python -m src.main parse <xml_file>
     Parse & save XML:   python -m src.main save <xml_file>
-    Process queries:    python -m src.main query < input.json
+    Import CSV/TSV:     python -m src.main import <graph_id> <name> <nodes_file> <edges_file>
+    Delete a graph:     python -m src.main delete <graph_id>
+    Build hierarchy:    python -m src.main build-ch <graph_id>
+    Collect versions:   python -m src.main gc
+    Process queries:    python -m src.main query [--compact] < input.json
+    Serve query lines:  python -m src.main serve < batches.jsonl
     """)
 
 
@@ -159,14 +538,53 @@ def main():
         xml_file = sys.argv[2]
         parse_xml(xml_file, save_to_db=(command == 'save'))
 
+    elif command == 'import':
+        if len(sys.argv) != 6:
+            print_usage()
+            sys.exit(1)
+        import_tabular(*sys.argv[2:6])
+
+    elif command == 'delete':
+        if len(sys.argv) != 3:
+            print_usage()
+            sys.exit(1)
+        remove_graph(sys.argv[2])
+
+    elif command == 'build-ch':
+        if len(sys.argv) != 3:
+            print_usage()
+            sys.exit(1)
+        build_hierarchy(sys.argv[2])
+
+    elif command == 'gc':
+        if len(sys.argv) != 2:
+            print_usage()
+            sys.exit(1)
+        ensure_db_tables_exist()
+        print(f"\nDeleted {collect_versions()} superseded graph versions")
+
+    elif command == 'serve':
+        if len(sys.argv) != 2:
+            print_usage()
+            sys.exit(1)
+        serve_queries()
+
     elif command == 'query':
+        if len(sys.argv) > 3 or (len(sys.argv) == 3 and sys.argv[2] != '--compact'):
+            print_usage()
+            sys.exit(1)
+        compact = len(sys.argv) == 3 or not settings.OUTPUT_INDENT
         try:
             # Read input JSON from stdin
             input_data = json.load(sys.stdin)
-            # Process queries and get results
-            results = process_queries(input_data)
-            # Write results to stdout
-            json.dump(results, sys.stdout, indent=2)
+            # Process queries lazily and write each answer to stdout as it is produced
+            results = run_queries(input_data, stream=True)
+            writer = StreamingJSONWriter(
+                sys.stdout,
+                indent=None if compact else settings.OUTPUT_INDENT,
+                encoder=settings.OUTPUT_ENCODER
+            )
+            writer.write(results)
             sys.stdout.write('\n')
         except json.JSONDecodeError as e:
             sys.stderr.write(f"Error: Invalid JSON input - {str(e)}\n")
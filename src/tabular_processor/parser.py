@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import csv
+from src.utils.exceptions import TabularValidationError
+
+
+# Node and edge files must start with a header naming these columns (in any order)
+NODE_COLUMNS = ('id', 'name')
+EDGE_COLUMNS = ('id', 'from', 'to')  # 'cost' is optional and defaults to 0.0
+
+
+class GraphTabularParser:
+    """
+    Parser for graphs given as a node list and an edge list in CSV or TSV files.
+
+    Files ending in .tsv are tab separated, all others comma separated. Rows are
+    read column by column, and the checks of GraphXMLParser run on whole
+    columns at once; rows are only looked at one by one to name the first
+    offending one once a check has failed.
+    """
+
+    @staticmethod
+    def delimiter(file_path: str) -> str:
+        return '\t' if file_path.lower().endswith('.tsv') else ','
+
+    def read_columns(self, file_path: str, required: Sequence[str],
+                     optional: Sequence[str] = ()) -> Dict[str, Tuple[str, ...]]:
+        """Read a file with a header row into one tuple of values per column."""
+        with open(file_path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f, delimiter=self.delimiter(file_path))
+            header = [name.strip() for name in next(reader, [])]
+            missing = [name for name in required if name not in header]
+            if missing:
+                raise TabularValidationError(f"{file_path}: missing required column(s): {', '.join(missing)}")
+            rows = [row for row in reader if row]
+
+        short = next((i for i, row in enumerate(rows) if len(row) < len(header)), None)
+        if short is not None:
+            raise TabularValidationError(f"{file_path}: row {short + 2} has fewer fields than the header")
+
+        columns = list(zip(*rows)) if rows else [()] * len(header)
+        return {
+            name: tuple(columns[header.index(name)])
+            for name in (*required, *optional) if name in header
+        }
+
+    def _validate_nodes(self, node_ids: Tuple[str, ...]) -> None:
+        if not node_ids:
+            raise TabularValidationError("Graph must have at least one node")
+        if '' in node_ids:
+            raise TabularValidationError("Node id must not be empty")
+        if len(set(node_ids)) != len(node_ids):
+            seen = set()
+            duplicate = next(node_id for node_id in node_ids if node_id in seen or seen.add(node_id))
+            raise TabularValidationError(f"Duplicate node id found: {duplicate}")
+
+    def _parse_costs(self, edge_ids: Tuple[str, ...], costs: Optional[Tuple[str, ...]]) -> List[float]:
+        if costs is None:
+            return [0.0] * len(edge_ids)
+        try:
+            return [float(cost) if cost else 0.0 for cost in costs]
+        except ValueError:
+            invalid = next(i for i, cost in enumerate(costs) if not self._is_float(cost))
+            raise TabularValidationError(f"Invalid cost value for edge {edge_ids[invalid]}")
+
+    @staticmethod
+    def _is_float(value: str) -> bool:
+        try:
+            float(value or 0)
+            return True
+        except ValueError:
+            return False
+
+    def _validate_edges(self, edges: Dict[str, Sequence], valid_node_ids: set) -> None:
+        for column in ('from', 'to'):
+            unknown = set(edges[column]) - valid_node_ids
+            if unknown:
+                first = next(node_id for node_id in edges[column] if node_id in unknown)
+                raise TabularValidationError(f"Edge references non-existent {column} node: {first}")
+
+        if edges['cost'] and min(edges['cost']) < 0:
+            negative = next(cost for cost in edges['cost'] if cost < 0)
+            raise TabularValidationError(f"Edge cost must be non-negative: {negative}")
+
+    def parse_files(self, graph_id: str, name: str, nodes_path: str, edges_path: str) -> Dict:
+        """
+        Parse and validate a graph's node and edge files.
+
+        Returns:
+            Dict with the graph's id and name, 'nodes' as columns 'id' and 'name',
+            and 'edges' as columns 'id', 'from', 'to' and 'cost' (floats)
+        """
+        if not graph_id:
+            raise TabularValidationError("Graph id must not be empty")
+
+        nodes = self.read_columns(nodes_path, NODE_COLUMNS)
+        self._validate_nodes(nodes['id'])
+
+        raw_edges = self.read_columns(edges_path, EDGE_COLUMNS, optional=('cost',))
+        edges = {
+            'id': raw_edges['id'],
+            'from': raw_edges['from'],
+            'to': raw_edges['to'],
+            'cost': self._parse_costs(raw_edges['id'], raw_edges.get('cost')),
+        }
+        self._validate_edges(edges, set(nodes['id']))
+
+        return {'id': graph_id, 'name': name, 'nodes': nodes, 'edges': edges}
@@ -0,0 +1,23 @@
+from typing import Optional
+import time
+from src.utils.exceptions import QueryTimeoutError
+
+
+class Deadline:
+    """
+    Hard time budget for a single query.
+
+    Long-running searches call check() as they make progress, which gives
+    cooperative cancellation: the search is abandoned at the next check after
+    the budget is spent.
+    """
+
+    __slots__ = ('seconds', 'expires_at')
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def check(self) -> None:
+        if self.expires_at is not None and time.monotonic() > self.expires_at:
+            raise QueryTimeoutError(f"Query exceeded its deadline of {self.seconds} seconds")
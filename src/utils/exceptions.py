@@ -1,3 +1,13 @@
 class XMLValidationError(Exception):
     """Raised when XML validation fails."""
     pass
+
+
+class QueryTimeoutError(Exception):
+    """Raised when a query runs past its deadline."""
+    pass
+
+
+class TabularValidationError(Exception):
+    """Raised when a tabular (CSV/TSV) graph file fails validation."""
+    pass
@@ -0,0 +1,128 @@
+from typing import Any, Callable, Iterable, Optional, TextIO
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional fast encoder backend
+    orjson = None
+
+
+class _Omit:
+    """Marker returned by a deferred value to leave its key out of the object."""
+
+    def __repr__(self) -> str:
+        return "OMIT"
+
+
+OMIT = _Omit()
+
+
+class StreamingJSONWriter:
+    """
+    Writes JSON incrementally, consuming generators as it goes.
+
+    Dicts, lists, tuples and any other iterator (such as a generator of paths)
+    are written element by element, so a large answer never has to exist in
+    memory as a whole and its first bytes reach the stream immediately. Values
+    that are callables are deferred: they are called when the writer reaches
+    them, which lets an answer report something (like an error) that is only
+    known after the preceding generators have been consumed.
+
+    With the default indent of 2 the output is identical to
+    json.dump(value, indent=2). indent=None writes compact JSON.
+    The "orjson" encoder backend, when installed, encodes the leaves (scalars
+    and fully materialised lists such as a single path) faster than json.
+    """
+
+    def __init__(self, stream: TextIO, indent: Optional[int] = 2, encoder: str = "json",
+                 flush_every: int = 1000):
+        self.stream = stream
+        self.indent = indent or None
+        self.flush_every = flush_every
+        self._written_items = 0
+        if encoder == "orjson" and orjson is None:
+            raise ValueError("The orjson encoder backend is not installed")
+        self._dumps = self._make_dumps(encoder)
+
+    def _make_dumps(self, encoder: str) -> Callable[[Any, int], str]:
+        indent = self.indent
+        if encoder == "orjson" and indent in (None, 2):
+            option = orjson.OPT_INDENT_2 if indent else 0
+
+            def dumps(value: Any, level: int) -> str:
+                text = orjson.dumps(value, option=option).decode('utf-8')
+                return text.replace('\n', '\n' + ' ' * (indent * level)) if indent else text
+            return dumps
+
+        if indent:
+            def dumps(value: Any, level: int) -> str:
+                return json.dumps(value, indent=indent).replace('\n', '\n' + ' ' * (indent * level))
+            return dumps
+
+        def dumps(value: Any, level: int) -> str:
+            return json.dumps(value, separators=(',', ':'))
+        return dumps
+
+    def write(self, value: Any) -> None:
+        self._write(value, 0)
+        self.stream.flush()
+
+    def _write(self, value: Any, level: int) -> None:
+        if callable(value):
+            value = value()
+        if isinstance(value, dict):
+            if not any(_is_lazy(item) for item in value.values()):
+                self.stream.write(self._dumps(value, level))
+            else:
+                self._write_object(value.items(), level)
+        elif isinstance(value, (list, tuple)):
+            if not any(_is_lazy(item) for item in value):
+                self.stream.write(self._dumps(value, level))
+            else:
+                self._write_array(value, level)
+        elif _is_lazy(value):
+            self._write_array(value, level)
+        else:
+            self.stream.write(self._dumps(value, level))
+
+    def _separator(self, level: int) -> str:
+        return '\n' + ' ' * (self.indent * level) if self.indent else ''
+
+    def _write_array(self, items: Iterable[Any], level: int) -> None:
+        write = self.stream.write
+        first = True
+        for item in items:
+            write(('[' if first else ',') + self._separator(level + 1))
+            first = False
+            self._write(item, level + 1)
+            self._written_items += 1
+            # Flush the first element right away, then in batches
+            if self._written_items == 1 or self._written_items % self.flush_every == 0:
+                self.stream.flush()
+        write('[]' if first else self._separator(level) + ']')
+
+    def _write_object(self, items: Iterable[Any], level: int) -> None:
+        write = self.stream.write
+        key_separator = ': ' if self.indent else ':'
+        first = True
+        for key, item in items:
+            if callable(item):
+                item = item()
+            if item is OMIT:
+                continue
+            write(('{' if first else ',') + self._separator(level + 1))
+            first = False
+            write(json.dumps(str(key)) + key_separator)
+            self._write(item, level + 1)
+        write('{}' if first else self._separator(level) + '}')
+
+
+def _is_lazy(value: Any) -> bool:
+    """Whether a value has to be written incrementally rather than encoded in one go."""
+    if callable(value):
+        return True
+    if isinstance(value, dict):
+        return any(_is_lazy(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_is_lazy(item) for item in value)
+    return not isinstance(value, (str, bytes, int, float, bool, type(None)))
@@ -1,10 +1,34 @@
 from typing import Dict, Optional, Set
+import hashlib
 from lxml import etree
 from src.utils.exceptions import XMLValidationError
 
 
 class GraphXMLParser:
 
+    # Files are hashed in chunks of this many bytes, so hashing never holds the whole file
+    HASH_CHUNK_SIZE = 1 << 20
+
+    def content_hash(self, file_path: str) -> str:
+        """
+        SHA-256 of a graph file with line endings normalized to LF, computed by
+        streaming the raw bytes without parsing them. Identical re-sends hash
+        the same even when they passed through a CRLF-converting transfer.
+        """
+        digest = hashlib.sha256()
+        pending_cr = False
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b''):
+                if pending_cr:
+                    chunk = b'\r' + chunk
+                pending_cr = chunk.endswith(b'\r')  # May be the first half of a CRLF
+                if pending_cr:
+                    chunk = chunk[:-1]
+                digest.update(chunk.replace(b'\r\n', b'\n'))
+        if pending_cr:
+            digest.update(b'\r')
+        return digest.hexdigest()
+
     def find_element(self, element: etree.Element, child: str) -> Optional[etree.Element]:
         found = element.find(child)
         if found is None:
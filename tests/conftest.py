@@ -1,6 +1,9 @@
+import random
+
 import pytest
 from sqlalchemy import text
-from src.db.database import Base, SessionLocal, engine
+from src.db.database import SessionLocal, init_db
+from src.graph.path_finder import PathFinder
 
 
 def cleanup_database(session):
@@ -24,14 +27,6 @@ def test_db():
 
     cleanup_database(session)
 
-    try:
-        with open('src/db/migrations/02_create_cycle_detection.sql', 'r') as f:
-            session.execute(text(f.read()))
-            session.commit()
-    except Exception as e:
-        # Function might already exist, which is fine
-        session.rollback()
-
     yield session
 
     cleanup_database(session)
@@ -41,17 +36,40 @@ def test_db():
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
     """Ensure database is properly set up before any tests run."""
-    Base.metadata.create_all(bind=engine)
+    init_db()
+
+    yield
+
+
+def build_random_finder(seed: int, num_nodes: int = 60, num_edges: int = 240,
+                        max_cost: int = 9, integral: bool = True) -> PathFinder:
+    """In-memory graph with num_edges random edges (self-loops and parallel edges included)."""
+    rng = random.Random(seed)
+    node_ids = [f"n{i}" for i in range(num_nodes)]
+    edges = [
+        (
+            rng.choice(node_ids),
+            rng.choice(node_ids),
+            rng.randint(0, max_cost) if integral else rng.uniform(0, max_cost)
+        )
+        for _ in range(num_edges)
+    ]
+    return PathFinder.from_edges("random", node_ids, edges)
+
+
+def total_path_cost(finder: PathFinder, path) -> float:
+    """Cost of a path, taking the cheapest of parallel edges."""
+    return sum(
+        min(cost for neighbor, cost in finder.adjacency_list[u] if neighbor == v)
+        for u, v in zip(path, path[1:])
+    )
+
+
+@pytest.fixture
+def random_finder():
+    return build_random_finder
 
-    # Create cycle detection function
-    session = SessionLocal()
-    try:
-        with open('src/db/migrations/02_create_cycle_detection.sql', 'r') as f:
-            session.execute(text(f.read()))
-            session.commit()
-    except Exception:
-        session.rollback()
-    finally:
-        session.close()
 
-    yield
\ No newline at end of file
+@pytest.fixture
+def path_cost():
+    return total_path_cost
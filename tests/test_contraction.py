@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from src.config import settings
+from src.graph.contraction import ContractionHierarchy
+from src.utils.deadline import Deadline
+from src.utils.exceptions import QueryTimeoutError
+
+
+class TestContractionHierarchy:
+    def test_matches_dijkstra(self, random_finder, path_cost):
+        for seed in range(10):
+            finder = random_finder(seed, num_nodes=80, max_cost=10, integral=seed % 2 == 0)
+            hierarchy = ContractionHierarchy.build(finder.adjacency_list)
+            nodes = list(finder.adjacency_list)
+            for start in nodes[:10]:
+                for end in nodes:
+                    if start == end:
+                        continue
+                    expected = finder.find_cheapest_path(start, end)
+                    path = hierarchy.query(start, end)
+                    assert (expected is False) == (path is None)
+                    if path:
+                        assert path[0] == start and path[-1] == end
+                        assert abs(path_cost(finder, path) - path_cost(finder, expected)) < 1e-9
+
+    def test_path_finder_uses_built_snapshot_only(self, random_finder, path_cost, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "CONTRACTION_HIERARCHIES", True)
+        monkeypatch.setattr(settings, "CH_SNAPSHOT_DIR", str(tmp_path))
+        finder = random_finder(42, num_nodes=80)
+
+        # Queries never build the hierarchy themselves
+        assert finder.cheapest_path_engine == "dial"
+        expected = finder.find_cheapest_path("n0", "n1")
+        assert not list(tmp_path.iterdir())
+
+        finder.build_contraction_hierarchy()
+        reloaded = random_finder(42, num_nodes=80)
+        assert reloaded.cheapest_path_engine == "ch"
+        path = reloaded.find_cheapest_path("n0", "n1")
+        assert (path is False) == (expected is False)
+        if path:
+            assert path_cost(finder, path) == path_cost(finder, expected)
+
+        # A changed graph has no snapshot and falls back to Dijkstra
+        assert random_finder(43, num_nodes=80).cheapest_path_engine == "dial"
+
+    def test_missing_snapshot_looked_up_once(self, random_finder, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "CONTRACTION_HIERARCHIES", True)
+        monkeypatch.setattr(settings, "CH_SNAPSHOT_DIR", str(tmp_path))
+        lookups = []
+        load_snapshot = ContractionHierarchy.load_snapshot
+        monkeypatch.setattr(ContractionHierarchy, "load_snapshot",
+                            lambda *args: lookups.append(args) or load_snapshot(*args))
+        finder = random_finder(42, num_nodes=80)
+
+        for end in ("n1", "n2", "n3"):
+            finder.find_cheapest_path("n0", end)
+        assert finder.cheapest_path_engine == "dial"
+        assert len(lookups) == 1
+
+    def test_build_requires_snapshot_dir(self, random_finder, monkeypatch):
+        monkeypatch.setattr(settings, "CH_SNAPSHOT_DIR", "")
+        with pytest.raises(ValueError):
+            random_finder(1).build_contraction_hierarchy()
+
+    def test_snapshot_keyed_by_graph_version(self, random_finder, tmp_path):
+        finder = random_finder(5, num_nodes=80)
+        assert ContractionHierarchy.load_snapshot(str(tmp_path), finder.graph_id, finder.graph_version) is None
+
+        built = ContractionHierarchy.build_snapshot(
+            finder.adjacency_list, finder.graph_id, finder.graph_version, str(tmp_path)
+        )
+        snapshots = list(tmp_path.iterdir())
+        assert len(snapshots) == 1
+        assert finder.graph_version in snapshots[0].name
+
+        loaded = ContractionHierarchy.load_snapshot(str(tmp_path), finder.graph_id, finder.graph_version)
+        assert loaded.shortcut_count == built.shortcut_count
+        assert loaded.query("n0", "n7") == built.query("n0", "n7")
+
+        changed = random_finder(6, num_nodes=80)
+        assert changed.graph_version != finder.graph_version
+
+    def test_query_deadline(self, random_finder):
+        hierarchy = ContractionHierarchy.build(random_finder(3).adjacency_list)
+        expired = Deadline(0.000001)
+        time.sleep(0.001)
+
+        with pytest.raises(QueryTimeoutError):
+            hierarchy.query("n0", "n1", deadline=expired)
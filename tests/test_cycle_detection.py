@@ -2,6 +2,8 @@ import pytest
 from sqlalchemy.orm import Session
 from src.db.models import Graph, Node, Edge
 from src.graph.cycle_detector import CycleDetector
+from src.graph.path_finder import PathFinder
+from src.main import process_single_query
 
 
 def create_test_graph(session: Session, graph_id: str) -> Graph:
@@ -167,3 +169,57 @@ class TestCycleDetection:
         assert ["a1", "b1", "c1", "a1"] in cycles
         assert ["d", "e", "f", "d"] in cycles
         assert CycleDetector.detect_has_cycle(graph.id)
+
+
+def in_memory_finder(edges) -> PathFinder:
+    node_ids = {node for edge in edges for node in edge}
+    return PathFinder.from_edges("in_memory", node_ids, [(u, v, 1.0) for u, v in edges])
+
+
+class TestInMemoryCycles:
+    COMPLEX_EDGES = [
+        ("a", "b"), ("b", "c"), ("c", "d"),
+        ("d", "e"), ("e", "f"), ("f", "a"),
+        ("b", "e"), ("c", "f"),
+        ("d", "b")
+    ]
+
+    def test_matches_sql_function(self, test_db):
+        graph = create_test_graph(test_db, "g8")
+        nodes = {
+            c: create_test_node(test_db, graph, c, f"Node {c.upper()}")
+            for c in "abcdef"
+        }
+        for i, (from_id, to_id) in enumerate(self.COMPLEX_EDGES):
+            create_test_edge(test_db, graph, f"e{i + 1}", nodes[from_id], nodes[to_id])
+
+        in_memory = list(PathFinder(graph.id).find_cycles())
+        assert sorted(in_memory) == sorted(CycleDetector.find_cycles(graph.id))
+
+    def test_through(self):
+        finder = in_memory_finder(self.COMPLEX_EDGES)
+
+        cycles = list(finder.find_cycles(through="d"))
+        assert sorted(cycles) == [["a", "b", "c", "d", "e", "f", "a"], ["b", "c", "d", "b"]]
+        assert list(finder.find_cycles(through="x")) == []
+
+    def test_max_length(self):
+        finder = in_memory_finder(self.COMPLEX_EDGES)
+
+        assert list(finder.find_cycles(max_length=3)) == [["b", "c", "d", "b"]]
+        assert len(list(finder.find_cycles(max_length=4))) == 3
+
+    def test_self_loop_and_two_cycle(self):
+        finder = in_memory_finder([("a", "a"), ("a", "b"), ("b", "a")])
+
+        assert list(finder.find_cycles()) == [["a", "b", "a"]]
+
+    def test_cycles_query(self):
+        finder = in_memory_finder(self.COMPLEX_EDGES)
+
+        answer = process_single_query({"cycles": {"through": "b", "limit": 2}}, finder)
+        assert answer["cycles"]["through"] == "b"
+        assert len(answer["cycles"]["cycles"]) == 2
+
+        answer = process_single_query({"cycles": {"limit": 0}}, finder)
+        assert answer["cycles"]["error"] == "cycles.limit must be a positive integer"
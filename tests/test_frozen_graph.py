@@ -0,0 +1,89 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.config import settings
+from src.graph import frozen_graph
+from src.graph.frozen_graph import FrozenGraph
+from src.graph.path_finder import PathFinder
+
+
+def answer(graph: PathFinder, start: str, end: str):
+    """A query of every kind from start to end, comparable between graphs."""
+    costs, _, _ = graph.find_cheapest_from(start, max_nodes=20)
+    return (
+        graph.find_cheapest_path(start, end),
+        graph.find_all_paths(start, end, limit=25),
+        graph.find_path_edges(start, end, limit=25),
+        costs,
+        list(graph.find_cycles(through=start, max_length=4)),
+    )
+
+
+class TestFrozenGraph:
+    def test_adjacency_and_attributes_are_read_only(self, random_finder):
+        graph = FrozenGraph.freeze(random_finder(1))
+
+        with pytest.raises(TypeError):
+            graph.adjacency_list["n0"] = ()
+        with pytest.raises(TypeError):
+            graph.reverse_adjacency_list["n0"] = ()
+        with pytest.raises(AttributeError):
+            graph.adjacency_list["n0"].append(("n1", 1))
+        with pytest.raises(AttributeError):
+            graph.max_cost = 0
+
+    def test_lookups_of_unknown_nodes_do_not_grow_the_graph(self, random_finder):
+        finder = random_finder(2)
+        nodes = len(finder.adjacency_list)
+
+        assert finder.find_all_paths("n0", "missing") == []
+        assert finder.find_path_edges("missing", "n0") == ([], 0, False)
+        assert finder.find_cheapest_path("missing", "n0") is False
+        assert len(finder.adjacency_list) == nodes
+        assert "missing" not in finder.adjacency_list
+
+    def test_answers_match_the_path_finder(self, random_finder):
+        finder = random_finder(3, num_edges=120)
+        graph = FrozenGraph.freeze(finder)
+        rng = random.Random(3)
+        for _ in range(30):
+            start, end = f"n{rng.randrange(60)}", f"n{rng.randrange(60)}"
+            assert answer(graph, start, end) == answer(finder, start, end)
+        assert graph.graph_version == finder.graph_version
+        assert graph.cheapest_path_engine == finder.cheapest_path_engine
+
+    def test_lazily_loaded_graphs_cannot_be_frozen(self, test_db, monkeypatch):
+        monkeypatch.setattr(settings, "LAZY_LOADING", True)
+        with pytest.raises(ValueError):
+            FrozenGraph.freeze(PathFinder("missing"))
+
+    @pytest.mark.skipif(frozen_graph.numpy is None, reason="NumPy is not installed")
+    def test_numpy_reachability_matches_python(self, random_finder, monkeypatch):
+        monkeypatch.setattr(frozen_graph, "NUMPY_MIN_EDGES", 0)
+        for seed in range(5):
+            finder = random_finder(seed, num_nodes=80, num_edges=120)
+            graph = FrozenGraph.freeze(finder)
+            assert graph._csr is not None
+            for start in list(finder.adjacency_list)[:20]:
+                for end in finder.adjacency_list:
+                    assert graph._reaches(start, end) == finder._reaches(start, end)
+            assert not graph._reaches("n0", "missing")
+
+    def test_concurrent_queries_match_single_threaded_answers(self, random_finder, monkeypatch):
+        # A small search cache makes threads keep evicting and resuming paused searches
+        monkeypatch.setattr(settings, "SEARCH_CACHE_SIZE", 3)
+        monkeypatch.setattr(frozen_graph, "NUMPY_MIN_EDGES", 0)
+        finder = random_finder(7, num_nodes=60, num_edges=120)
+        graph = FrozenGraph.freeze(finder)
+        rng = random.Random(7)
+        queries = [(f"n{rng.randrange(12)}", f"n{rng.randrange(60)}") for _ in range(400)]
+        expected = {query: answer(random_finder(7, num_nodes=60, num_edges=120), *query)
+                    for query in set(queries)}
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda query: answer(graph, *query), queries))
+
+        for query, result in zip(queries, results):
+            assert result == expected[query]
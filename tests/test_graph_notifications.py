@@ -0,0 +1,151 @@
+import io
+import json
+import select
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import main
+from src.db.models import Edge, Graph, Node
+from src.db.notifications import GraphChangeListener, notify_graph_changed
+from src.graph.graph_cache import GraphCache
+
+
+def save_graph(session, graph_id: str, edges) -> None:
+    session.add(Graph(id=graph_id, name="Notified"))
+    nodes = {node_id: Node(node_id=node_id, name=node_id.upper(), graph_id=graph_id) for node_id in "abc"}
+    session.add_all(nodes.values())
+    session.flush()
+    for from_node, to_node, cost in edges:
+        add_edge(session, graph_id, nodes[from_node], nodes[to_node], cost)
+    session.commit()
+
+
+def add_edge(session, graph_id: str, from_node: Node, to_node: Node, cost: float) -> None:
+    session.add(Edge(edge_id=f"{from_node.node_id}{to_node.node_id}", from_node_id=from_node.id,
+                     to_node_id=to_node.id, cost=cost, graph_id=graph_id))
+
+
+@pytest.fixture
+def fresh_graph_cache():
+    main.graph_cache.clear()
+    yield main.graph_cache
+    main.graph_cache.clear()
+    if main.graph_change_listener is not None:
+        main.graph_change_listener.close()
+        main.graph_change_listener = None
+
+
+class TestGraphCache:
+    def test_lru_eviction_and_invalidate(self):
+        cache = GraphCache(2)
+        loads = []
+
+        def loader(graph_id):
+            return lambda: loads.append(graph_id) or graph_id.upper()
+
+        assert cache.get_or_load("a", loader("a")) == "A"
+        cache.get_or_load("b", loader("b"))
+        cache.get_or_load("a", loader("a"))  # Hit, "b" is now least recently used
+        cache.get_or_load("c", loader("c"))
+        assert loads == ["a", "b", "c"]
+        assert "b" not in cache and "a" in cache
+
+        assert cache.invalidate("a")
+        assert not cache.invalidate("a")
+        cache.get_or_load("a", loader("a"))
+        assert loads == ["a", "b", "c", "a"]
+
+
+class TestGraphChangeNotifications:
+    def test_notification_is_delivered_on_commit_only(self, test_db):
+        changed = []
+        listener = GraphChangeListener(changed.append)
+        try:
+            notify_graph_changed(test_db, "rolled_back")
+            test_db.rollback()
+            notify_graph_changed(test_db, "committed")
+            test_db.commit()
+
+            assert listener.poll(timeout=5) == ["committed"]
+            assert changed == ["committed"]
+            assert listener.poll() == []
+        finally:
+            listener.close()
+
+    def test_concurrent_polls_share_the_connection(self, test_db):
+        changed = []
+        listener = GraphChangeListener(changed.append)
+        try:
+            for i in range(20):
+                notify_graph_changed(test_db, f"g{i}")
+                test_db.commit()
+            select.select([listener], [], [], 5)
+            with ThreadPoolExecutor(8) as pool:
+                polled = [payload for result in pool.map(lambda _: listener.poll(timeout=0.1), range(8))
+                          for payload in result]
+
+            # Each notification is handled once, by whichever thread read it
+            assert sorted(polled) == sorted(changed) == sorted(f"g{i}" for i in range(20))
+        finally:
+            listener.close()
+
+    def test_query_process_reloads_changed_graph(self, test_db, fresh_graph_cache):
+        save_graph(test_db, "notified", [("a", "b", 1), ("b", "c", 1)])
+        queries = {"graph_id": "notified", "queries": [{"cheapest": {"start": "a", "end": "c"}}]}
+
+        first = main.run_queries(queries, cached=True)
+        assert first["answers"][0]["cheapest"]["path"] == ["a", "b", "c"]
+        assert "notified" in fresh_graph_cache
+
+        # Another process adds a direct edge and announces the change
+        a, c = (test_db.query(Node).filter_by(graph_id="notified", node_id=n).one() for n in "ac")
+        add_edge(test_db, "notified", a, c, 1)
+        notify_graph_changed(test_db, "notified")
+        test_db.commit()
+        select.select([main.graph_change_listener], [], [], 5)
+
+        second = main.run_queries(queries, cached=True)
+        assert second["answers"][0]["cheapest"]["path"] == ["a", "c"]
+
+    def test_one_shot_queries_do_not_listen(self, test_db, fresh_graph_cache):
+        save_graph(test_db, "one_shot", [("a", "b", 1)])
+
+        answer = main.run_queries({"graph_id": "one_shot", "queries": [{"cheapest": {"start": "a", "end": "b"}}]})
+        assert answer["answers"][0]["cheapest"]["path"] == ["a", "b"]
+        assert main.graph_change_listener is None
+        assert "one_shot" not in fresh_graph_cache
+
+
+class TestServeQueries:
+    def test_failed_batch_does_not_stop_serving(self, test_db, fresh_graph_cache, monkeypatch, capsys):
+        save_graph(test_db, "served", [("a", "b", 1)])
+        batch = {"graph_id": "served", "queries": [{"cheapest": {"start": "a", "end": "b"}}]}
+        monkeypatch.setattr(main.sys, "stdin", io.StringIO(f"[1]\n{{not json\n{json.dumps(batch)}\n"))
+
+        main.serve_queries()
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert lines[0] == {"error": "Input JSON must be an object"}
+        assert lines[1]["error"].startswith("Invalid JSON input")
+        assert lines[2]["answers"][0]["cheapest"]["path"] == ["a", "b"]
+
+    def test_unexpected_error_is_answered(self, test_db, fresh_graph_cache, monkeypatch, capsys):
+        save_graph(test_db, "broken", [("a", "b", 1)])
+        batch = json.dumps({"graph_id": "broken", "queries": [{"cheapest": {"start": "a", "end": "b"}}]})
+        monkeypatch.setattr(main.sys, "stdin", io.StringIO(f"{batch}\n{batch}\n"))
+        loads = []
+
+        def load_graph(*args, **kwargs):
+            loads.append(args)
+            if len(loads) == 1:
+                raise RuntimeError("connection lost")
+            return real_load_graph(*args, **kwargs)
+
+        real_load_graph = main.load_graph
+        monkeypatch.setattr(main, "load_graph", load_graph)
+        main.serve_queries()
+
+        first, second = (json.loads(line) for line in capsys.readouterr().out.splitlines())
+        assert first == {"error": "Query batch failed - RuntimeError: connection lost"}
+        assert second["answers"][0]["cheapest"]["path"] == ["a", "b"]
@@ -0,0 +1,114 @@
+from sqlalchemy import func, select
+
+from src import main
+from src.config import settings
+from src.db.models import Edge, Graph, GraphVersion, Node
+from src.graph.cycle_detector import CycleDetector
+from src.graph.path_finder import PathFinder
+from src.main import parse_xml
+
+
+GRAPH_XML = """<graph>
+    <id>versioned</id>
+    <name>Versioned</name>
+    <nodes>
+        <node><id>a</id><name>A</name></node>
+        <node><id>b</id><name>B</name></node>
+        <node><id>c</id><name>C</name></node>
+    </nodes>
+    <edges>
+        {edges}
+    </edges>
+</graph>
+"""
+
+
+def write_graph(tmp_path, name: str, edges) -> str:
+    path = tmp_path / name
+    path.write_text(GRAPH_XML.format(edges="\n".join(
+        f"<node><id>e{i}</id><from>{u}</from><to>{v}</to><cost>1</cost></node>"
+        for i, (u, v) in enumerate(edges)
+    )))
+    return str(path)
+
+
+def row_count(session, model, version_id: int) -> int:
+    return session.execute(
+        select(func.count()).select_from(model).where(model.graph_id == "versioned", model.version_id == version_id)
+    ).scalar()
+
+
+class TestGraphVersions:
+    def test_save_publishes_new_version_and_keeps_old_one(self, test_db, tmp_path):
+        parse_xml(write_graph(tmp_path, "v1.xml", [("a", "b"), ("b", "c")]), save_to_db=True)
+        first = PathFinder("versioned")
+        parse_xml(write_graph(tmp_path, "v2.xml", [("a", "c"), ("c", "a")]), save_to_db=True)
+        second = PathFinder("versioned")
+
+        assert second.version_id != first.version_id
+        assert test_db.execute(select(Graph.current_version_id)).scalar() == second.version_id
+        assert second.find_all_paths("a", "c") == [["a", "c"]]
+        assert CycleDetector.find_cycles("versioned") == [["a", "c", "a"]]
+
+        # The superseded version is still readable within the retention period
+        assert row_count(test_db, Edge, first.version_id) == 2
+        pinned = PathFinder("versioned", version_id=first.version_id)
+        assert pinned.find_all_paths("a", "c") == [["a", "b", "c"]]
+        lazy = PathFinder("versioned", lazy=True, version_id=first.version_id)
+        assert lazy.find_cheapest_path("a", "c") == ["a", "b", "c"]
+
+    def test_saved_versions_key_preprocessing_by_id(self, test_db, tmp_path):
+        parse_xml(write_graph(tmp_path, "v1.xml", [("a", "b"), ("b", "c")]), save_to_db=True)
+        finder = PathFinder("versioned")
+
+        assert finder.graph_version == f"v{finder.version_id}"
+
+    def test_lazy_reader_keeps_its_version(self, test_db, tmp_path):
+        parse_xml(write_graph(tmp_path, "v1.xml", [("a", "b"), ("b", "c")]), save_to_db=True)
+        lazy = PathFinder("versioned", lazy=True)
+        parse_xml(write_graph(tmp_path, "v2.xml", [("a", "c")]), save_to_db=True)
+
+        assert lazy.find_cheapest_path("a", "c") == ["a", "b", "c"]
+
+    def test_garbage_collection_after_retention(self, test_db, tmp_path, monkeypatch):
+        parse_xml(write_graph(tmp_path, "v1.xml", [("a", "b")]), save_to_db=True)
+        first = PathFinder("versioned").version_id
+        parse_xml(write_graph(tmp_path, "v2.xml", [("b", "c")]), save_to_db=True)
+        second = PathFinder("versioned").version_id
+        assert main.collect_versions() == 0
+
+        monkeypatch.setattr(settings, "GRAPH_VERSION_RETENTION_SECONDS", 0)
+        assert main.collect_versions() == 1
+        test_db.expire_all()
+        assert row_count(test_db, Node, first) == row_count(test_db, Edge, first) == 0
+        assert row_count(test_db, Node, second) == 3
+        assert test_db.execute(select(GraphVersion.id)).scalars().all() == [second]
+
+    def test_unversioned_rows_are_collected_once_replaced(self, test_db, tmp_path, monkeypatch):
+        test_db.add(Graph(id="versioned", name="Versioned"))
+        test_db.add(Node(node_id="a", name="A", graph_id="versioned"))
+        test_db.commit()
+        assert PathFinder("versioned").version_id == 0
+
+        lazy = PathFinder("versioned", lazy=True)
+        parse_xml(write_graph(tmp_path, "v1.xml", [("a", "b")]), save_to_db=True)
+        assert main.collect_versions() == 0
+        assert row_count(test_db, Node, 0) == 1
+        assert "a" in lazy.adjacency_list  # Still readable within the retention period
+
+        monkeypatch.setattr(settings, "GRAPH_VERSION_RETENTION_SECONDS", 0)
+        assert main.collect_versions() == 1
+        assert row_count(test_db, Node, 0) == 0
+
+    def test_cache_reloads_new_version(self, test_db, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "GRAPH_CHANGE_NOTIFICATIONS", False)
+        main.graph_cache.clear()
+        queries = {"graph_id": "versioned", "queries": [{"paths": {"start": "a", "end": "c"}}]}
+        try:
+            parse_xml(write_graph(tmp_path, "v1.xml", [("a", "b"), ("b", "c")]), save_to_db=True)
+            assert main.run_queries(queries, cached=True)["answers"][0]["paths"]["paths"] == [["a", "b", "c"]]
+            assert "versioned" in main.graph_cache
+            parse_xml(write_graph(tmp_path, "v2.xml", [("a", "c")]), save_to_db=True)
+            assert main.run_queries(queries, cached=True)["answers"][0]["paths"]["paths"] == [["a", "c"]]
+        finally:
+            main.graph_cache.clear()
@@ -0,0 +1,64 @@
+from sqlalchemy import select
+
+from src.db.models import Edge, Graph
+from src.main import parse_xml
+from src.xml_processor.parser import GraphXMLParser
+
+
+GRAPH_XML = """<graph>
+    <id>dedupe</id>
+    <name>Dedupe</name>
+    <nodes>
+        <node><id>a</id><name>A</name></node>
+        <node><id>b</id><name>B</name></node>
+    </nodes>
+    <edges>
+        <node><id>e1</id><from>a</from><to>b</to><cost>{cost}</cost></node>
+    </edges>
+</graph>
+"""
+
+
+def write_graph(tmp_path, name: str, cost: int = 1, newline: str = "\n") -> str:
+    path = tmp_path / name
+    path.write_bytes(GRAPH_XML.format(cost=cost).replace("\n", newline).encode('utf-8'))
+    return str(path)
+
+
+class TestContentHash:
+    def test_line_endings_do_not_change_hash(self, tmp_path, monkeypatch):
+        parser = GraphXMLParser()
+        lf = parser.content_hash(write_graph(tmp_path, "lf.xml"))
+        assert parser.content_hash(write_graph(tmp_path, "crlf.xml", newline="\r\n")) == lf
+        assert parser.content_hash(write_graph(tmp_path, "other.xml", cost=2)) != lf
+
+        # CRLF pairs split across chunk boundaries are normalized too
+        monkeypatch.setattr(GraphXMLParser, "HASH_CHUNK_SIZE", 7)
+        assert parser.content_hash(write_graph(tmp_path, "crlf.xml", newline="\r\n")) == lf
+
+
+class TestIngestDedupe:
+    def test_identical_file_is_skipped(self, test_db, tmp_path, capsys, monkeypatch):
+        path = write_graph(tmp_path, "graph.xml")
+        parse_xml(path, save_to_db=True)
+        capsys.readouterr()
+
+        def fail_parse(self, file_path):
+            raise AssertionError("identical file was parsed again")
+
+        monkeypatch.setattr(GraphXMLParser, "parse_file", fail_parse)
+        parse_xml(path, save_to_db=True)
+        assert "identical content, skipping" in capsys.readouterr().out
+
+    def test_changed_file_replaces_graph(self, test_db, tmp_path, capsys):
+        parse_xml(write_graph(tmp_path, "v1.xml", cost=1), save_to_db=True)
+        parse_xml(write_graph(tmp_path, "v2.xml", cost=5), save_to_db=True)
+        assert "Replaced the previously saved graph 'dedupe'" in capsys.readouterr().out
+
+        costs = test_db.execute(
+            select(Edge.cost).join(Graph, Graph.id == Edge.graph_id)
+            .where(Edge.graph_id == "dedupe", Edge.version_id == Graph.current_version_id)
+        ).scalars().all()
+        assert costs == [5]
+        saved_hash = test_db.execute(select(Graph.content_hash).where(Graph.id == "dedupe")).scalar()
+        assert saved_hash == GraphXMLParser().content_hash(str(tmp_path / "v2.xml"))
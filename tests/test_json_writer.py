@@ -0,0 +1,102 @@
+import io
+import itertools
+import json
+
+from src.config import settings
+from src.graph.path_finder import PathFinder
+from src.main import process_single_query
+from src.utils.json_writer import OMIT, StreamingJSONWriter
+
+
+def written(value, **kwargs) -> str:
+    stream = io.StringIO()
+    StreamingJSONWriter(stream, **kwargs).write(value)
+    return stream.getvalue()
+
+
+class TestStreamingJSONWriter:
+    document = {
+        "answers": [
+            {"paths": {"from": "a", "to": "e", "paths": [["a", "b", "e"], ["a", "c", "e"]]}},
+            {"cheapest": {"from": "a", "to": "e", "path": False}},
+            {"cycles": {"cycles": [], "truncated": True, "cost": 1.5, "note": None}},
+        ],
+        "empty": {},
+    }
+
+    def test_matches_json_dumps(self):
+        assert written(self.document) == json.dumps(self.document, indent=2)
+        assert written(self.document, indent=None) == json.dumps(self.document, separators=(',', ':'))
+
+    def test_generators_are_written_as_arrays(self):
+        answer = self.document["answers"][0]["paths"]
+        lazy = {"answers": (item for item in [{"paths": {**answer, "paths": iter(answer["paths"])}}])}
+        expected = {"answers": [{"paths": answer}]}
+        assert written(lazy) == json.dumps(expected, indent=2)
+        assert written({"paths": iter(())}) == '{\n  "paths": []\n}'
+
+    def test_deferred_values_and_omit(self):
+        produced = []
+
+        def items():
+            for i in range(3):
+                produced.append(i)
+                yield i
+
+        # The deferred value is only evaluated after the generator before it is consumed
+        value = {"items": items(), "count": lambda: len(produced), "error": lambda: OMIT}
+        assert json.loads(written(value)) == {"items": [0, 1, 2], "count": 3}
+
+    def test_flushes_while_streaming(self):
+        class CountingStream(io.StringIO):
+            flushes = 0
+
+            def flush(self):
+                self.flushes += 1
+
+        stream = CountingStream()
+        StreamingJSONWriter(stream, flush_every=10).write({"items": iter(range(100))})
+        assert stream.flushes >= 10
+
+
+class TestStreamedAnswers:
+    def test_stream_mode_matches_materialized_answer(self):
+        nodes = [f"n{i}" for i in range(5)]
+        edges = [(u, v, 1.0) for u, v in itertools.permutations(nodes, 2)]
+        finder = PathFinder.from_edges("complete", nodes, edges)
+        query = {"paths": {"start": "n0", "end": "n4"}}
+
+        materialized = process_single_query(query, finder)
+        streamed = process_single_query(query, finder, stream=True)
+        assert json.loads(written(streamed)) == materialized
+        assert len(materialized["paths"]["paths"]) == 16
+
+    def test_timeout_while_streaming_keeps_written_paths(self, monkeypatch):
+        nodes = [f"n{i}" for i in range(10)]
+        edges = [(u, v, 1.0) for u, v in itertools.permutations(nodes, 2)]
+        finder = PathFinder.from_edges("complete", nodes, edges)
+        monkeypatch.setattr(settings, "QUERY_TIMEOUT_SECONDS", 0.02)
+        monkeypatch.setattr(settings, "QUERY_MAX_SEARCH_SIZE", 0)
+
+        streamed = process_single_query({"paths": {"start": "n0", "end": "n9"}}, finder, stream=True)
+        answer = json.loads(written(streamed))["paths"]
+        assert "deadline" in answer["error"]
+        assert 0 < len(answer["paths"]) < 109601
+
+    def test_invalid_query_is_answered_with_error(self):
+        finder = PathFinder.from_edges("pair", "ab", [("a", "b", 1.0)])
+        queries = [
+            {"cheapest": {"start": "a", "end": "b"}},
+            {"paths": {"start": "a"}},
+            {"cheapest_from": {"start": "a", "max_cost": -1}},
+            {"cycles": "all"},
+            {"paths": {"start": "a", "end": "b"}},
+        ]
+
+        answers = (process_single_query(query, finder, stream=True) for query in queries)
+        output = json.loads(written({"answers": answers}))["answers"]
+        assert output[0]["cheapest"]["path"] == ["a", "b"]
+        assert output[1]["paths"] == {"from": "a", "to": None, "error": "paths.end must be a node ID string"}
+        assert "max_cost" in output[2]["cheapest_from"]["error"]
+        assert "error" in output[3]["cycles"]
+        assert output[4]["paths"]["paths"] == [["a", "b"]]
@@ -0,0 +1,61 @@
+from src.db.models import Edge, Graph, Node
+from src.db.partitions import create_graph_partitions
+from src.graph.path_finder import PathFinder
+from src.main import process_single_query
+
+
+EDGES = [
+    ("a", "b", 1), ("b", "c", 2), ("a", "c", 4), ("c", "d", 1), ("d", "a", 1), ("b", "d", 5),
+    ("x", "y", 1), ("y", "z", 1), ("z", "x", 1),
+]
+
+
+def save_graph(session, graph_id: str) -> None:
+    session.add(Graph(id=graph_id, name="Lazy"))
+    session.flush()
+    create_graph_partitions(session, graph_id)
+    nodes = {node_id: Node(node_id=node_id, name=node_id.upper(), graph_id=graph_id) for node_id in "abcdxyz"}
+    session.add_all(nodes.values())
+    session.flush()
+    for i, (from_node, to_node, cost) in enumerate(EDGES):
+        session.add(Edge(edge_id=f"e{i}", from_node_id=nodes[from_node].id,
+                         to_node_id=nodes[to_node].id, cost=cost, graph_id=graph_id))
+    session.commit()
+
+
+class TestLazyLoading:
+    def test_lazy_answers_match_full_load(self, test_db):
+        save_graph(test_db, "lazy")
+        full = PathFinder("lazy", lazy=False)
+        lazy = PathFinder("lazy", lazy=True)
+
+        assert lazy.find_cheapest_path("a", "d") == full.find_cheapest_path("a", "d") == ["a", "b", "c", "d"]
+        assert sorted(lazy.find_all_paths("a", "d")) == sorted(full.find_all_paths("a", "d"))
+        assert sorted(lazy.find_cycles(through="a")) == sorted(full.find_cycles(through="a"))
+        assert lazy.find_cheapest_from("b")[0] == full.find_cheapest_from("b")[0]
+        assert lazy.find_cheapest_path("a", "x") is False
+        assert lazy.find_cheapest_path("a", "missing") is False
+
+        # Nothing reached the x-y-z component until the whole graph is needed
+        assert lazy.adjacency_list.loaded_nodes == 4
+        assert sorted(lazy.find_cycles()) == sorted(full.find_cycles())
+        assert lazy.adjacency_list.loaded_nodes == 7
+
+    def test_frontier_is_fetched_in_batches(self, test_db):
+        save_graph(test_db, "lazy")
+        one_by_one = PathFinder("lazy", lazy=True)
+        one_by_one.adjacency_list.batch_size = 1
+        batched = PathFinder("lazy", lazy=True)
+
+        assert one_by_one.find_cheapest_path("a", "d") == batched.find_cheapest_path("a", "d")
+        # a, b and c are expanded; the search stops as soon as d is settled
+        assert one_by_one.adjacency_list.fetch_count == 3
+        assert batched.adjacency_list.fetch_count < 3
+
+    def test_admission_estimate_stays_local(self, test_db):
+        save_graph(test_db, "lazy")
+        lazy = PathFinder("lazy", lazy=True)
+
+        answer = process_single_query({"paths": {"start": "a", "end": "d"}}, lazy)
+        assert len(answer["paths"]["paths"]) == 3
+        assert lazy.adjacency_list.loaded_nodes == 4
@@ -0,0 +1,36 @@
+import json
+
+from benchmarks.load_test import load_workload, parse_overrides, percentile, replay
+from src.config import settings
+from src.main import parse_xml
+
+
+class TestLoadTest:
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 0.50) == 50
+        assert percentile(values, 0.95) == 95
+        assert percentile(values, 0.99) == 99
+        assert percentile([], 0.5) == 0.0
+
+    def test_parse_overrides(self):
+        assert parse_overrides(["LAZY_LOADING=true", "SEARCH_CACHE_SIZE=4"]) == {
+            "LAZY_LOADING": True, "SEARCH_CACHE_SIZE": 4
+        }
+
+    def test_replay_sample_workload(self, test_db, monkeypatch, tmp_path):
+        parse_xml("sample_valid_graph.xml", save_to_db=True)
+        requests = load_workload(["sample_input.json"]) * 3
+        # replay applies overrides to the shared settings; restore them afterwards
+        monkeypatch.setattr(settings, "SEARCH_CACHE_SIZE", settings.SEARCH_CACHE_SIZE)
+
+        report = replay(requests, concurrency=2, rate=200, overrides={"SEARCH_CACHE_SIZE": 4})
+
+        assert report["overall"]["requests"] == 12
+        assert report["overall"]["errors"] == 0
+        assert set(report["by_query_type"]) == {"paths", "cheapest"}
+        latency = report["by_query_type"]["cheapest"]["latency_ms"]
+        assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+        assert report["config"]["settings"]["SEARCH_CACHE_SIZE"] == 4
+        assert report["peak_rss_mb"] > 0
+        json.dumps(report)
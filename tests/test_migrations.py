@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+
+from src.db import database
+from src.db.database import SessionLocal, ensure_db_initialized, get_migrations, init_db
+
+
+class TestMigrationLedger:
+    def test_every_migration_recorded_with_checksum(self, test_db):
+        applied = database.applied_migrations(test_db)
+        assert applied == {version: checksum for version, checksum, _ in get_migrations()}
+
+    def test_migrations_are_idempotent(self):
+        session = SessionLocal()
+        try:
+            for _, _, sql in get_migrations():
+                session.execute(text(sql))
+        finally:
+            session.rollback()
+            session.close()
+
+    def test_modified_migration_is_reported(self, monkeypatch):
+        migrations = get_migrations()
+        version, _, sql = migrations[0]
+        monkeypatch.setattr(database, "get_migrations", lambda: [(version, "changed", sql)] + migrations[1:])
+
+        with pytest.raises(RuntimeError, match="modified after it was applied"):
+            init_db()
+
+    def test_schema_checked_once_per_process(self, monkeypatch):
+        monkeypatch.setattr(database, "_schema_checked", False)
+        ensure_db_initialized()
+        assert database._schema_checked
+
+        def no_database():
+            raise AssertionError("the schema was checked again")
+
+        monkeypatch.setattr(database, "SessionLocal", no_database)
+        ensure_db_initialized()
+
+    def test_concurrent_initialization(self):
+        with ThreadPoolExecutor(4) as pool:
+            for future in [pool.submit(init_db) for _ in range(4)]:
+                future.result()
@@ -0,0 +1,55 @@
+import pytest
+
+from src.config import settings
+from src.graph import parallel_paths
+from src.graph.frozen_graph import FrozenGraph
+from src.graph.parallel_paths import explore, iter_paths_parallel
+from src.utils.deadline import Deadline
+from src.utils.exceptions import QueryTimeoutError
+
+
+class TestParallelPaths:
+    def test_split_subproblems_cover_the_search(self, random_finder):
+        finder = random_finder(3, num_nodes=10, num_edges=25)
+        expected = finder.find_all_paths("n0", "n9")
+
+        found, pending = explore(finder.adjacency_list, ["n0"], (), "n9", budget=3)
+        assert pending
+        while pending:
+            prefix, key = pending.pop()
+            more, remaining = explore(finder.adjacency_list, prefix, key, "n9", budget=3)
+            found += more
+            pending += remaining
+        assert [path for _, path in sorted(found)] == expected
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_sequential_engine(self, random_finder, seed):
+        finder = random_finder(seed, num_nodes=10, num_edges=25)
+        for start, end in [("n0", "n9"), ("n3", "n1")]:
+            expected = finder.find_all_paths(start, end)
+            parallel = list(iter_paths_parallel(finder.adjacency_list, start, end, 2, task_budget=4))
+            assert sorted(parallel) == sorted(expected)
+
+            canonical = iter_paths_parallel(finder.adjacency_list, start, end, 2, canonical=True, task_budget=4)
+            assert list(canonical) == expected
+
+    def test_engine_selected_by_settings(self, random_finder, monkeypatch):
+        finder = random_finder(1, num_nodes=10, num_edges=25)
+        expected = finder.find_all_paths("n0", "n9")
+        monkeypatch.setattr(settings, "PARALLEL_PATHS_WORKERS", 2)
+        monkeypatch.setattr(settings, "PARALLEL_PATHS_CANONICAL_ORDER", True)
+        monkeypatch.setattr(parallel_paths, "TASK_BUDGET", 4)
+
+        assert finder.all_paths_engine == "parallel"
+        assert finder.find_all_paths("n0", "n9") == expected
+        pool = finder._paths_pool
+        assert finder.find_all_paths("n0", "n9", limit=2) == expected[:2]
+        assert finder._paths_pool is pool  # One pool per graph, reused by later queries
+        pool.close()
+
+        assert FrozenGraph.freeze(finder).all_paths_engine == "dfs"
+
+    def test_deadline(self, random_finder):
+        finder = random_finder(2)
+        with pytest.raises(QueryTimeoutError):
+            list(iter_paths_parallel(finder.adjacency_list, "n0", "n9", 2, deadline=Deadline(0.2), task_budget=100))
@@ -0,0 +1,63 @@
+from sqlalchemy import text
+from src.db.models import Graph, Node, Edge
+from src.db.partitions import create_graph_partitions, delete_graph, partition_name
+from src.graph.path_finder import PathFinder
+
+
+def partition_of(session, table: str, graph_id: str) -> set:
+    return set(session.execute(
+        text(f"SELECT DISTINCT tableoid::regclass::text FROM {table} WHERE graph_id = :graph_id"),
+        {"graph_id": graph_id}
+    ).scalars())
+
+
+def save_graph(session, graph_id: str) -> None:
+    session.add(Graph(id=graph_id, name="Partitioned"))
+    session.flush()
+    create_graph_partitions(session, graph_id)
+
+    a = Node(node_id="a", name="A", graph_id=graph_id)
+    b = Node(node_id="b", name="B", graph_id=graph_id)
+    session.add_all([a, b])
+    session.flush()
+    session.add(Edge(edge_id="e1", from_node_id=a.id, to_node_id=b.id, cost=2, graph_id=graph_id))
+    session.commit()
+
+
+class TestPartitions:
+    def test_partition_name_is_safe_identifier(self):
+        name = partition_name("nodes", "it's; DROP TABLE graphs")
+        assert name.startswith("nodes_g_")
+        assert name.replace("_", "").isalnum()
+
+    def test_rows_go_to_graph_partitions(self, test_db):
+        graph_id = "it's partitioned"
+        save_graph(test_db, graph_id)
+
+        assert partition_of(test_db, "nodes", graph_id) == {partition_name("nodes", graph_id)}
+        assert partition_of(test_db, "edges", graph_id) == {partition_name("edges", graph_id)}
+        assert PathFinder(graph_id).find_cheapest_path("a", "b") == ["a", "b"]
+
+        delete_graph(test_db, graph_id)
+        test_db.commit()
+
+    def test_unpartitioned_graph_uses_default(self, test_db):
+        test_db.add(Graph(id="default_graph", name="Default"))
+        test_db.add(Node(node_id="a", name="A", graph_id="default_graph"))
+        test_db.commit()
+
+        assert partition_of(test_db, "nodes", "default_graph") == {"nodes_default"}
+
+    def test_delete_graph_drops_partitions(self, test_db):
+        save_graph(test_db, "to_delete")
+
+        delete_graph(test_db, "to_delete")
+        test_db.commit()
+
+        for table in ("nodes", "edges"):
+            exists = test_db.execute(
+                text("SELECT to_regclass(:name) IS NOT NULL"),
+                {"name": partition_name(table, "to_delete")}
+            ).scalar()
+            assert not exists
+        assert test_db.get(Graph, "to_delete") is None
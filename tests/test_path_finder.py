@@ -1,5 +1,11 @@
+import random
+
+import pytest
+
+from src.config import settings
 from src.graph.path_finder import PathFinder
 from src.db.models import Graph, Node, Edge
+from src.main import process_single_query
 
 
 def create_test_graph(session) -> Graph:
@@ -76,4 +82,265 @@ class TestPathFinder:
         assert paths == []
 
         path = finder.find_cheapest_path('a', 'a')
-        assert path is False
\ No newline at end of file
+        assert path is False
+
+
+class TestIntegerCostEngine:
+    def test_engine_selection(self, random_finder, monkeypatch):
+        assert random_finder(1).cheapest_path_engine == "dial"
+        assert random_finder(1, integral=False).cheapest_path_engine == "dijkstra"
+
+        monkeypatch.setattr(settings, "DIAL_MAX_COST", 5)
+        assert random_finder(1, max_cost=9).cheapest_path_engine == "dijkstra"
+
+    def test_loader_detects_integer_costs(self, test_db):
+        graph = create_test_graph(test_db)
+        finder = PathFinder(graph.id)
+
+        assert finder.integer_costs
+        assert finder.max_cost == 3
+        assert finder.dijkstra_engine == "dial"
+
+    def test_dial_matches_heap(self, random_finder, path_cost, monkeypatch):
+        for seed in range(20):
+            finder = random_finder(seed)
+            nodes = list(finder.adjacency_list)
+            for start, end in zip(nodes, reversed(nodes)):
+                dial_path = finder.find_cheapest_path(start, end)
+
+                with monkeypatch.context() as patch:
+                    patch.setattr(settings, "DIAL_MAX_COST", -1)
+                    heap_path = finder.find_cheapest_path(start, end)
+
+                assert (dial_path is False) == (heap_path is False)
+                if dial_path:
+                    assert dial_path[0] == start and dial_path[-1] == end
+                    assert path_cost(finder, dial_path) == path_cost(finder, heap_path)
+
+
+class TestCheapestFrom:
+    def test_all_reachable(self, test_db):
+        graph = create_test_graph(test_db)
+        finder = PathFinder(graph.id)
+
+        costs, predecessors, truncated = finder.find_cheapest_from('a')
+        assert costs == {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 3}
+        assert predecessors == {'b': 'a', 'c': 'a', 'd': 'c', 'e': 'b'}
+        assert not truncated
+
+    def test_caps(self, test_db):
+        graph = create_test_graph(test_db)
+        finder = PathFinder(graph.id)
+
+        costs, predecessors, truncated = finder.find_cheapest_from('a', max_cost=2)
+        assert costs == {'a': 0, 'b': 1, 'c': 2}
+        assert truncated
+
+        costs, predecessors, truncated = finder.find_cheapest_from('a', max_nodes=2)
+        assert costs == {'a': 0, 'b': 1}
+        assert predecessors == {'b': 'a'}
+        assert truncated
+
+        assert finder.find_cheapest_from('x') == ({}, {}, False)
+
+    def test_matches_point_to_point(self, random_finder, path_cost):
+        finder = random_finder(7)
+        for start in list(finder.adjacency_list)[:10]:
+            costs, predecessors, _ = finder.find_cheapest_from(start)
+            for end in finder.adjacency_list:
+                path = finder.find_cheapest_path(start, end)
+                if end == start:
+                    continue
+                assert (end in costs) == (path is not False)
+                if path:
+                    assert costs[end] == path_cost(finder, path)
+
+
+class TestSearchCache:
+    def test_resumed_search_matches_fresh_search(self, random_finder, path_cost):
+        cached = random_finder(11)
+        nodes = list(cached.adjacency_list)
+        # Query targets from the same start one by one, farthest last
+        for start in nodes[:5]:
+            for end in nodes:
+                fresh = random_finder(11).find_cheapest_path(start, end)
+                resumed = cached.find_cheapest_path(start, end)
+                assert (fresh is False) == (resumed is False)
+                if fresh:
+                    assert path_cost(cached, fresh) == path_cost(cached, resumed)
+
+    def test_settled_target_answered_from_cache(self, test_db):
+        graph = create_test_graph(test_db)
+        finder = PathFinder(graph.id)
+
+        assert finder.find_cheapest_path('a', 'e') == ['a', 'b', 'e']
+        state = finder._search_from('a')
+        settled = dict(state.settled)
+
+        assert finder.find_cheapest_path('a', 'b') == ['a', 'b']
+        assert state.settled == settled  # No further search was needed
+
+        costs, _, _ = finder.find_cheapest_from('a')
+        assert costs == {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 3}
+        assert state.exhausted
+
+    def test_failed_search_is_rebuilt(self, random_finder, monkeypatch):
+        finder = random_finder(11)
+        nodes = list(finder.adjacency_list)
+        expected = random_finder(11).find_cheapest_path(nodes[0], nodes[-1])
+        assert expected
+        dijkstra = finder._dijkstra
+        failures = iter([True])
+
+        def failing_once(start, predecessors):
+            search = dijkstra(start, predecessors)
+            yield next(search)
+            if next(failures, False):
+                raise RuntimeError("adjacency fetch failed")
+            yield from search
+
+        monkeypatch.setattr(finder, "_dijkstra", failing_once)
+        with pytest.raises(RuntimeError):
+            finder.find_cheapest_path(nodes[0], nodes[-1])
+        assert finder.find_cheapest_path(nodes[0], nodes[-1]) == expected
+
+    def test_lru_bound(self, random_finder, monkeypatch):
+        monkeypatch.setattr(settings, "SEARCH_CACHE_SIZE", 2)
+        finder = random_finder(3)
+
+        nodes = list(finder.adjacency_list)
+        for start in nodes[:5]:
+            finder.find_cheapest_path(start, nodes[-1])
+        assert len(finder._search_cache) == 2
+
+
+class TestPathEdges:
+    def test_union_of_enumerated_paths(self, random_finder):
+        for seed in range(10):
+            # Small enough to enumerate every simple path
+            finder = random_finder(seed, num_nodes=10, num_edges=25)
+            nodes = list(finder.adjacency_list)
+            for start, end in zip(nodes[:5], reversed(nodes)):
+                paths = finder.find_all_paths(start, end)
+                edges, path_count, truncated = finder.find_path_edges(start, end)
+
+                assert path_count == len(paths) and not truncated
+                assert set(edges) == {edge for path in paths for edge in zip(path, path[1:])}
+                assert len(edges) == len(set(edges))
+
+                # Expanding the edges gives back exactly the same paths
+                expanded = PathFinder.from_edges("expanded", nodes, [(u, v, 1) for u, v in edges])
+                assert sorted(expanded.find_all_paths(start, end)) == sorted(map(list, set(map(tuple, paths))))
+
+    def test_limit_and_query_format(self, test_db):
+        graph = create_test_graph(test_db)
+        finder = PathFinder(graph.id)
+
+        assert finder.find_path_edges('a', 'e', limit=1) == ([('b', 'e'), ('a', 'b')], 1, True)
+        assert finder.find_path_edges('a', 'e', limit=2)[1:] == (2, False)  # Exactly limit paths exist
+        assert finder.find_path_edges('a', 'a') == ([], 0, False)
+
+        # Unexplored neighbours left at the limit that lead nowhere do not truncate the answer
+        dead_end = PathFinder.from_edges("dead_end", "abex", [("a", "b", 1), ("b", "e", 1), ("a", "x", 1)])
+        assert dead_end.find_path_edges('a', 'e', limit=1) == ([('b', 'e'), ('a', 'b')], 1, False)
+
+        answer = process_single_query(
+            {"paths": {"start": "a", "end": "e", "format": "edges", "count": True}}, finder
+        )["paths"]
+        assert sorted(answer["edges"]) == [["a", "b"], ["a", "c"], ["b", "e"], ["c", "d"], ["d", "e"]]
+        assert answer["path_count"] == 2
+
+
+class TestDagEngines:
+    @staticmethod
+    def random_dag(seed: int, num_nodes: int = 40, num_edges: int = 160) -> PathFinder:
+        """Random DAG: every edge goes from a lower to a higher node number."""
+        rng = random.Random(seed)
+        node_ids = [f"n{i}" for i in range(num_nodes)]
+        edges = []
+        for _ in range(num_edges):
+            u, v = sorted(rng.sample(range(num_nodes), 2))
+            edges.append((f"n{u}", f"n{v}", rng.randint(0, 9)))
+        rng.shuffle(node_ids)
+        return PathFinder.from_edges("dag", node_ids, edges)
+
+    def test_acyclicity_detected_at_load(self, random_finder):
+        assert self.random_dag(0).is_acyclic
+        assert not random_finder(0).is_acyclic
+        assert not PathFinder.from_edges("loop", ["a"], [("a", "a", 1)]).is_acyclic
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_cheapest_path_matches_dijkstra(self, seed, monkeypatch, path_cost):
+        finder = self.random_dag(seed)
+        assert finder.cheapest_path_engine == "dag"
+        rng = random.Random(seed)
+        nodes = list(finder.adjacency_list)
+        for _ in range(50):
+            start, end = rng.choice(nodes), rng.choice(nodes)
+            dag_path = finder.find_cheapest_path(start, end)
+            with monkeypatch.context() as m:
+                m.setattr(settings, "DAG_ENGINES", False)
+                dijkstra_path = finder.find_cheapest_path(start, end)
+            if dijkstra_path is False:
+                assert dag_path is False
+            else:
+                assert dag_path[0] == start and dag_path[-1] == end
+                assert path_cost(finder, dag_path) == path_cost(finder, dijkstra_path)
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_all_paths_match_dfs(self, seed, monkeypatch):
+        finder = self.random_dag(seed, num_nodes=15, num_edges=40)
+        assert finder.all_paths_engine == "dag"
+        nodes = sorted(finder.adjacency_list, key=lambda node: int(node[1:]))
+        for start, end in [(nodes[0], nodes[-1]), (nodes[3], nodes[10]), (nodes[10], nodes[3])]:
+            dag_paths = finder.find_all_paths(start, end)
+            monkeypatch.setattr(settings, "DAG_ENGINES", False)
+            assert finder.all_paths_engine == "dfs"
+            assert dag_paths == finder.find_all_paths(start, end)
+            monkeypatch.setattr(settings, "DAG_ENGINES", True)
+
+
+class TestBidirectionalDijkstra:
+    def test_reverse_adjacency_built_at_load(self, random_finder):
+        finder = random_finder(0)
+        incoming = sorted(
+            (to_node, from_node, cost)
+            for from_node, neighbors in finder.adjacency_list.items() for to_node, cost in neighbors
+        )
+        assert sorted(
+            (to_node, from_node, cost)
+            for to_node, neighbors in finder.reverse_adjacency_list.items() for from_node, cost in neighbors
+        ) == incoming
+        assert set(finder.reverse_adjacency_list) == set(finder.adjacency_list)
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_matches_unidirectional(self, seed, random_finder, path_cost, monkeypatch):
+        monkeypatch.setattr(settings, "DAG_ENGINES", False)
+        # Sparse, dense, zero-cost and real-valued graphs, on the bucket and heap queues
+        finder = random_finder(seed, num_edges=[60, 120, 240][seed % 3], max_cost=[9, 0][seed % 2],
+                               integral=seed < 4)
+        rng = random.Random(seed)
+        for _ in range(100):
+            start, end = f"n{rng.randrange(60)}", f"n{rng.randrange(60)}"
+            unidirectional = finder.find_cheapest_path(start, end)
+            with monkeypatch.context() as m:
+                m.setattr(settings, "BIDIRECTIONAL_DIJKSTRA", True)
+                assert finder.cheapest_path_engine == "bidirectional"
+                bidirectional = finder.find_cheapest_path(start, end)
+            if unidirectional is False:
+                assert bidirectional is False
+            else:
+                assert bidirectional[0] == start and bidirectional[-1] == end
+                assert len(set(bidirectional)) == len(bidirectional)
+                assert path_cost(finder, bidirectional) == pytest.approx(path_cost(finder, unidirectional))
+
+    def test_target_without_incoming_edges_is_unreachable(self, monkeypatch):
+        monkeypatch.setattr(settings, "BIDIRECTIONAL_DIJKSTRA", True)
+        # A cycle through every node but the target, whose only edge leaves it
+        nodes = [f"n{i}" for i in range(1000)]
+        edges = [(u, v, 1) for u, v in zip(nodes, nodes[1:] + nodes[:1])] + [("t", "n0", 1)]
+        finder = PathFinder.from_edges("unreachable", nodes + ["t"], edges)
+        assert finder.find_cheapest_path("t", "n999") == ["t"] + nodes
+
+        monkeypatch.setattr(finder, "_make_queue", lambda: pytest.fail("search started"))
+        assert finder.find_cheapest_path("n0", "t") is False
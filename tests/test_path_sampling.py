@@ -0,0 +1,83 @@
+import pytest
+
+from src.graph import path_sampling
+from src.graph.path_finder import PathFinder
+from src.main import process_single_query
+
+
+def complete_graph(size: int) -> PathFinder:
+    nodes = [f"n{i}" for i in range(size)]
+    return PathFinder.from_edges("complete", nodes, [(u, v, 1) for u in nodes for v in nodes if u != v])
+
+
+class TestPathSampling:
+    @pytest.mark.parametrize("size", [5, 7])
+    def test_estimate_covers_exact_count(self, size):
+        finder = complete_graph(size)
+        exact = len(finder.find_all_paths("n0", "n1"))
+        result = finder.estimate_paths("n0", "n1", samples=3000, seed=1)
+
+        assert not result["exact"]
+        assert result["samples"] == result["hits"] == 3000  # No walk gets stuck on a complete graph
+        low, high = result["confidence_interval"]
+        assert low <= exact <= high
+        assert abs(result["estimate"] - exact) / exact < 0.1
+
+    def test_sampled_paths_are_valid_and_distinct(self, random_finder):
+        finder = random_finder(4, num_nodes=12, num_edges=40)
+        paths = finder.find_all_paths("n0", "n5")
+        result = finder.estimate_paths("n0", "n5", samples=500, k=4, seed=2)
+
+        assert 0 < len(result["paths"]) <= 4
+        assert len({tuple(path) for path in result["paths"]}) == len(result["paths"])
+        assert all(path in paths for path in result["paths"])
+
+    def test_interval_contains_estimate_below_one(self, monkeypatch):
+        walks = iter([(["n0", "n1"], 1)])
+        monkeypatch.setattr(path_sampling, "sample_walk", lambda *args: next(walks, (None, 0)))
+        result = complete_graph(4).estimate_paths("n0", "n1", samples=100, seed=0)
+
+        assert result["hits"] == 1
+        assert result["estimate"] == 0.01
+        low, high = result["confidence_interval"]
+        assert low <= result["estimate"] <= high
+
+    def test_overflowing_variance_gives_widest_interval(self, monkeypatch):
+        weights = iter([10 ** 400, 0] * 50)
+        monkeypatch.setattr(path_sampling, "sample_walk", lambda *args: (["n0", "n1"], next(weights)))
+        result = complete_graph(4).estimate_paths("n0", "n1", samples=100, seed=0)
+
+        assert result["estimate"] == path_sampling.MAX_ESTIMATE
+        assert result["confidence_interval"] == [1.0, path_sampling.MAX_ESTIMATE]
+
+    def test_exact_on_acyclic_graph(self):
+        finder = PathFinder.from_edges("dag", "abcde", [
+            ("a", "b", 1), ("a", "c", 1), ("b", "d", 1), ("c", "d", 1), ("b", "c", 1), ("d", "e", 1), ("a", "e", 1),
+        ])
+        result = finder.estimate_paths("a", "e", samples=10, seed=0)
+        assert result["exact"]
+        assert result["estimate"] == len(finder.find_all_paths("a", "e")) == 4
+
+    def test_unreachable_end(self):
+        finder = PathFinder.from_edges("split", "abc", [("a", "b", 1)])
+        assert finder.estimate_paths("a", "c") == {
+            "estimate": 0, "confidence_interval": [0, 0], "exact": True, "samples": 0, "hits": 0, "paths": []
+        }
+
+    def test_time_budget(self):
+        result = complete_graph(30).estimate_paths("n0", "n1", samples=10 ** 9, max_seconds=0.05)
+        assert 0 < result["samples"] < 10 ** 9
+
+    def test_query(self):
+        finder = complete_graph(5)
+        answer = process_single_query(
+            {"estimate_paths": {"start": "n0", "end": "n1", "samples": 200, "k": 2, "seed": 3}}, finder
+        )["estimate_paths"]
+        assert answer["from"] == "n0" and answer["to"] == "n1"
+        assert answer["samples"] == 200 and len(answer["paths"]) == 2
+
+        explain = process_single_query({"estimate_paths": {"start": "n0", "end": "n1", "explain": True}}, finder)
+        assert explain["estimate_paths"]["explain"]["engine"] == "sampling"
+
+        invalid = process_single_query({"estimate_paths": {"start": "n0", "end": "n1", "samples": 0}}, finder)
+        assert invalid["estimate_paths"]["error"] == "estimate_paths.samples must be a positive integer"
@@ -0,0 +1,129 @@
+import itertools
+import time
+
+import pytest
+
+from src.config import settings
+from src.graph.estimator import QueryEstimator
+from src.graph.path_finder import PathFinder
+from src.main import process_single_query
+from src.utils.deadline import Deadline
+from src.utils.exceptions import QueryTimeoutError
+
+
+def complete_graph(size: int) -> PathFinder:
+    nodes = [f"n{i}" for i in range(size)]
+    edges = [(u, v, 1.0) for u, v in itertools.permutations(nodes, 2)]
+    return PathFinder.from_edges("complete", nodes, edges)
+
+
+def dag_finder() -> PathFinder:
+    edges = [
+        ("a", "b", 1), ("b", "e", 2), ("a", "c", 2), ("c", "d", 1),
+        ("d", "e", 3), ("a", "d", 5), ("b", "d", 1), ("e", "f", 1),
+    ]
+    return PathFinder.from_edges("dag", "abcdef", edges)
+
+
+class TestEstimator:
+    def test_exact_count_on_acyclic_graph(self):
+        finder = dag_finder()
+        estimate = QueryEstimator(finder).estimate("paths", {"start": "a", "end": "e"})
+
+        assert estimate["exact"]
+        assert estimate["engine"] == "dag"
+        assert estimate["estimated_output_size"] == len(finder.find_all_paths("a", "e"))
+        assert estimate["relevant_nodes"] == 5
+
+    def test_cyclic_graph_grows_with_size(self):
+        small = QueryEstimator(complete_graph(5)).estimate("paths", {"start": "n0", "end": "n1"})
+        large = QueryEstimator(complete_graph(9)).estimate("paths", {"start": "n0", "end": "n1"})
+
+        assert not small["exact"]
+        assert large["estimated_search_size"] > small["estimated_search_size"] * 100
+
+    def test_unreachable(self):
+        estimator = QueryEstimator(dag_finder())
+
+        assert estimator.estimate("paths", {"start": "e", "end": "a"})["estimated_output_size"] == 0
+        assert estimator.estimate("cheapest", {"start": "x", "end": "a"})["estimated_search_size"] == 0
+
+    def test_cycles(self):
+        estimate = QueryEstimator(dag_finder()).estimate("cycles", {})
+        assert estimate["estimated_output_size"] == 0
+        assert estimate["exact"]
+
+
+class TestQueryControl:
+    def test_explain_does_not_run_query(self, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_TIMEOUT_SECONDS", 0.000001)
+        answer = process_single_query(
+            {"paths": {"start": "n0", "end": "n1", "explain": True}}, complete_graph(12)
+        )
+
+        explain = answer["paths"]["explain"]
+        assert answer["paths"]["from"] == "n0"
+        assert "paths" not in answer["paths"]
+        assert explain["graph"]["largest_component"] == 12
+        assert explain["estimated_search_size"] > 10 ** 6
+
+    def test_reject_over_budget(self, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_MAX_SEARCH_SIZE", 1000)
+        monkeypatch.setattr(settings, "QUERY_OVER_BUDGET", "reject")
+
+        answer = process_single_query({"paths": {"start": "n0", "end": "n1"}}, complete_graph(9))
+        assert "rejected" in answer["paths"]["error"]
+
+        # Cheap queries on the same graph are still admitted
+        answer = process_single_query({"cheapest": {"start": "n0", "end": "n1"}}, complete_graph(9))
+        assert answer["cheapest"]["path"] == ["n0", "n1"]
+
+    def test_truncate_over_budget(self, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_MAX_SEARCH_SIZE", 1000)
+        monkeypatch.setattr(settings, "QUERY_OVER_BUDGET", "truncate")
+        monkeypatch.setattr(settings, "QUERY_TRUNCATE_LIMIT", 5)
+
+        answer = process_single_query({"paths": {"start": "n0", "end": "n1"}}, complete_graph(9))
+        assert len(answer["paths"]["paths"]) == 5
+        assert answer["paths"]["truncated"]
+
+        answer = process_single_query({"cycles": {"limit": 3}}, complete_graph(9))
+        assert len(answer["cycles"]["cycles"]) == 3
+
+    def test_unreachable_end_is_not_enumerated(self, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_MAX_SEARCH_SIZE", 1000)
+        monkeypatch.setattr(settings, "QUERY_TIMEOUT_SECONDS", 5)
+        nodes = [f"n{i}" for i in range(11)] + ["sink"]
+        edges = [(u, v, 1.0) for u, v in itertools.permutations(nodes[:-1], 2)]
+        finder = PathFinder.from_edges("complete_and_sink", nodes, edges)
+
+        for query in ({"start": "n0", "end": "sink"}, {"start": "n0", "end": "n0"}):
+            answer = process_single_query({"paths": query}, finder)["paths"]
+            assert answer["paths"] == [] and "error" not in answer
+
+    def test_truncated_only_when_limit_cut_answer(self, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_MAX_SEARCH_SIZE", 1)
+        monkeypatch.setattr(settings, "QUERY_OVER_BUDGET", "truncate")
+        monkeypatch.setattr(settings, "QUERY_TRUNCATE_LIMIT", 4)
+
+        answer = process_single_query({"paths": {"start": "a", "end": "e"}}, dag_finder())["paths"]
+        assert len(answer["paths"]) == 4  # Exactly four paths exist
+        assert not answer["truncated"]
+
+    def test_deadline_cancels_query(self, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_MAX_SEARCH_SIZE", 0)
+        monkeypatch.setattr(settings, "QUERY_TIMEOUT_SECONDS", 0.05)
+
+        started = time.monotonic()
+        answer = process_single_query({"paths": {"start": "n0", "end": "n1"}}, complete_graph(12))
+        assert "deadline" in answer["paths"]["error"]
+        assert time.monotonic() - started < 5
+
+    def test_timed_out_search_can_resume(self):
+        finder = complete_graph(30)
+        expired = Deadline(0.000001)
+        time.sleep(0.001)
+
+        with pytest.raises(QueryTimeoutError):
+            finder.find_cheapest_path("n0", "n29", deadline=expired)
+        assert finder.find_cheapest_path("n0", "n29") == ["n0", "n29"]
@@ -0,0 +1,75 @@
+import pytest
+
+from src.db.models import Graph
+from src.graph.path_finder import PathFinder
+from src.main import import_tabular, parse_xml
+from src.tabular_processor.parser import GraphTabularParser
+from src.utils.exceptions import TabularValidationError
+from src.xml_processor.parser import GraphXMLParser
+
+
+def write_tables(tmp_path, nodes, edges, suffix=".csv", header=("id", "from", "to", "cost")):
+    separator = "\t" if suffix == ".tsv" else ","
+    nodes_path = tmp_path / f"nodes{suffix}"
+    edges_path = tmp_path / f"edges{suffix}"
+    nodes_path.write_text("\n".join(separator.join(row) for row in [("id", "name"), *nodes]) + "\n")
+    edges_path.write_text("\n".join(separator.join(row) for row in [header, *edges]) + "\n")
+    return str(nodes_path), str(edges_path)
+
+
+def sample_as_tables(tmp_path, suffix=".csv"):
+    graph = GraphXMLParser().parse_file("sample_valid_graph.xml")
+    return write_tables(
+        tmp_path,
+        [(node["id"], node["name"]) for node in graph["nodes"]],
+        [(edge["id"], edge["from"], edge["to"], repr(edge["cost"])) for edge in graph["edges"]],
+        suffix
+    )
+
+
+class TestTabularParser:
+    def test_parses_columns(self, tmp_path):
+        nodes, edges = write_tables(tmp_path, [("a", "A"), ("b", "B, the second")], [("e1", "a", "b", "")], ".tsv")
+        graph = GraphTabularParser().parse_files("g", "G", nodes, edges)
+        assert graph["nodes"] == {"id": ("a", "b"), "name": ("A", "B, the second")}
+        assert graph["edges"] == {"id": ("e1",), "from": ("a",), "to": ("b",), "cost": [0.0]}
+
+    def test_cost_column_is_optional(self, tmp_path):
+        nodes, edges = write_tables(tmp_path, [("a", "A")], [("e1", "a", "a")], header=("id", "from", "to"))
+        assert GraphTabularParser().parse_files("g", "G", nodes, edges)["edges"]["cost"] == [0.0]
+
+    @pytest.mark.parametrize("nodes,edges,message", [
+        ([], [], "at least one node"),
+        ([("a", "A"), ("b", "B"), ("a", "A2")], [], "Duplicate node id found: a"),
+        ([("a", "A")], [("e1", "a", "x", "1")], "non-existent to node: x"),
+        ([("a", "A")], [("e1", "y", "a", "1")], "non-existent from node: y"),
+        ([("a", "A")], [("e1", "a", "a", "-2")], "must be non-negative: -2"),
+        ([("a", "A")], [("e1", "a", "a", "1"), ("e2", "a", "a", "cheap")], "Invalid cost value for edge e2"),
+    ])
+    def test_validation_matches_xml_parser(self, tmp_path, nodes, edges, message):
+        nodes_path, edges_path = write_tables(tmp_path, nodes, edges)
+        with pytest.raises(TabularValidationError, match=message):
+            GraphTabularParser().parse_files("g", "G", nodes_path, edges_path)
+
+    def test_missing_column(self, tmp_path):
+        nodes, edges = write_tables(tmp_path, [("a", "A")], [("e1", "a")], header=("id", "from"))
+        with pytest.raises(TabularValidationError, match="missing required column"):
+            GraphTabularParser().parse_files("g", "G", nodes, edges)
+
+
+class TestTabularImport:
+    def test_import_matches_xml_save(self, test_db, tmp_path):
+        parse_xml("sample_valid_graph.xml", save_to_db=True)
+        from_xml = PathFinder("test_graph").adjacency_list
+
+        import_tabular("test_graph", "Test Graph", *sample_as_tables(tmp_path, ".tsv"))
+        imported = PathFinder("test_graph")
+        assert imported.version_id is not None
+        assert imported.adjacency_list == from_xml
+
+    def test_invalid_files_are_not_saved(self, test_db, tmp_path, capsys):
+        nodes, edges = write_tables(tmp_path, [("a", "A")], [("e1", "a", "b", "1")])
+        with pytest.raises(SystemExit):
+            import_tabular("rejected", "Rejected", nodes, edges)
+        assert "non-existent to node: b" in capsys.readouterr().out
+        assert test_db.get(Graph, "rejected") is None